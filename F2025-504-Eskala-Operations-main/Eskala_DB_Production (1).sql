@@ -54,12 +54,18 @@ CREATE TABLE `audit_log` (
   `audit_id` bigint unsigned NOT NULL AUTO_INCREMENT,
   `table_name` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
   `row_pk` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `row_id` bigint unsigned DEFAULT NULL,
   `action` enum('INSERT','UPDATE','DELETE') CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
   `diff_json` json DEFAULT NULL,
+  `change_reason` varchar(255) COLLATE utf8mb4_unicode_ci GENERATED ALWAYS AS (left(json_unquote(json_extract(`diff_json`,_utf8mb4'$.reason')),255)) VIRTUAL,
+  `changed_by_username` varchar(128) COLLATE utf8mb4_unicode_ci GENERATED ALWAYS AS (left(json_unquote(json_extract(`diff_json`,_utf8mb4'$.changed_by_username')),128)) VIRTUAL,
   `changed_by` bigint unsigned DEFAULT NULL,
   `changed_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`audit_id`),
   KEY `ix_audit_table_time` (`table_name`,`changed_at`),
+  KEY `ix_audit_table_row` (`table_name`,`row_id`,`action`),
+  KEY `ix_audit_change_reason` (`change_reason`),
+  KEY `ix_audit_changed_by_username` (`changed_by_username`),
   KEY `fk_audit_user` (`changed_by`),
   CONSTRAINT `fk_audit_user` FOREIGN KEY (`changed_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=15 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -186,8 +192,12 @@ CREATE TABLE `dividend_payout_form_submissions` (
   KEY `idx_dividend_bank` (`bank_id`),
   KEY `idx_dividend_date` (`payout_date`),
   KEY `idx_dividend_status` (`status`),
+  KEY `idx_dividend_status_created` (`status`,`created_at`),
   KEY `fk_dividend_editor` (`edited_by`),
   KEY `idx_dividend_submitted_by` (`submitted_by`),
+  KEY `idx_dividend_created_at` (`created_at`),
+  KEY `idx_dividend_updated_at` (`updated_at`),
+  FULLTEXT KEY `ft_dividend_search` (`partner_name`,`comments`),
   CONSTRAINT `fk_dividend_editor` FOREIGN KEY (`edited_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL,
   CONSTRAINT `fk_dividend_submitted_by` FOREIGN KEY (`submitted_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=18 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -280,9 +290,12 @@ CREATE TABLE `equity_conversion_form_submissions` (
   KEY `idx_conversion_bank` (`bank_name`),
   KEY `idx_conversion_rtn` (`rtn_number`),
   KEY `idx_conversion_status` (`status`),
+  KEY `idx_conversion_status_created` (`status`,`created_at`),
   KEY `idx_conversion_date` (`created_at`),
   KEY `fk_conversion_editor` (`edited_by`),
   KEY `idx_conversion_submitted_by` (`submitted_by`),
+  KEY `idx_conversion_updated_at` (`updated_at`),
+  FULLTEXT KEY `ft_conversion_search` (`bank_name`,`representative_name`,`comments`),
   CONSTRAINT `fk_conversion_editor` FOREIGN KEY (`edited_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL,
   CONSTRAINT `fk_conversion_submitted_by` FOREIGN KEY (`submitted_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=15 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -429,6 +442,49 @@ INSERT INTO `fx_rates` VALUES (2,'USD','HNL',25.250000,'2025-12-05 19:34:37',NUL
 /*!40000 ALTER TABLE `fx_rates` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `import_jobs`
+--
+
+DROP TABLE IF EXISTS `import_jobs`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `import_jobs` (
+  `job_id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `kind` varchar(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `mode` enum('insert','upsert') CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'insert',
+  `status` enum('QUEUED','VALIDATING','INSERTING','SUCCEEDED','FAILED','CANCELLED') CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'QUEUED',
+  `filename` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `file_path` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `rows_validated` int unsigned NOT NULL DEFAULT '0',
+  `rows_total` int unsigned DEFAULT NULL,
+  `rows_inserted` int unsigned NOT NULL DEFAULT '0',
+  `rows_updated` int unsigned NOT NULL DEFAULT '0',
+  `rows_unchanged` int unsigned NOT NULL DEFAULT '0',
+  `error_count` int unsigned NOT NULL DEFAULT '0',
+  `errors_json` json DEFAULT NULL,
+  `message` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `cancel_requested` tinyint(1) NOT NULL DEFAULT '0',
+  `worker_pid` int DEFAULT NULL,
+  `created_by` bigint unsigned DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` datetime DEFAULT NULL ON UPDATE CURRENT_TIMESTAMP,
+  `finished_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`job_id`),
+  KEY `idx_import_jobs_created_by` (`created_by`,`created_at`),
+  CONSTRAINT `fk_import_jobs_user` FOREIGN KEY (`created_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `import_jobs`
+--
+
+LOCK TABLES `import_jobs` WRITE;
+/*!40000 ALTER TABLE `import_jobs` DISABLE KEYS */;
+/*!40000 ALTER TABLE `import_jobs` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `investment_statuses`
 --
@@ -519,7 +575,10 @@ CREATE TABLE `ivl_form_entries` (
   `created_at` datetime DEFAULT CURRENT_TIMESTAMP,
   `updated_by` varchar(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT 'System',
   `updated_at` datetime DEFAULT NULL ON UPDATE CURRENT_TIMESTAMP,
-  PRIMARY KEY (`investment_id`)
+  PRIMARY KEY (`investment_id`),
+  KEY `idx_ivl_created_at` (`created_at`),
+  KEY `idx_ivl_updated_at` (`updated_at`),
+  FULLTEXT KEY `ft_ivl_search` (`partner_name`,`comments`)
 ) ENGINE=InnoDB AUTO_INCREMENT=79 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -580,13 +639,18 @@ CREATE TABLE `matching_equity_entries` (
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` datetime DEFAULT NULL ON UPDATE CURRENT_TIMESTAMP,
   `updated_by` varchar(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT 'System',
+  `import_key` char(40) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL,
   PRIMARY KEY (`investment_id`),
+  UNIQUE KEY `uq_matching_import_key` (`import_key`),
   KEY `fk_matching_creator` (`created_by`),
   KEY `idx_matching_partner` (`partner_name`),
   KEY `idx_matching_year` (`year`),
   KEY `idx_matching_state` (`proposal_state`),
   KEY `idx_matching_bank` (`bank_id`),
   KEY `idx_matching_updated_by` (`updated_by`),
+  KEY `idx_matching_created_at` (`created_at`),
+  KEY `idx_matching_updated_at` (`updated_at`),
+  FULLTEXT KEY `ft_matching_search` (`partner_name`,`community`,`municipality`,`comments`),
   CONSTRAINT `fk_matching_creator` FOREIGN KEY (`created_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=28 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -597,7 +661,7 @@ CREATE TABLE `matching_equity_entries` (
 
 LOCK TABLES `matching_equity_entries` WRITE;
 /*!40000 ALTER TABLE `matching_equity_entries` DISABLE KEYS */;
-INSERT INTO `matching_equity_entries` VALUES (1,'RTN-GRANADILLOS','Crac Renacer de Granadillos',2024,141457.00,424371.00,'MIGUEL RODRIGUEZ','No cumplieron con el Pago de Intereses. Queda sin efecto cualquier negociacion previa.',NULL,NULL,30.00,NULL,NULL,5602.26,NULL,'Rejected','Conversion','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','GRANADILLOS','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(2,'RTN-CARUPPAHG','CARUPPAHG',2024,29390.00,88170.00,'MIGUEL RODRIGUEZ','Eskala Pilot | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,1163.96,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','HOYA GRANDE MOROCELI','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(3,'RTN-FEDEC','FEDEC',2024,792507.30,1981268.25,'MIGUEL RODRIGUEZ','Big Partner Proposal',NULL,NULL,15.00,NULL,NULL,31386.43,NULL,'To Pitch','Conversion','COMMERCE','CAJA RURAL DE AHORRO Y CREDITO','CATACAMAS','CATACAMAS','OLANCHO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(4,'RTN-NAHUATERIQUE','Crac Bendicion de Nahuaterique',2024,12707.00,31767.50,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,503.25,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(5,'RTN-LENCA','Crac Lenca Nuevo Amanecer',2024,11000.00,27500.00,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,435.64,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(6,'RTN-AUXILIADORA','Crac Maria Auxiliadora',2024,33148.00,NULL,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,1312.79,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(7,'RTN-TERRONES','CRAC LOS TERRONES',NULL,NULL,NULL,'MIGUEL RODRIGUEZ','GB',NULL,NULL,20.00,NULL,25000.00,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LOS TERRONES','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System'),(8,'RTN-TEUPASENTI','CRAC LA ESPERANZA DE TEUPASENTI',2024,28982.00,NULL,'MIGUEL RODRIGUEZ','Cash + (Laptop & Printer)',NULL,NULL,20.00,NULL,39810.01,1147.80,NULL,'Executed','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ROSA #1','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(9,'RTN-SANJOSE','CRAC Amor y Fe San Jose',2024,NULL,NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,20.00,NULL,25000.00,NULL,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL GUAYABAL','SAN JOSE','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System'),(10,'RTN-CAMPO7','Crac Campo 7',NULL,NULL,NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CAMPO 7','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System'),(11,'RTN-LUZYESFUERZO','Crac Luz y Esfuerzo',NULL,NULL,NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LAS LOMAS','YORO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System'),(12,'RTN-14SEPT','Crac Nuevo Amanecer Colonia 14 de Septiembre',NULL,NULL,NULL,'MIGUEL RODRIGUEZ','SENPRENDE',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','14 DE SEPTIEMBRE','VICTORIA','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System'),(27,NULL,'Wells Fargo',2025,1000.00,25000.00,'Noah Dolnick','Test','File: matching-1764541427-1764541427158.pdf',NULL,10.00,NULL,110000.00,4230.77,26.000000,'To Pitch','Conversion','Coffee','Coopertive','SANTA ROSA #1','TEUPASENTI','EL PARAISO',100.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,'2025-11-30',48,'2025-11-30 17:23:47',NULL,'48');
+INSERT INTO `matching_equity_entries` VALUES (1,'RTN-GRANADILLOS','Crac Renacer de Granadillos',2024,141457.00,424371.00,'MIGUEL RODRIGUEZ','No cumplieron con el Pago de Intereses. Queda sin efecto cualquier negociacion previa.',NULL,NULL,30.00,NULL,NULL,5602.26,NULL,'Rejected','Conversion','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','GRANADILLOS','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','34f6228866118e6db19a1bf9bc108cc7ea3122ee'),(2,'RTN-CARUPPAHG','CARUPPAHG',2024,29390.00,88170.00,'MIGUEL RODRIGUEZ','Eskala Pilot | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,1163.96,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','HOYA GRANDE MOROCELI','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','bbf224c2c5ad3f215b064a2fe07bf347cb239127'),(3,'RTN-FEDEC','FEDEC',2024,792507.30,1981268.25,'MIGUEL RODRIGUEZ','Big Partner Proposal',NULL,NULL,15.00,NULL,NULL,31386.43,NULL,'To Pitch','Conversion','COMMERCE','CAJA RURAL DE AHORRO Y CREDITO','CATACAMAS','CATACAMAS','OLANCHO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','abbcae4e63f517a397fb43875083e2ad86794c31'),(4,'RTN-NAHUATERIQUE','Crac Bendicion de Nahuaterique',2024,12707.00,31767.50,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,503.25,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','500d333c896b6e769c065cb7665607f58b1b4010'),(5,'RTN-LENCA','Crac Lenca Nuevo Amanecer',2024,11000.00,27500.00,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,435.64,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','cc46ca79e0f536be9e3c54f5020566bf7d4de2ab'),(6,'RTN-AUXILIADORA','Crac Maria Auxiliadora',2024,33148.00,NULL,'CARLOS CONTRERAS','SENPRENDE | Cash + Starlink',NULL,NULL,20.00,NULL,46320.00,1312.79,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ELENA','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','19ae84e2fbf79b39308d8b44d8408846514a6a52'),(7,'RTN-TERRONES','CRAC LOS TERRONES',NULL,NULL,NULL,'MIGUEL RODRIGUEZ','GB',NULL,NULL,20.00,NULL,25000.00,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LOS TERRONES','EL PARAISO','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System','166e4bfe170451ab71be3362f16512c4b41778de'),(8,'RTN-TEUPASENTI','CRAC LA ESPERANZA DE TEUPASENTI',2024,28982.00,NULL,'MIGUEL RODRIGUEZ','Cash + (Laptop & Printer)',NULL,NULL,20.00,NULL,39810.01,1147.80,NULL,'Executed','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ROSA #1','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','31fa85778ce325dec6c40a7511de97c89822821a'),(9,'RTN-SANJOSE','CRAC Amor y Fe San Jose',2024,NULL,NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,20.00,NULL,25000.00,NULL,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL GUAYABAL','SAN JOSE','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:26:28',NULL,'System','4113792b3a04ddcd7b9943826eb6f0922f98bb98'),(10,'RTN-CAMPO7','Crac Campo 7',NULL,NULL,NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CAMPO 7','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System','f75718a9f8b6bc30e9b5ae906595642c7b1ba39f'),(11,'RTN-LUZYESFUERZO','Crac Luz y Esfuerzo',NULL,NULL,NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LAS LOMAS','YORO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System','a803828cb561c12af494e8c93c98b96cd83a0741'),(12,'RTN-14SEPT','Crac Nuevo Amanecer Colonia 14 de Septiembre',NULL,NULL,NULL,'MIGUEL RODRIGUEZ','SENPRENDE',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','14 DE SEPTIEMBRE','VICTORIA','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:26:28',NULL,'System','3aecaa52c0ce089bdaa25b50b3555007c87a319e'),(27,NULL,'Wells Fargo',2025,1000.00,25000.00,'Noah Dolnick','Test','File: matching-1764541427-1764541427158.pdf',NULL,10.00,NULL,110000.00,4230.77,26.000000,'To Pitch','Conversion','Coffee','Coopertive','SANTA ROSA #1','TEUPASENTI','EL PARAISO',100.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,'2025-11-30',48,'2025-11-30 17:23:47',NULL,'48','fb64e28a377beadc25b7f07cc8767095a10b75b2');
 /*!40000 ALTER TABLE `matching_equity_entries` ENABLE KEYS */;
 UNLOCK TABLES;
 
@@ -732,13 +796,18 @@ CREATE TABLE `profit_form_entries` (
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` datetime DEFAULT NULL ON UPDATE CURRENT_TIMESTAMP,
   `updated_by` varchar(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `import_key` char(40) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL,
   PRIMARY KEY (`investment_id`),
+  UNIQUE KEY `uq_profit_import_key` (`import_key`),
   KEY `fk_profit_creator` (`created_by`),
   KEY `idx_profit_partner` (`partner_name`),
   KEY `idx_profit_year` (`year`),
   KEY `idx_profit_state` (`proposal_state`),
   KEY `idx_profit_bank` (`bank_id`),
   KEY `idx_updated_by` (`updated_by`),
+  KEY `idx_profit_created_at` (`created_at`),
+  KEY `idx_profit_updated_at` (`updated_at`),
+  FULLTEXT KEY `ft_profit_search` (`partner_name`,`community`,`municipality`,`comments`),
   CONSTRAINT `fk_profit_creator` FOREIGN KEY (`created_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
 ) ENGINE=InnoDB AUTO_INCREMENT=51 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -749,7 +818,7 @@ CREATE TABLE `profit_form_entries` (
 
 LOCK TABLES `profit_form_entries` WRITE;
 /*!40000 ALTER TABLE `profit_form_entries` DISABLE KEYS */;
-INSERT INTO `profit_form_entries` VALUES (1,NULL,'ESMUPROMARG #2',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Conversion',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(2,NULL,'CREDIESPERANZA',2024,NULL,NULL,NULL,10.00,NULL,NULL,NULL,NULL,'Presented','Conversion',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(3,NULL,'Crac Fe y Esperanza del Espinito',2024,'MIGUEL RODRIGUEZ',NULL,1113259.33,2.38,5566296.67,132645.93,5253.30,NULL,'Executed','Disbursement',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,132645.93,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(4,NULL,'Crac Nueva Esperzanza del Canton',2024,'MIGUEL RODRIGUEZ',NULL,160628.43,12.50,803142.15,100392.77,3975.95,NULL,'Rejected','Disbursement','AGRICULTURE (CASHEW)','ESM','RIO GRANDE','EL TRIUNFO','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(5,NULL,'Crac Unidos para el Desarrollo',2024,'MIGUEL RODRIGUEZ','Big Partner Proposal',278234.00,8.00,1391170.00,111293.60,4407.67,NULL,'Presented','Disbursement','COMMERCE','CAJA DE AHORRO Y CREDITO','BARRIO PIEDRAS AZULES','CHOLUTECA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(6,NULL,'Crac El Porvenir de Santa Rosa #2',2024,'MIGUEL RODRIGUEZ','Cash + Laptop',233322.00,10.00,1166610.00,116661.00,4620.24,NULL,'Rejected','Conversion','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL ESPINITO','SAN MATIAS','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(7,NULL,'Crac Ebenezer El Corralito',2023,'MIGUEL RODRIGUEZ','Ellos aceptaron la Propuesta Original en el 2020. Podriamos retomar el Tema',485084.00,9.00,2425420.00,218287.80,8645.06,NULL,'Rejected','Conversion','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL CANTON','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2023-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(8,NULL,'Crac Renacer 2000',NULL,'MIGUEL RODRIGUEZ','Ellos aceptaron la Propuesta Original en el 2020. Podriamos retomar el Tema',NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL RETIRO','MOROCELI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(9,NULL,'Crac El Pinabetal',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ROSA #2','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(10,NULL,'Crac Nuevo Amanecer',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (VEGGIES)','CAJA RURAL DE AHORRO Y CREDITO','EL CORRALITO','OROPOLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(11,NULL,'ADPROCADE',2024,'MIGUEL RODRIGUEZ',NULL,150986.00,10.00,754930.00,75493.00,2989.82,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','VILLA RICA','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(12,NULL,'Crac MANANTIALES DE VIDA',2024,'MIGUEL RODRIGUEZ',NULL,117495.00,20.00,587475.00,117495.00,4653.27,NULL,'Executed','Conversion','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','GUINOPE','GUINOPE','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(13,NULL,'Crac Uniendo Esfuerzos de San Jose de Ramos',2024,'MIGUEL RODRIGUEZ',NULL,NULL,10.00,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL PORTILLO','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(14,NULL,'CRAC Tierras del Sol',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','FOOTWEAR','ASOCIACION DE PRODUCTORES',NULL,NULL,'FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(15,NULL,'CRAC Union y Esfuerzo Culguaque',NULL,'CARLOS CONTRERAS','Loan Convertion (L.100,000) + Laptop + Printer + Starlink',NULL,NULL,NULL,117495.00,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL TENCHON','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(16,NULL,'CRAC Café del Junacate',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN JOSE DE RAMOS','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(17,NULL,'CRAC NUEVO PARAISO - EL JUNQUILLO',2024,'CARLOS CONTRERAS',NULL,320514.67,10.00,1602573.35,160257.34,6346.83,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','REGADILLOS','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(18,NULL,'Crac Agua Escondida',2024,'CARLOS CONTRERAS',NULL,80141.00,20.00,400705.00,80141.00,3173.90,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','CULGUAQUE','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(19,NULL,'Crac Barrera Viva',2024,'CARLOS CONTRERAS',NULL,105269.00,20.00,526345.00,105269.00,4169.07,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','JUNACATE','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(20,NULL,'Crac Cilca #2',2024,'MIGUEL RODRIGUEZ','Cash + Laptop',62300.00,20.00,311500.00,62300.00,2467.33,NULL,'Executed','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL JUNQUILLO','GOASCORAN','VALLE',NULL,NULL,NULL,NULL,NULL,NULL,160257.34,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(21,NULL,'Crac El Encanto de Danli',2024,'CARLOS CONTRERAS','Cash + Starlink',35529.00,20.00,177645.00,35529.00,1407.09,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','AGUA ESCONDIDA','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,101461.00,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(22,NULL,'Crac Nueva Finca',2024,'CARLOS CONTRERAS',NULL,38742.00,20.00,193710.00,38742.00,1534.34,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LOS NICHOS','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,105269.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(23,NULL,'Crac Cuscateca',2024,'CARLOS CONTRERAS','Cash + Laptop + Printer',64205.89,20.00,321029.47,64205.89,2542.81,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN PEDRO','TUTULE','LA PAZ',NULL,NULL,NULL,NULL,NULL,62300.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(24,NULL,'Crac Cerro Bonito',NULL,'MIGUEL RODRIGUEZ','They said YES to Proposal, However, they would like to Pay the Current Loan First. So basically, the execution will be for next year',NULL,NULL,NULL,NULL,NULL,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL ENCANTO','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(25,NULL,'Crac UNION SOCIEDAD - LAS FLORES',2024,'MIGUEL RODRIGUEZ','Estan tramitando RTN y Cuenta',60208.00,20.00,301040.00,60208.00,2384.48,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL ENCINO','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(26,NULL,'Crac Indepediente Renovacion',NULL,'MIGUEL RODRIGUEZ','Cash + Laptop + Printer',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CUSCATECA','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,64205.89,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(27,NULL,'Crac CASILLAS HACIA EL FUTURO',NULL,'CARLOS CONTRERAS','They said YES to Proposal, However, they would like to Pay the Current Loan First. So basically, the execution will be for the end of the year',NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CERRO BONITO','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(28,NULL,'ESM PUEBLO ORGANIZADO DEL PEDERNAL',2024,'CARLOS CONTRERAS','Cash',212798.59,20.00,1063992.95,212798.59,8427.67,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LAS FLORES','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,60208.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(29,NULL,'Crac LOS COPETES UNIDOS POR MAS',2024,'MIGUEL RODRIGUEZ',NULL,112870.00,20.00,564350.00,112870.00,4470.10,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL OLINGO','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(30,NULL,'Crac El Guayabal',2024,'CARLOS CONTRERAS',NULL,252530.00,20.00,1262650.00,252530.00,10001.19,NULL,'Accepted','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CASILLAS','TALANGA','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(31,NULL,'Crac Union de Sisiguara',2024,'CARLOS CONTRERAS','Cash',60855.00,20.00,304275.00,60855.00,2410.10,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','EMPRESA DE SERVICIOS MULTIPLES','SAN JOSE','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,212798.59,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(32,NULL,'Crac VISION AL DESARROLLO DE ZACATE BLANCO',2024,'CARLOS CONTRERAS','Cash',71665.00,20.00,358325.00,71665.00,2838.22,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LOS COPETES','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,112870.00,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL),(33,NULL,'CRAC Union, Esfuerzo, y Esperanza',NULL,'CARLOS CONTRERAS','Cash + Laptop + Impresora Termica',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','ELL GUAYABAL','SAN JOSE','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,252530.00,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(34,NULL,'CRAC LUZ Y ESPERANZA - EL OJOCHAL',NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SISIGUARA','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,60855.00,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(35,NULL,'CRAC LA LUZ DE SAN AGUSTIN',NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','ZACATE BLANCO','SANTA ANA','LA PAZ',NULL,NULL,NULL,NULL,NULL,71665.00,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(36,NULL,'APROCAL',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','COYOL DE LINACA','CHOLUTECA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(37,NULL,'CRAC NUEVO AMANECER Y ESPERANZA DE YORITO',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL OJOCHAL','MARCOVIA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(38,NULL,'Crac Nuevo Horizonte de la Patastera',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SAN AGUSTIN','NAMASIGUE','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(39,NULL,'Crac Nuevo Esperanza Ayapa',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','ASOCIACION DE PRODUCTORES','EL CHAGUITILLO','SULACO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(40,NULL,'ASOCIACION DE PRODUCTORES AGRICOLAS INMENSA JORNADA',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LA ESPERANZA','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(41,NULL,'Crac Pueblo Viejo',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LA PATASTERA','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(42,NULL,'CRAC FAMILIAR SAN CARLO ACUSTIS',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','AGUAS BUENAS','YORO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(43,NULL,'CRAC Capiro',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','CAPIRO','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(44,NULL,'CRAC Pueblo Viejo Marcala',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','PUEBLO VIEJO','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(45,NULL,'CRAC San Jose La Paz',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN JOSE','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL),(50,'1','Wells Fargo',2025,'Noah Dolnick','Test',110000.00,10.00,660000.00,66000.00,2538.46,26.000000,'pitched','conversion','Coffee','Coopertive','SANTA ROSA #1','TEUPASENTI','EL PARAISO',100.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,'2025-11-30',48,'2025-11-30 18:55:02',NULL,'48');
+INSERT INTO `profit_form_entries` VALUES (1,NULL,'ESMUPROMARG #2',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Conversion',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'1dca74f8a6b5188636ae871dd076745b709459ec'),(2,NULL,'CREDIESPERANZA',2024,NULL,NULL,NULL,10.00,NULL,NULL,NULL,NULL,'Presented','Conversion',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'ec3d535d43a912cc893c14a5a0c996b212917fce'),(3,NULL,'Crac Fe y Esperanza del Espinito',2024,'MIGUEL RODRIGUEZ',NULL,1113259.33,2.38,5566296.67,132645.93,5253.30,NULL,'Executed','Disbursement',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,132645.93,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'8007b3a93122c88fc673816a9c47979bb3488d27'),(4,NULL,'Crac Nueva Esperzanza del Canton',2024,'MIGUEL RODRIGUEZ',NULL,160628.43,12.50,803142.15,100392.77,3975.95,NULL,'Rejected','Disbursement','AGRICULTURE (CASHEW)','ESM','RIO GRANDE','EL TRIUNFO','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'649a744cb0f913594f29a7a2fa4ddff632bdcd7a'),(5,NULL,'Crac Unidos para el Desarrollo',2024,'MIGUEL RODRIGUEZ','Big Partner Proposal',278234.00,8.00,1391170.00,111293.60,4407.67,NULL,'Presented','Disbursement','COMMERCE','CAJA DE AHORRO Y CREDITO','BARRIO PIEDRAS AZULES','CHOLUTECA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'a1aff033dbfd88c75934b586015d5c1bddfed8cb'),(6,NULL,'Crac El Porvenir de Santa Rosa #2',2024,'MIGUEL RODRIGUEZ','Cash + Laptop',233322.00,10.00,1166610.00,116661.00,4620.24,NULL,'Rejected','Conversion','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL ESPINITO','SAN MATIAS','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'c6b13a95b3fc95c5b05fa0b0dbcd2f225f7a36ed'),(7,NULL,'Crac Ebenezer El Corralito',2023,'MIGUEL RODRIGUEZ','Ellos aceptaron la Propuesta Original en el 2020. Podriamos retomar el Tema',485084.00,9.00,2425420.00,218287.80,8645.06,NULL,'Rejected','Conversion','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL CANTON','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2023-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'7245f5254e5320f232c7af7dafbdd32de69878ec'),(8,NULL,'Crac Renacer 2000',NULL,'MIGUEL RODRIGUEZ','Ellos aceptaron la Propuesta Original en el 2020. Podriamos retomar el Tema',NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL RETIRO','MOROCELI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'6012ef073ddba7c9d0f3125e03a38cd7a194ee80'),(9,NULL,'Crac El Pinabetal',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SANTA ROSA #2','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'8f7d661f1611ff1706b091d9469ea54f1d721777'),(10,NULL,'Crac Nuevo Amanecer',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (VEGGIES)','CAJA RURAL DE AHORRO Y CREDITO','EL CORRALITO','OROPOLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'5accefb101f0116e4028133c06d599e49477e2ad'),(11,NULL,'ADPROCADE',2024,'MIGUEL RODRIGUEZ',NULL,150986.00,10.00,754930.00,75493.00,2989.82,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','VILLA RICA','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'be218345cee1c1c64d84de52078fbd84ddd9bacb'),(12,NULL,'Crac MANANTIALES DE VIDA',2024,'MIGUEL RODRIGUEZ',NULL,117495.00,20.00,587475.00,117495.00,4653.27,NULL,'Executed','Conversion','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','GUINOPE','GUINOPE','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'8dc368dbab144906d8a345bd6eae5e89c601d749'),(13,NULL,'Crac Uniendo Esfuerzos de San Jose de Ramos',2024,'MIGUEL RODRIGUEZ',NULL,NULL,10.00,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL PORTILLO','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'66210e88f19923688836762991d39786fd509cf4'),(14,NULL,'CRAC Tierras del Sol',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','FOOTWEAR','ASOCIACION DE PRODUCTORES',NULL,NULL,'FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'0714140a6a716e950866beaeb496d0e61c3bef49'),(15,NULL,'CRAC Union y Esfuerzo Culguaque',NULL,'CARLOS CONTRERAS','Loan Convertion (L.100,000) + Laptop + Printer + Starlink',NULL,NULL,NULL,117495.00,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL TENCHON','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'f0f4eb71a7b82b5a917bdf1b3568062dc709222e'),(16,NULL,'CRAC Café del Junacate',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN JOSE DE RAMOS','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'95f14faf09805e2c535d0e588d502f93bf03c958'),(17,NULL,'CRAC NUEVO PARAISO - EL JUNQUILLO',2024,'CARLOS CONTRERAS',NULL,320514.67,10.00,1602573.35,160257.34,6346.83,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','REGADILLOS','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'ea39055f4f18e58980c39487f50a79789b7e9981'),(18,NULL,'Crac Agua Escondida',2024,'CARLOS CONTRERAS',NULL,80141.00,20.00,400705.00,80141.00,3173.90,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','CULGUAQUE','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'0f8db4530a3365cf1021e1c15150ea08253e8099'),(19,NULL,'Crac Barrera Viva',2024,'CARLOS CONTRERAS',NULL,105269.00,20.00,526345.00,105269.00,4169.07,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','JUNACATE','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'f6e04d562d957b631a0c1bf4c7c9f278e8db35aa'),(20,NULL,'Crac Cilca #2',2024,'MIGUEL RODRIGUEZ','Cash + Laptop',62300.00,20.00,311500.00,62300.00,2467.33,NULL,'Executed','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL JUNQUILLO','GOASCORAN','VALLE',NULL,NULL,NULL,NULL,NULL,NULL,160257.34,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'d31599261d1010de8dc96f29b447a9be0dc7fe86'),(21,NULL,'Crac El Encanto de Danli',2024,'CARLOS CONTRERAS','Cash + Starlink',35529.00,20.00,177645.00,35529.00,1407.09,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','AGUA ESCONDIDA','LEPATERIQUE','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,101461.00,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'2528778d8ce20d481e56b3ce06cdc40b4b5ec0e1'),(22,NULL,'Crac Nueva Finca',2024,'CARLOS CONTRERAS',NULL,38742.00,20.00,193710.00,38742.00,1534.34,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LOS NICHOS','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,105269.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'4502ef9cbdc29476613328bcadc7f749c78d1d73'),(23,NULL,'Crac Cuscateca',2024,'CARLOS CONTRERAS','Cash + Laptop + Printer',64205.89,20.00,321029.47,64205.89,2542.81,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN PEDRO','TUTULE','LA PAZ',NULL,NULL,NULL,NULL,NULL,62300.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'ca1547b0c1d7eb558d3ffa1e294d29a3976ab621'),(24,NULL,'Crac Cerro Bonito',NULL,'MIGUEL RODRIGUEZ','They said YES to Proposal, However, they would like to Pay the Current Loan First. So basically, the execution will be for next year',NULL,NULL,NULL,NULL,NULL,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL ENCANTO','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'0be904f91d7913ab9ef6e26985bcea5ee6054e69'),(25,NULL,'Crac UNION SOCIEDAD - LAS FLORES',2024,'MIGUEL RODRIGUEZ','Estan tramitando RTN y Cuenta',60208.00,20.00,301040.00,60208.00,2384.48,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL ENCINO','TEUPASENTI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'6f7e256b4640c2220be3700b759c5dd351209b3b'),(26,NULL,'Crac Indepediente Renovacion',NULL,'MIGUEL RODRIGUEZ','Cash + Laptop + Printer',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CUSCATECA','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,64205.89,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'7bcbaa23e04d8c7a106d0171700ac7020f261fc9'),(27,NULL,'Crac CASILLAS HACIA EL FUTURO',NULL,'CARLOS CONTRERAS','They said YES to Proposal, However, they would like to Pay the Current Loan First. So basically, the execution will be for the end of the year',NULL,NULL,NULL,NULL,NULL,NULL,'Rejected','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CERRO BONITO','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'106fe5e80f2b8be50bdd84898072ec417c581b74'),(28,NULL,'ESM PUEBLO ORGANIZADO DEL PEDERNAL',2024,'CARLOS CONTRERAS','Cash',212798.59,20.00,1063992.95,212798.59,8427.67,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LAS FLORES','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,60208.00,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'3196b35fa4eed39db17a56feb789cefabd3d46b8'),(29,NULL,'Crac LOS COPETES UNIDOS POR MAS',2024,'MIGUEL RODRIGUEZ',NULL,112870.00,20.00,564350.00,112870.00,4470.10,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','EL OLINGO','DANLI','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'1d678327d13c1b32392073548f908a6061061d98'),(30,NULL,'Crac El Guayabal',2024,'CARLOS CONTRERAS',NULL,252530.00,20.00,1262650.00,252530.00,10001.19,NULL,'Accepted','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','CASILLAS','TALANGA','EL PARAISO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'aeca66121652f596fb21c605fb6aec74d17d7ae3'),(31,NULL,'Crac Union de Sisiguara',2024,'CARLOS CONTRERAS','Cash',60855.00,20.00,304275.00,60855.00,2410.10,NULL,'Accepted','Disbursement','AGRICULTURE (COFFEE)','EMPRESA DE SERVICIOS MULTIPLES','SAN JOSE','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,212798.59,NULL,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'554e8d9675cc5fc19c183a76f6732c0992847d39'),(32,NULL,'Crac VISION AL DESARROLLO DE ZACATE BLANCO',2024,'CARLOS CONTRERAS','Cash',71665.00,20.00,358325.00,71665.00,2838.22,NULL,'Executed','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','LOS COPETES','CANTARRANAS','FRANCISCO MORAZAN',NULL,NULL,NULL,NULL,NULL,NULL,NULL,112870.00,NULL,NULL,NULL,NULL,'2024-01-01',NULL,'2025-11-07 19:51:28',NULL,NULL,'8209dd181a6cc80b4ba36d92aca21e4cc022fcbe'),(33,NULL,'CRAC Union, Esfuerzo, y Esperanza',NULL,'CARLOS CONTRERAS','Cash + Laptop + Impresora Termica',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','ELL GUAYABAL','SAN JOSE','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,252530.00,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'d162330788fbd85bf73f813c6b7cc6ddf298a36f'),(34,NULL,'CRAC LUZ Y ESPERANZA - EL OJOCHAL',NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SISIGUARA','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,60855.00,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'e6860739f7df1c19bcbfb14ed9f439eed8f15d30'),(35,NULL,'CRAC LA LUZ DE SAN AGUSTIN',NULL,'CARLOS CONTRERAS','Cash',NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','ZACATE BLANCO','SANTA ANA','LA PAZ',NULL,NULL,NULL,NULL,NULL,71665.00,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'09868e55a1ab65487ba5bfd8357bdddb016b9040'),(36,NULL,'APROCAL',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','COYOL DE LINACA','CHOLUTECA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'4cbd9598cc24b0afd65835bebd11672933ca8346'),(37,NULL,'CRAC NUEVO AMANECER Y ESPERANZA DE YORITO',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','EL OJOCHAL','MARCOVIA','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'7211b21755ac20fa71e4073dbb024f9de26a2a14'),(38,NULL,'Crac Nuevo Horizonte de la Patastera',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','SAN AGUSTIN','NAMASIGUE','CHOLUTECA',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'c54979fb4d8caedca08ec7844d92dde288eaeb0c'),(39,NULL,'Crac Nuevo Esperanza Ayapa',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','ASOCIACION DE PRODUCTORES','EL CHAGUITILLO','SULACO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'d26651df40a410e299163f15305614d78f4f95d1'),(40,NULL,'ASOCIACION DE PRODUCTORES AGRICOLAS INMENSA JORNADA',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LA ESPERANZA','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'00352c79f6ed5cc86e97b31cd24739b4accf559a'),(41,NULL,'Crac Pueblo Viejo',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (STAPLE GRAINS)','CAJA RURAL DE AHORRO Y CREDITO','LA PATASTERA','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'17c8f8e91d56b2be7648627becca40c6812b8281'),(42,NULL,'CRAC FAMILIAR SAN CARLO ACUSTIS',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','AGUAS BUENAS','YORO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'7ae576539ed15dd7f68c65e9ba5bd28293cd4aec'),(43,NULL,'CRAC Capiro',NULL,'MIGUEL RODRIGUEZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','CAPIRO','YORITO','YORO',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'2a091282c025d68136740530f2ce986cdf03370c'),(44,NULL,'CRAC Pueblo Viejo Marcala',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','PUEBLO VIEJO','MARCALA','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'9be6b153000a4bc56fb89993de282dd4fe017f39'),(45,NULL,'CRAC San Jose La Paz',NULL,'CARLOS CONTRERAS',NULL,NULL,NULL,NULL,NULL,NULL,NULL,'Presented','Disbursement','AGRICULTURE (COFFEE)','CAJA RURAL DE AHORRO Y CREDITO','SAN JOSE','LA PAZ','LA PAZ',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'2025-11-07 19:51:28',NULL,NULL,'801bb27d60c2a740e43015c548f5ea2b458df2df'),(50,'1','Wells Fargo',2025,'Noah Dolnick','Test',110000.00,10.00,660000.00,66000.00,2538.46,26.000000,'pitched','conversion','Coffee','Coopertive','SANTA ROSA #1','TEUPASENTI','EL PARAISO',100.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,0.00,'2025-11-30',48,'2025-11-30 18:55:02',NULL,'48','6dcc4064a1700cda7483425dd7e78c41d6f980a3');
 /*!40000 ALTER TABLE `profit_form_entries` ENABLE KEYS */;
 UNLOCK TABLES;
 
@@ -11,8 +11,11 @@ from dotenv import load_dotenv
 from auth import bp as auth_bp
 from equity import bp as equity_bp
 from admin import bp as admin_bp
-from fx_rates import bp as fx_rates_bp
+from fx_rates import bp as fx_rates_bp, warm_rate_cache
 from reports import bp as reports_bp
+from import_jobs import bp as import_jobs_bp
+from import_previews import bp as import_previews_bp
+from chunked_uploads import bp as chunked_uploads_bp
 
 load_dotenv()
 PORT = int(os.getenv("PORT", 5000))
@@ -75,6 +78,12 @@ app.register_blueprint(equity_bp)
 app.register_blueprint(admin_bp)
 app.register_blueprint(fx_rates_bp)
 app.register_blueprint(reports_bp)
+app.register_blueprint(import_jobs_bp)
+app.register_blueprint(import_previews_bp)
+app.register_blueprint(chunked_uploads_bp)
+
+# Load the FX rate history once up front (see fx_rates.py)
+warm_rate_cache()
 
 # ---- Static file routing ----
 @app.route("/")
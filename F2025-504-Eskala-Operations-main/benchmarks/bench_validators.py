@@ -0,0 +1,123 @@
+"""
+Microbenchmark for validators.py against the hand-written validate_*_record
+functions equity.py used before, per row:
+  - import:  the old DictReader + validate_*_record loop vs validate_batch,
+             which the bulk CSV uploads use now
+  - one row: validate_*_record on a dict vs the schema's per-row validators
+             (entry forms, PUT handlers)
+The old functions are read from equity.py in git history, by default as it
+was just before validators.py was added.
+
+Usage: python benchmarks/bench_validators.py [rows] [--baseline REV]
+"""
+
+import ast
+import pathlib
+import subprocess
+import sys
+import time
+
+APP_DIR = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from validators import (MATCHING_FIELDS, MONTHLY_FIELDS, PROFIT_FIELDS, VALIDATORS, iter_row_batches,
+                        validate_batch)
+
+
+# ============================================
+# BASELINE
+# ============================================
+
+LEGACY_FUNCTIONS = ('safe_float', 'safe_int', 'safe_date', 'validate_matching_equity_record',
+                    'validate_profit_record')
+
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=APP_DIR, check=True, capture_output=True, text=True).stdout
+
+
+def load_baseline(rev=None):
+    """The old validators, defined from equity.py at rev"""
+    if rev is None:
+        added = git('log', '--diff-filter=A', '--format=%H', '--', 'validators.py').split()
+        if not added:
+            sys.exit("validators.py has no history here; pass --baseline REV")
+        rev = added[-1] + '^'
+    tree = ast.parse(git('show', f'{rev}:./equity.py'))
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in LEGACY_FUNCTIONS]
+    namespace = {}
+    exec(compile(ast.Module(body=functions, type_ignores=[]), f'<equity.py at {rev}>', 'exec'), namespace)
+    return namespace['validate_matching_equity_record'], namespace['validate_profit_record']
+
+
+# ============================================
+
+def sample_rows(count):
+    rows = []
+    for i in range(count):
+        row = {
+            'partner_name': f'Partner {i}', 'bank_id': f'B-{i}', 'technician': 'Ana',
+            'year': str(2020 + i % 6), 'expected_profit_pct': '12.5', 'reported_shares': str(100 + i),
+            'share_capital_multiplied': '2500', 'profit_l': '1200.75', 'company_value_l': '6003.75',
+            'investment_l': '5000.50', 'investment_usd': '203.3', 'exchange_rate': '24.6',
+            'proposal_state': 'Approved', 'transaction_type': 'Investment',
+        }
+        row.update({month: '' if i % 3 else str(i % 50) for month in MONTHLY_FIELDS})
+        if i % 25 == 0:
+            row['investment_l'] = '-5'
+        rows.append(row)
+    return rows
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    rev = None
+    if '--baseline' in args:
+        at = args.index('--baseline')
+        rev = args[at + 1]
+        del args[at:at + 2]
+    count = int(args[0]) if args else 20000
+    validate_matching_equity_record, validate_profit_record = load_baseline(rev)
+    rows = sample_rows(count)
+    header = list(rows[0])
+    cells = [[row[name] for name in header] for row in rows]
+
+    for table, fields, baseline in (('matching', MATCHING_FIELDS, validate_matching_equity_record),
+                                    ('profit', PROFIT_FIELDS, validate_profit_record)):
+        compiled = VALIDATORS[table]
+
+        def baseline_import():
+            # The old parse_and_validate_*_csv loop: csv.DictReader made a dict of every row
+            for row_num, values in enumerate(cells, start=2):
+                row = dict(zip(header, values))
+                if all(not str(v).strip() for v in row.values()):
+                    continue
+                baseline(row, row_num)
+
+        def batch_import():
+            for batch in iter_row_batches(iter(cells), header, 1000):
+                validate_batch(fields, header, batch)
+
+        timings = {
+            'import, baseline': best_of(baseline_import),
+            'import, batch': best_of(batch_import),
+            'one row, baseline': best_of(lambda: [baseline(row, n) for n, row in enumerate(rows, start=2)]),
+            'one row, compiled': best_of(lambda: [compiled(row) for row in rows]),
+        }
+        print(f"{table} ({count} rows)")
+        for name, seconds in timings.items():
+            print(f"  {name:<18} {seconds / count * 1e6:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Resumable Chunked Uploads - Flask Blueprint
+Large bulk CSVs and attachments can be sent in fixed-size chunks instead of
+one multipart body, so a dropped connection only costs the missing chunks:
+
+  POST   /api/uploads                      {filename, size, sha256, chunk_size?} -> upload_id
+  PUT    /api/uploads/<id>/chunks?offset=N raw chunk bytes (optional X-Chunk-SHA256 header)
+  GET    /api/uploads/<id>                 which chunk offsets are still missing
+  POST   /api/uploads/<id>/finalize        checks the whole file's SHA-256
+  DELETE /api/uploads/<id>                 abandon the upload
+
+A finalized upload is then passed to any endpoint that takes a file as
+<field>_upload_id (e.g. csv_file_upload_id, payment_proof_upload_id) in
+place of the file itself; see request_file.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import time
+import traceback
+
+from flask import Blueprint, after_this_request, jsonify, request, session
+from werkzeug.datastructures import FileStorage
+
+bp = Blueprint("chunked_uploads", __name__, url_prefix="/api/uploads")
+
+# Not under uploads/, which is served publicly
+SESSION_DIR = pathlib.Path(__file__).parent / "upload-sessions"
+SESSION_DIR.mkdir(exist_ok=True)
+
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", 1024 * 1024))
+CHUNKED_UPLOAD_MAX_BYTES = int(os.getenv("CHUNKED_UPLOAD_MAX_BYTES", 200 * 1024 * 1024))
+# Seconds an unfinished or unused upload is kept, so a partner can resume later in the day
+CHUNKED_UPLOAD_TTL = int(os.getenv("CHUNKED_UPLOAD_TTL", 24 * 3600))
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+# ============================================
+# SESSION STORAGE
+# One directory per upload: meta.json, the file itself (written in place
+# at each chunk's offset) and an empty marker file per received chunk
+# ============================================
+
+def _current_user():
+    """(user_id, auth_error), same checks as equity.require_auth"""
+    if not session.get('is_authenticated') or not session.get('user_id'):
+        return None, (jsonify(ok=False, error="Not authenticated"), 401)
+    return session.get('user_id'), None
+
+def _session_path(upload_id):
+    return SESSION_DIR / upload_id
+
+def _write_meta(upload_id, meta):
+    tmp_path = _session_path(upload_id) / "meta.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
+    os.replace(tmp_path, _session_path(upload_id) / "meta.json")
+
+def _load_session(upload_id, user_id):
+    """(meta, error_response) for an upload this user started"""
+    not_found = (jsonify(ok=False, error='Upload not found or expired'), 404)
+    if not UPLOAD_ID_PATTERN.match(upload_id or ""):
+        return None, not_found
+    try:
+        with open(_session_path(upload_id) / "meta.json", encoding="utf-8") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None, not_found
+    if meta['created_by'] != user_id or time.time() - meta['created_at'] > CHUNKED_UPLOAD_TTL:
+        return None, not_found
+    return meta, None
+
+def _chunk_count(meta):
+    return max(1, -(-meta['size'] // meta['chunk_size']))
+
+def _missing_offsets(upload_id, meta):
+    received = {int(name) for name in os.listdir(_session_path(upload_id) / "chunks")}
+    return [i * meta['chunk_size'] for i in range(_chunk_count(meta)) if i not in received]
+
+def _purge_expired():
+    cutoff = time.time() - CHUNKED_UPLOAD_TTL
+    for path in SESSION_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+def _status(upload_id, meta):
+    missing = _missing_offsets(upload_id, meta)
+    return {
+        'ok': True,
+        'upload_id': upload_id,
+        'filename': meta['filename'],
+        'size': meta['size'],
+        'chunk_size': meta['chunk_size'],
+        'chunk_count': _chunk_count(meta),
+        'received_count': _chunk_count(meta) - len(missing),
+        'missing_offsets': missing,
+        'finalized': meta['finalized']
+    }
+
+
+# ============================================
+# USING A FINISHED UPLOAD FROM OTHER ENDPOINTS
+# ============================================
+
+def request_file(*names):
+    """The file sent for the first of names: a finalized chunked upload referenced as
+    <name>_upload_id, else the multipart file itself (None when neither was sent).
+    Returns (file, error_response). The chunked upload is removed once the request
+    has succeeded; after an error (a validation failure included) it is kept so the same
+    upload_id can be retried until CHUNKED_UPLOAD_TTL expires it"""
+    for name in names:
+        upload_id = request.form.get(f"{name}_upload_id") or request.args.get(f"{name}_upload_id")
+        if upload_id:
+            break
+        if name in request.files:
+            return request.files[name], None
+    else:
+        return None, None
+
+    user_id = session.get('user_id')
+    meta, error = _load_session(upload_id, user_id)
+    if error:
+        return None, error
+    if not meta['finalized']:
+        return None, (jsonify(ok=False, error='Upload is not finished yet. Send the missing chunks and finalize it.'), 409)
+
+    stream = open(_session_path(upload_id) / "data", "rb")
+
+    @after_this_request
+    def _cleanup(response):
+        stream.close()
+        if 200 <= response.status_code < 300:
+            shutil.rmtree(_session_path(upload_id), ignore_errors=True)
+        return response
+
+    return FileStorage(stream=stream, filename=meta['filename'], content_type=meta.get('content_type')), None
+
+
+# ============================================
+# CHUNKED UPLOAD ENDPOINTS
+# ============================================
+
+@bp.post("")
+def start_upload():
+    """Start a chunked upload. Returns the upload_id and the chunk size to use"""
+    user_id, auth_error = _current_user()
+    if auth_error:
+        return auth_error
+
+    body = request.get_json(silent=True) or {}
+    filename = os.path.basename((body.get('filename') or '').strip())
+    sha256 = (body.get('sha256') or '').lower() or None
+    try:
+        size = int(body.get('size'))
+        chunk_size = int(body.get('chunk_size') or CHUNKED_UPLOAD_CHUNK_SIZE)
+    except (TypeError, ValueError):
+        return jsonify(ok=False, error='size and chunk_size must be whole numbers of bytes'), 400
+
+    if not filename:
+        return jsonify(ok=False, error='filename is required'), 400
+    if not 0 < size <= CHUNKED_UPLOAD_MAX_BYTES:
+        return jsonify(ok=False, error=f'size must be between 1 and {CHUNKED_UPLOAD_MAX_BYTES} bytes'), 400
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        return jsonify(ok=False, error=f'chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes'), 400
+    if sha256 and not SHA256_PATTERN.match(sha256):
+        return jsonify(ok=False, error='sha256 must be a hex SHA-256 digest'), 400
+
+    try:
+        _purge_expired()
+        upload_id = os.urandom(16).hex()
+        path = _session_path(upload_id)
+        (path / "chunks").mkdir(parents=True)
+        # Chunks are written in place, in any order
+        with open(path / "data", "wb") as fh:
+            fh.truncate(size)
+
+        meta = {
+            'filename': filename,
+            'content_type': body.get('content_type'),
+            'size': size,
+            'chunk_size': chunk_size,
+            'sha256': sha256,
+            'created_by': user_id,
+            'created_at': time.time(),
+            'finalized': False
+        }
+        _write_meta(upload_id, meta)
+        print(f"📤 Chunked upload {upload_id} started: {filename} ({size} bytes) by user {user_id}")
+        return jsonify(_status(upload_id, meta)), 201
+
+    except Exception as e:
+        print(f"❌ Error starting chunked upload: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Could not start upload'), 500
+
+@bp.put("/<upload_id>/chunks")
+def upload_chunk(upload_id):
+    """Store one chunk at ?offset=. Sending a chunk again (after a dropped connection) is fine"""
+    user_id, auth_error = _current_user()
+    if auth_error:
+        return auth_error
+    meta, error = _load_session(upload_id, user_id)
+    if error:
+        return error
+    if meta['finalized']:
+        return jsonify(ok=False, error='Upload is already finalized'), 409
+
+    try:
+        offset = int(request.args.get('offset', ''))
+    except ValueError:
+        return jsonify(ok=False, error='offset is required'), 400
+    index, misaligned = divmod(offset, meta['chunk_size'])
+    if offset < 0 or misaligned or index >= _chunk_count(meta):
+        return jsonify(ok=False, error=f"offset must be a multiple of {meta['chunk_size']} below {meta['size']}"), 400
+
+    data = request.get_data(cache=False)
+    expected = min(meta['chunk_size'], meta['size'] - offset)
+    if len(data) != expected:
+        return jsonify(ok=False, error=f'Chunk at offset {offset} must be {expected} bytes (got {len(data)})'), 400
+    chunk_sha256 = (request.headers.get('X-Chunk-SHA256') or '').lower()
+    if chunk_sha256 and hashlib.sha256(data).hexdigest() != chunk_sha256:
+        return jsonify(ok=False, error=f'Chunk at offset {offset} was corrupted in transit. Please send it again.'), 422
+
+    try:
+        path = _session_path(upload_id)
+        with open(path / "data", "r+b") as fh:
+            fh.seek(offset)
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        # Marked only once the bytes are on disk
+        (path / "chunks" / str(index)).touch()
+        return jsonify(_status(upload_id, meta)), 200
+
+    except Exception as e:
+        print(f"❌ Error storing chunk {index} of upload {upload_id}: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Could not store chunk. Please send it again.'), 500
+
+@bp.get("/<upload_id>")
+def upload_status(upload_id):
+    """Progress of an upload: the offsets still to send"""
+    user_id, auth_error = _current_user()
+    if auth_error:
+        return auth_error
+    meta, error = _load_session(upload_id, user_id)
+    if error:
+        return error
+    return jsonify(_status(upload_id, meta)), 200
+
+@bp.post("/<upload_id>/finalize")
+def finalize_upload(upload_id):
+    """Check every chunk arrived and the file's SHA-256 (from the start request or this body) matches"""
+    user_id, auth_error = _current_user()
+    if auth_error:
+        return auth_error
+    meta, error = _load_session(upload_id, user_id)
+    if error:
+        return error
+
+    body = request.get_json(silent=True) or {}
+    sha256 = (body.get('sha256') or meta['sha256'] or '').lower()
+    if not SHA256_PATTERN.match(sha256):
+        return jsonify(ok=False, error='sha256 of the whole file is required'), 400
+
+    missing = _missing_offsets(upload_id, meta)
+    if missing:
+        return jsonify(ok=False, error=f'{len(missing)} chunk(s) still missing', missing_offsets=missing), 409
+
+    try:
+        digest = hashlib.sha256()
+        with open(_session_path(upload_id) / "data", "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b''):
+                digest.update(block)
+        if digest.hexdigest() != sha256:
+            # No way to tell which chunk is bad: start the chunks over
+            shutil.rmtree(_session_path(upload_id) / "chunks")
+            (_session_path(upload_id) / "chunks").mkdir()
+            print(f"❌ Chunked upload {upload_id}: checksum mismatch")
+            return jsonify(ok=False, error='Checksum mismatch: the file arrived corrupted. Please upload it again.',
+                           missing_offsets=_missing_offsets(upload_id, meta)), 422
+
+        meta.update(sha256=sha256, finalized=True)
+        _write_meta(upload_id, meta)
+        print(f"✅ Chunked upload {upload_id} finalized: {meta['filename']}")
+        return jsonify(_status(upload_id, meta)), 200
+
+    except Exception as e:
+        print(f"❌ Error finalizing upload {upload_id}: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Could not finalize upload'), 500
+
+@bp.delete("/<upload_id>")
+def cancel_upload(upload_id):
+    user_id, auth_error = _current_user()
+    if auth_error:
+        return auth_error
+    meta, error = _load_session(upload_id, user_id)
+    if error:
+        return error
+    shutil.rmtree(_session_path(upload_id), ignore_errors=True)
+    return jsonify(ok=True, message='Upload cancelled'), 200
@@ -1,10 +1,21 @@
 
-import pathlib, time
+import codecs, hashlib, io, json, multiprocessing, os, pathlib, re, time
 import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 from io import StringIO
-from flask import Blueprint, request, jsonify, session
-from sqlalchemy import text
+from flask import Blueprint, Response, request, jsonify, session, stream_with_context
+from sqlalchemy import bindparam, text
 from db import SessionLocal, run_query
+from chunked_uploads import request_file
+from formula_engine import (FORM_FIELDS, FORM_TABLES, SIMULATION_TOP_PARTNERS, CompiledFormula, FormulaError,
+                            active_formulas, compile_formula, fill_derived, form_formulas, formula_graph,
+                            formula_timeline, invalidate_formulas, recompute_chain, simulate_formula,
+                            validate_expression)
+from validators import (MATCHING_FIELDS, PROFIT_FIELDS, IVL_FIELDS, VALIDATORS, iter_row_batches, validate_batch,
+                        validate_batch_packed)
 
 bp = Blueprint("equity", __name__, url_prefix="/api/equity")
 UPLOAD_DIR = pathlib.Path(__file__).parent / "uploads"
@@ -48,6 +59,324 @@ def require_auth():
     # success: no error
     return user_id, role, None
 
+def require_login():
+    """require_auth without the role lookup, for endpoints whose answer doesn't depend on the role.
+    Returns (user_id, auth_error)"""
+    if not session.get('is_authenticated'):
+        return None, (jsonify(ok=False, error="Not authenticated"), 401)
+    user_id = session.get('user_id')
+    if not user_id:
+        return None, (jsonify(ok=False, error="Invalid session"), 401)
+    return user_id, None
+
+def validate_fields(schema, data):
+    """Check a form or JSON body with a compiled validator from validators.py.
+    Returns (parsed_data, error_response); error_response is a 400 naming every bad field"""
+    is_valid, error_msg, parsed_data = VALIDATORS[schema](data or {})
+    if not is_valid:
+        return None, (jsonify(ok=False, error=error_msg), 400)
+    return parsed_data, None
+
+
+# ============================================
+# DELTA SYNC HELPERS
+# Listings accept ?since=<cursor> and return only rows inserted or
+# updated at/after the cursor, plus tombstones for deleted IDs
+# ============================================
+
+def _parse_since(value):
+    """Parse a ?since= cursor (ISO timestamp). Returns None when absent, raises ValueError when malformed"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+def _sync_cursor(s):
+    """Database clock taken BEFORE the listing query, so the next ?since= can't skip rows written meanwhile"""
+    return s.execute(text("SELECT NOW()")).scalar()
+
+def _deleted_since(s, listing, user_id, role, since):
+    """IDs deleted from a listing's table at/after since (read from audit_log tombstones).
+    Same ownership rule as _listing_filters: community reps only get their own rows' tombstones"""
+    spec = LISTINGS[listing]
+    query = """
+        SELECT row_id
+        FROM audit_log
+        WHERE table_name = :table_name
+          AND changed_at >= :since
+          AND action = 'DELETE'
+    """
+    params = {"table_name": spec['table'], "since": since}
+    if spec['owner_column'] and role == "COMMUNITY_REP":
+        query += " AND JSON_EXTRACT(diff_json, '$.owner') = :user_id"
+        params["user_id"] = user_id
+    rows = s.execute(text(query), params).fetchall()
+    return [row.row_id for row in rows]
+
+def _record_delete(s, table_name, row_pk, owner=None):
+    """Write a DELETE tombstone to audit_log (call inside the deleting transaction).
+    owner: the row's submitted_by, for tables whose listings are scoped per community rep"""
+    s.execute(text("""
+        INSERT INTO audit_log (table_name, row_pk, row_id, action, diff_json, changed_by, changed_at)
+        VALUES (:table_name, :row_pk, :row_id, 'DELETE', :diff_json, :changed_by, NOW())
+    """), {
+        "table_name": table_name,
+        "row_pk": str(row_pk),
+        "row_id": row_pk,
+        "diff_json": json.dumps({'owner': owner}) if owner is not None else None,
+        "changed_by": session.get('user_id')
+    })
+
+
+# ============================================
+# LISTING FILTERS
+# One spec per data table, shared by the JSON listings, the CSV
+# export and search so all of them apply exactly the same WHERE clause.
+# search_columns must match the table's FULLTEXT index column list
+# ============================================
+
+LISTINGS = {
+    'matching': {
+        'table': 'matching_equity_entries',
+        'alias': 'm',
+        'from': """
+            matching_equity_entries m
+            LEFT JOIN users u1 ON m.created_by = u1.user_id
+            LEFT JOIN users u2 ON m.updated_by = u2.user_id
+        """,
+        'owner_column': None,
+        'order_by': 'm.created_at DESC',
+        'id_column': 'm.investment_id',
+        'label_column': 'm.partner_name',
+        'search_columns': ['m.partner_name', 'm.community', 'm.municipality', 'm.comments'],
+        'text_columns': ['m.partner_name', 'm.comments', 'm.technician',
+                         "COALESCE(u1.username, 'System')", "COALESCE(u2.username, 'System')"],
+        'filters': {'year': 'm.year', 'proposal_state': 'm.proposal_state', 'transaction_type': 'm.transaction_type'},
+        'summary': [
+            ('total_entries', 'COUNT(*)'),
+            ('total_investment_l', 'SUM(m.investment_l)'),
+            ('total_investment_usd', 'SUM(m.investment_usd)'),
+            ('total_reported_shares', 'SUM(m.reported_shares)'),
+        ],
+        'export_columns': [
+            ('investment_id', 'm.investment_id'), ('partner_name', 'm.partner_name'),
+            ('expected_profit_pct', 'm.expected_profit_pct'), ('year', 'm.year'),
+            ('bank_id', 'm.bank_id'), ('technician', 'm.technician'),
+            ('reported_shares', 'm.reported_shares'), ('share_capital_multiplied', 'm.share_capital_multiplied'),
+            ('investment_l', 'm.investment_l'), ('investment_usd', 'm.investment_usd'),
+            ('exchange_rate', 'm.exchange_rate'), ('proposal_state', 'm.proposal_state'),
+            ('transaction_type', 'm.transaction_type'),
+            ('january_l', 'm.january_l'), ('february_l', 'm.february_l'), ('march_l', 'm.march_l'),
+            ('april_l', 'm.april_l'), ('may_l', 'm.may_l'), ('june_l', 'm.june_l'),
+            ('july_l', 'm.july_l'), ('august_l', 'm.august_l'), ('september_l', 'm.september_l'),
+            ('october_l', 'm.october_l'), ('november_l', 'm.november_l'), ('december_l', 'm.december_l'),
+            ('business_category', 'm.business_category'), ('company_type', 'm.company_type'),
+            ('community', 'm.community'), ('municipality', 'm.municipality'), ('state', 'm.state'),
+            ('comments', 'm.comments'), ('notes', 'm.notes'), ('start_date', 'm.start_date'),
+            ('created_by', "COALESCE(u1.username, 'System')"), ('created_at', 'm.created_at'),
+            ('updated_by', "COALESCE(u2.username, 'System')"), ('updated_at', 'm.updated_at'),
+        ],
+    },
+    'profit': {
+        'table': 'profit_form_entries',
+        'alias': 'p',
+        'from': """
+            profit_form_entries p
+            LEFT JOIN users u1 ON p.created_by = u1.user_id
+            LEFT JOIN users u2 ON p.updated_by = u2.user_id
+        """,
+        'owner_column': None,
+        'order_by': 'p.investment_id DESC',
+        'id_column': 'p.investment_id',
+        'label_column': 'p.partner_name',
+        'search_columns': ['p.partner_name', 'p.community', 'p.municipality', 'p.comments'],
+        'text_columns': ['p.partner_name', 'p.bank_id', 'p.comments', 'p.technician',
+                         "COALESCE(u1.username, 'System')", "COALESCE(u2.username, 'System')"],
+        'filters': {'year': 'p.year', 'proposal_state': 'p.proposal_state', 'transaction_type': 'p.transaction_type'},
+        'summary': [
+            ('total_entries', 'COUNT(*)'),
+            ('total_investment_l', 'SUM(p.investment_l)'),
+            ('total_investment_usd', 'SUM(p.investment_usd)'),
+            ('avg_expected_profit', 'AVG(p.expected_profit_pct)'),
+        ],
+        'export_columns': [
+            ('investment_id', 'p.investment_id'), ('partner_name', 'p.partner_name'),
+            ('expected_profit_pct', 'p.expected_profit_pct'), ('year', 'p.year'),
+            ('bank_id', 'p.bank_id'), ('technician', 'p.technician'),
+            ('profit_l', 'p.profit_l'), ('company_value_l', 'p.company_value_l'),
+            ('investment_l', 'p.investment_l'), ('investment_usd', 'p.investment_usd'),
+            ('exchange_rate', 'p.exchange_rate'), ('proposal_state', 'p.proposal_state'),
+            ('transaction_type', 'p.transaction_type'),
+            ('january_l', 'p.january_l'), ('february_l', 'p.february_l'), ('march_l', 'p.march_l'),
+            ('april_l', 'p.april_l'), ('may_l', 'p.may_l'), ('june_l', 'p.june_l'),
+            ('july_l', 'p.july_l'), ('august_l', 'p.august_l'), ('september_l', 'p.september_l'),
+            ('october_l', 'p.october_l'), ('november_l', 'p.november_l'), ('december_l', 'p.december_l'),
+            ('business_category', 'p.business_category'), ('company_type', 'p.company_type'),
+            ('community', 'p.community'), ('municipality', 'p.municipality'), ('state', 'p.state'),
+            ('comments', 'p.comments'), ('start_date', 'p.start_date'),
+            ('created_by', "COALESCE(u1.username, 'System')"), ('created_at', 'p.created_at'),
+            ('updated_by', "COALESCE(u2.username, 'System')"), ('updated_at', 'p.updated_at'),
+        ],
+    },
+    'ivl': {
+        'table': 'ivl_form_entries',
+        'alias': 'ivl',
+        'from': "ivl_form_entries ivl",
+        'owner_column': None,
+        'order_by': 'ivl.created_at DESC',
+        'id_column': 'ivl.investment_id',
+        'label_column': 'ivl.partner_name',
+        'search_columns': ['ivl.partner_name', 'ivl.comments'],
+        'text_columns': ['ivl.partner_name', 'ivl.comments', 'ivl.created_by', 'ivl.updated_by'],
+        'filters': {},
+        'summary': [
+            ('total_entries', 'COUNT(*)'),
+            ('total_investment', 'SUM(ivl.investment_amount)'),
+            ('total_last_loan', 'SUM(ivl.last_loan)'),
+            ('total_difference', 'SUM(ivl.difference)'),
+        ],
+        'export_columns': [
+            ('investment_id', 'ivl.investment_id'), ('partner_name', 'ivl.partner_name'),
+            ('expected_profit_pct', 'ivl.expected_profit_pct'), ('investment_amount', 'ivl.investment_amount'),
+            ('last_loan', 'ivl.last_loan'), ('difference', 'ivl.difference'),
+            ('comments', 'ivl.comments'), ('notes', 'ivl.notes'), ('start_date', 'ivl.start_date'),
+            ('created_by', 'ivl.created_by'), ('created_at', 'ivl.created_at'),
+            ('updated_by', 'ivl.updated_by'), ('updated_at', 'ivl.updated_at'),
+        ],
+    },
+    'entry': {
+        'table': 'dividend_payout_form_submissions',
+        'alias': 'd',
+        'from': """
+            dividend_payout_form_submissions d
+            LEFT JOIN users u ON d.edited_by = u.user_id
+        """,
+        'owner_column': 'd.submitted_by',
+        'order_by': 'd.created_at DESC',
+        'id_column': 'd.submission_id',
+        'label_column': 'd.partner_name',
+        'search_columns': ['d.partner_name', 'd.comments'],
+        'text_columns': ['d.partner_name', 'd.bank_id'],
+        'filters': {'status': 'd.status', 'payment_method': 'd.payment_method'},
+        'summary': [
+            ('total_entries', 'COUNT(*)'),
+            ('total_investment_hnl', 'SUM(d.investment_hnl)'),
+            ('total_investment_usd', 'SUM(d.investment_usd)'),
+            ('total_amount_paid', 'SUM(d.amount_paid)'),
+        ],
+        'export_columns': [
+            ('submission_id', 'd.submission_id'), ('bank_id', 'd.bank_id'),
+            ('partner_name', 'd.partner_name'), ('reported_shares', 'd.reported_shares'),
+            ('investment_hnl', 'd.investment_hnl'), ('investment_usd', 'd.investment_usd'),
+            ('payout_date', 'd.payout_date'), ('amount_paid', 'd.amount_paid'),
+            ('payment_method', 'd.payment_method'), ('payment_proof_path', 'd.payment_proof_path'),
+            ('comments', 'd.comments'), ('confirmed', 'd.confirmed'), ('status', 'd.status'),
+            ('created_at', 'd.created_at'), ('updated_at', 'd.updated_at'),
+            ('edited_at', 'd.edited_at'), ('edited_by', 'u.username'),
+        ],
+    },
+    'conversion': {
+        'table': 'equity_conversion_form_submissions',
+        'alias': 'e',
+        'from': """
+            equity_conversion_form_submissions e
+            LEFT JOIN users u ON e.edited_by = u.user_id
+        """,
+        'owner_column': 'e.submitted_by',
+        'order_by': 'e.created_at DESC',
+        'id_column': 'e.submission_id',
+        'label_column': 'e.bank_name',
+        'search_columns': ['e.bank_name', 'e.representative_name', 'e.comments'],
+        'text_columns': ['e.bank_name', 'e.rtn_number', 'e.representative_name'],
+        'filters': {'status': 'e.status'},
+        'summary': [
+            ('total_entries', 'COUNT(*)'),
+            ('total_original_loan_amount', 'SUM(e.original_loan_amount)'),
+            ('total_proposed_conversion_amount', 'SUM(e.proposed_conversion_amount)'),
+        ],
+        'export_columns': [
+            ('submission_id', 'e.submission_id'), ('bank_name', 'e.bank_name'),
+            ('rtn_number', 'e.rtn_number'), ('representative_name', 'e.representative_name'),
+            ('phone_number', 'e.phone_number'), ('loan_id', 'e.loan_id'),
+            ('original_loan_amount', 'e.original_loan_amount'), ('loan_approval_date', 'e.loan_approval_date'),
+            ('interest_paid', 'e.interest_paid'), ('loan_amount_remaining', 'e.loan_amount_remaining'),
+            ('repayment_frequency', 'e.repayment_frequency'),
+            ('proposed_conversion_amount', 'e.proposed_conversion_amount'),
+            ('proposed_conversion_ratio', 'e.proposed_conversion_ratio'),
+            ('proposed_equity_percentage', 'e.proposed_equity_percentage'),
+            ('desired_conversion_date', 'e.desired_conversion_date'),
+            ('comments', 'e.comments'), ('attachment_path', 'e.attachment_path'),
+            ('confirmed', 'e.confirmed'), ('status', 'e.status'),
+            ('created_at', 'e.created_at'), ('updated_at', 'e.updated_at'),
+            ('edited_at', 'e.edited_at'), ('edited_by', 'u.username'),
+        ],
+    },
+}
+
+def _listing_filters(listing, user_id, role, since=None, args=None):
+    """WHERE conditions + params for a listing: COMMUNITY_REP ownership, the ?since= cursor
+    and the table page filters (?q= substring search plus exact-match filters like ?year=)"""
+    spec = LISTINGS[listing]
+    alias = spec['alias']
+    args = args or {}
+    conditions = []
+    params = {}
+
+    # Community reps (banking partners) only see their own submissions
+    # STAFF sees everything
+    if spec['owner_column'] and role == "COMMUNITY_REP":
+        conditions.append(f"{spec['owner_column']} = :user_id")
+        params["user_id"] = user_id
+
+    # Delta sync: only rows inserted or updated since the cursor
+    if since:
+        conditions.append(f"({alias}.created_at >= :since OR {alias}.updated_at >= :since)")
+        params["since"] = since
+
+    # Same substring search the table pages used to do client-side
+    q = (args.get('q') or '').strip()
+    if q:
+        conditions.append("(" + " OR ".join(f"{col} LIKE :q" for col in spec['text_columns']) + ")")
+        escaped = q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params["q"] = f"%{escaped}%"
+
+    for arg, column in spec['filters'].items():
+        value = (args.get(arg) or '').strip()
+        if value:
+            conditions.append(f"{column} = :filter_{arg}")
+            params[f"filter_{arg}"] = value
+
+    return conditions, params
+
+def _where(conditions):
+    return (" WHERE " + " AND ".join(conditions)) if conditions else ""
+
+def _summary_columns(listing):
+    """Extra SELECT columns for ?include_summary=1 - the aggregates over the whole filtered
+    result, computed as window functions in the listing query itself"""
+    return "".join(
+        f",\n                    {expr} OVER () AS summary_{name}"
+        for name, expr in LISTINGS[listing]['summary']
+    )
+
+def _summary_values(listing, row, prefix=''):
+    """Summary dict from an aggregate row (or the first listing row); zeros when there is no row"""
+    summary = {}
+    for name, _ in LISTINGS[listing]['summary']:
+        value = getattr(row, prefix + name) if row is not None else None
+        if name == 'total_entries':
+            summary[name] = int(value or 0)
+        else:
+            summary[name] = float(value) if value else 0
+    return summary
+
+def _listing_summary(s, listing, args):
+    """Aggregates over one listing's filtered rows in a single grouped pass"""
+    spec = LISTINGS[listing]
+    conditions, params = _listing_filters(listing, None, None, args=args)
+    aggregates = ", ".join(f"{expr} AS {name}" for name, expr in spec['summary'])
+    row = s.execute(text(f"SELECT {aggregates} FROM {spec['from']}{_where(conditions)}"), params).fetchone()
+    return _summary_values(listing, row)
+
 
 # ============================================
 # EQUITY CONVERSION FORM SUBMISSION
@@ -62,7 +391,9 @@ def conversion():
         return auth_error
     
     b = request.form
-    f = request.files.get("attachment")
+    f, file_error = request_file("attachment")
+    if file_error:
+        return file_error
     
     bank_name = (b.get("bank_name") or "").strip()
     rtn_number = (b.get("rtn_number") or "").strip()
@@ -157,7 +488,9 @@ def entry():
         return auth_error
     
     b = request.form
-    f = request.files.get("payment_proof")
+    f, file_error = request_file("payment_proof")
+    if file_error:
+        return file_error
 
     bank_id = (b.get("bank_id") or "").strip()  # RTN Number
     partner_name = (b.get("partner_name") or "").strip()
@@ -229,31 +562,33 @@ def get_entry_submissions():
     user_id, role, auth_error = require_auth()
     if auth_error:
         return auth_error
-    
+
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+    include_summary = request.args.get('include_summary') in ('1', 'true')
+
     try:
         with SessionLocal() as s:
+            cursor = _sync_cursor(s)
+
             # Base query
-            query = """
-                SELECT 
+            summary_columns = _summary_columns('entry') if include_summary else ""
+            query = f"""
+                SELECT
                     d.submission_id, d.bank_id, d.partner_name, d.reported_shares,
                     d.investment_hnl, d.investment_usd, d.payout_date, d.amount_paid,
                     d.payment_method, d.payment_proof_path, d.comments, d.confirmed, d.status,
                     d.created_at, d.updated_at, d.edited_at, d.submitted_by,
-                    u.username as edited_by
+                    u.username as edited_by{summary_columns}
                 FROM dividend_payout_form_submissions d
                 LEFT JOIN users u ON d.edited_by = u.user_id
             """
-            
-            # Filter by user for community reps (banking partners)
-            if role == "COMMUNITY_REP":
-                query += " WHERE d.submitted_by = :user_id"
-                params = {"user_id": user_id}
-            else:
-                # STAFF sees all submissions
-                params = {}
-            
+            conditions, params = _listing_filters('entry', user_id, role, since, request.args)
+            query += _where(conditions)
             query += " ORDER BY d.created_at DESC"
-            
+
             rows = s.execute(text(query), params).fetchall()
             
             entries = []
@@ -277,9 +612,15 @@ def get_entry_submissions():
                     'edited_at': row.edited_at.isoformat() if row.edited_at else None,
                     'edited_by': row.edited_by
                 })
-            
-            return jsonify(ok=True, submissions=entries), 200
-            
+
+            response = {'ok': True, 'submissions': entries, 'cursor': cursor.isoformat()}
+            if include_summary:
+                response['summary'] = _summary_values('entry', rows[0] if rows else None, prefix='summary_')
+            if since:
+                response['deleted_ids'] = _deleted_since(s, 'entry', user_id, role, since)
+
+            return jsonify(response), 200
+
     except Exception as e:
         print(f"❌ Error in profit bulk upload: {e}")
         import traceback
@@ -348,7 +689,9 @@ def get_entry_submission(submission_id):
 def update_entry_submission(submission_id):
     """Update a dividend payout submission"""
     try:
-        data = request.get_json()
+        entry, validation_error = validate_fields('entry', request.get_json())
+        if validation_error:
+            return validation_error
         username = session.get('username', 'System')
         
         # Get the user_id from username
@@ -373,20 +716,7 @@ def update_entry_submission(submission_id):
                     edited_by = :edited_by,
                     edited_at = NOW()
                 WHERE submission_id = :submission_id
-            """), {
-                "submission_id": submission_id,
-                "bank_id": data.get("bank_id"),
-                "partner_name": data.get("partner_name"),
-                "reported_shares": data.get("reported_shares"),
-                "investment_hnl": data.get("investment_hnl"),
-                "investment_usd": data.get("investment_usd"),
-                "payout_date": data.get("payout_date"),
-                "amount_paid": data.get("amount_paid"),
-                "payment_method": data.get("payment_method"),
-                "status": data.get("status"),
-                "comments": data.get("comments"),
-                "edited_by": user_id
-            })
+            """), {**entry, "submission_id": submission_id, "edited_by": user_id})
         
         return jsonify(ok=True, message="Submission updated successfully"), 200
         
@@ -429,10 +759,17 @@ def delete_entry_submission(submission_id):
         
         # Delete the submission
         with SessionLocal() as s, s.begin():
-            s.execute(text("""
+            owner = s.execute(text("""
+                SELECT submitted_by FROM dividend_payout_form_submissions
+                WHERE submission_id = :id
+            """), {"id": submission_id}).scalar()
+            result = s.execute(text("""
                 DELETE FROM dividend_payout_form_submissions
                 WHERE submission_id = :id
             """), {"id": submission_id})
+
+            if result.rowcount:
+                _record_delete(s, 'dividend_payout_form_submissions', submission_id, owner)
         
         print(f"✅ Submission {submission_id} deleted successfully")
         return jsonify(ok=True, message="Submission deleted successfully"), 200
@@ -455,31 +792,33 @@ def get_conversion_submissions():
     user_id, role, auth_error = require_auth()
     if auth_error:
         return auth_error
-    
+
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+    include_summary = request.args.get('include_summary') in ('1', 'true')
+
     try:
         with SessionLocal() as s:
+            cursor = _sync_cursor(s)
+
             # Base query
-            query = """
-                SELECT 
+            summary_columns = _summary_columns('conversion') if include_summary else ""
+            query = f"""
+                SELECT
                     e.submission_id, e.bank_name, e.rtn_number, e.representative_name, e.phone_number,
                     e.loan_id, e.original_loan_amount, e.loan_approval_date, e.interest_paid,
                     e.loan_amount_remaining, e.repayment_frequency, e.proposed_conversion_amount,
-                    e.proposed_conversion_ratio, e.proposed_equity_percentage, 
+                    e.proposed_conversion_ratio, e.proposed_equity_percentage,
                     e.desired_conversion_date, e.comments, e.attachment_path, e.confirmed, e.status,
                     e.created_at, e.updated_at, e.edited_at, e.submitted_by,
-                    u.username as edited_by
+                    u.username as edited_by{summary_columns}
                 FROM equity_conversion_form_submissions e
                 LEFT JOIN users u ON e.edited_by = u.user_id
             """
-            
-            # Filter by user for community reps (banking partners)
-            if role == "COMMUNITY_REP":
-                query += " WHERE e.submitted_by = :user_id"
-                params = {"user_id": user_id}
-            else:
-                # STAFF sees all submissions
-                params = {}
-            
+            conditions, params = _listing_filters('conversion', user_id, role, since, request.args)
+            query += _where(conditions)
             query += " ORDER BY e.created_at DESC"
             
             rows = s.execute(text(query), params).fetchall()
@@ -511,9 +850,15 @@ def get_conversion_submissions():
                     'edited_at': row.edited_at.isoformat() if row.edited_at else None,
                     'edited_by': row.edited_by
                 })
-            
-            return jsonify(ok=True, submissions=entries), 200
-            
+
+            response = {'ok': True, 'submissions': entries, 'cursor': cursor.isoformat()}
+            if include_summary:
+                response['summary'] = _summary_values('conversion', rows[0] if rows else None, prefix='summary_')
+            if since:
+                response['deleted_ids'] = _deleted_since(s, 'conversion', user_id, role, since)
+
+            return jsonify(response), 200
+
     except Exception as e:
         print(f"❌ Error in profit bulk upload: {e}")
         import traceback
@@ -590,7 +935,9 @@ def get_conversion_submission(submission_id):
 def update_conversion_submission(submission_id):
     """Update an equity conversion submission"""
     try:
-        data = request.get_json()
+        entry, validation_error = validate_fields('conversion', request.get_json())
+        if validation_error:
+            return validation_error
         username = session.get('username', 'System')
         
         # Get the user_id from username
@@ -621,26 +968,7 @@ def update_conversion_submission(submission_id):
                     edited_by = :edited_by,
                     edited_at = NOW()
                 WHERE submission_id = :submission_id
-            """), {
-                "submission_id": submission_id,
-                "bank_name": data.get("bank_name"),
-                "rtn_number": data.get("rtn_number"),
-                "representative_name": data.get("representative_name"),
-                "phone_number": data.get("phone_number"),
-                "loan_id": data.get("loan_id"),
-                "original_loan_amount": data.get("original_loan_amount"),
-                "loan_approval_date": data.get("loan_approval_date"),
-                "interest_paid": data.get("interest_paid"),
-                "loan_amount_remaining": data.get("loan_amount_remaining"),
-                "repayment_frequency": data.get("repayment_frequency"),
-                "proposed_conversion_amount": data.get("proposed_conversion_amount"),
-                "proposed_conversion_ratio": data.get("proposed_conversion_ratio"),
-                "proposed_equity_percentage": data.get("proposed_equity_percentage"),
-                "desired_conversion_date": data.get("desired_conversion_date"),
-                "status": data.get("status"),
-                "comments": data.get("comments"),
-                "edited_by": user_id
-            })
+            """), {**entry, "submission_id": submission_id, "edited_by": user_id})
         
         return jsonify(ok=True, message="Submission updated successfully"), 200
         
@@ -683,10 +1011,17 @@ def delete_conversion_submission(submission_id):
         
         # Delete the submission
         with SessionLocal() as s, s.begin():
-            s.execute(text("""
+            owner = s.execute(text("""
+                SELECT submitted_by FROM equity_conversion_form_submissions
+                WHERE submission_id = :id
+            """), {"id": submission_id}).scalar()
+            result = s.execute(text("""
                 DELETE FROM equity_conversion_form_submissions
                 WHERE submission_id = :id
             """), {"id": submission_id})
+
+            if result.rowcount:
+                _record_delete(s, 'equity_conversion_form_submissions', submission_id, owner)
         
         print(f"✅ Submission {submission_id} deleted successfully")
         return jsonify(ok=True, message="Submission deleted successfully"), 200
@@ -702,6 +1037,131 @@ def delete_conversion_submission(submission_id):
             'message': 'An error occurred while uploading your CSV file. Please check that your file follows the template format and all required fields are filled in correctly. If the problem persists, contact support.'
         }), 500
 
+# ============================================
+# SUBMISSIONS INBOX
+# Dividend and conversion submissions merged newest-first, paginated by
+# keyset (created_at, type rank, id) so a page costs the same however
+# much history has accumulated
+# ============================================
+
+INBOX_SOURCES = {
+    # listing -> (type rank for ties on created_at, title column, amount column)
+    'entry': (2, 'd.partner_name', 'd.amount_paid'),
+    'conversion': (1, 'e.bank_name', 'e.proposed_conversion_amount'),
+}
+INBOX_MAX_LIMIT = 200
+
+def _parse_inbox_cursor(value):
+    """'<created_at iso>|<type rank>|<id>' -> tuple, None when absent, ValueError when malformed"""
+    if not value:
+        return None
+    created_at, rank, row_id = value.split('|')
+    return datetime.fromisoformat(created_at), int(rank), int(row_id)
+
+@bp.get("/submissions/inbox")
+def get_submissions_inbox():
+    """Unified review inbox over dividend + conversion submissions.
+    ?status=SUBMITTED&type=entry|conversion&limit=50&cursor=<next_cursor from the previous page>
+    Per-status counts come with the first page only (no cursor); they don't change while paging"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    try:
+        after = _parse_inbox_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid cursor'), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), INBOX_MAX_LIMIT)
+    except ValueError:
+        return jsonify(ok=False, error='Invalid limit'), 400
+
+    wanted = request.args.get('type')
+    if wanted and wanted not in INBOX_SOURCES:
+        return jsonify(ok=False, error=f'Unknown type: {wanted}'), 400
+    sources = [wanted] if wanted else list(INBOX_SOURCES)
+
+    try:
+        with SessionLocal() as s:
+            items = []
+            counts = {}
+            for listing in sources:
+                spec = LISTINGS[listing]
+                alias = spec['alias']
+                rank, title_column, amount_column = INBOX_SOURCES[listing]
+                conditions, params = _listing_filters(listing, user_id, role, args=request.args)
+
+                # Keyset: strictly after the cursor in (created_at, rank, id) DESC order
+                if after:
+                    after_created, after_rank, after_id = after
+                    params["after_created"] = after_created
+                    if rank > after_rank:
+                        conditions.append(f"{alias}.created_at < :after_created")
+                    elif rank < after_rank:
+                        conditions.append(f"{alias}.created_at <= :after_created")
+                    else:
+                        conditions.append(
+                            f"({alias}.created_at < :after_created OR "
+                            f"({alias}.created_at = :after_created AND {spec['id_column']} < :after_id))"
+                        )
+                        params["after_id"] = after_id
+
+                # Each source only needs limit + 1 rows for the merge below
+                params["fetch"] = limit + 1
+                rows = s.execute(text(f"""
+                    SELECT {spec['id_column']} AS id, {title_column} AS title,
+                           {amount_column} AS amount, {alias}.status, {alias}.confirmed,
+                           {alias}.submitted_by, {alias}.created_at, {alias}.updated_at
+                    FROM {spec['table']} {alias}{_where(conditions)}
+                    ORDER BY {alias}.created_at DESC, {spec['id_column']} DESC
+                    LIMIT :fetch
+                """), params).fetchall()
+                items.extend((row, listing, rank) for row in rows)
+
+                # Per-type counts by status, ignoring the status filter so the UI can show every tab.
+                # A GROUP BY over the whole table, so only the first page pays for it
+                if after:
+                    continue
+                count_conditions, count_params = _listing_filters(listing, user_id, role)
+                count_rows = s.execute(text(f"""
+                    SELECT {alias}.status, COUNT(*) AS total
+                    FROM {spec['table']} {alias}{_where(count_conditions)}
+                    GROUP BY {alias}.status
+                """), count_params).fetchall()
+                counts[listing] = {(row.status or 'UNKNOWN'): row.total for row in count_rows}
+
+        items.sort(key=lambda item: (item[0].created_at, item[2], item[0].id), reverse=True)
+        page = items[:limit]
+
+        next_cursor = None
+        if len(items) > limit:
+            last_row, _, last_rank = page[-1]
+            next_cursor = f"{last_row.created_at.isoformat()}|{last_rank}|{last_row.id}"
+
+        entries = [{
+            'type': listing,
+            'submission_id': row.id,
+            'title': row.title,
+            'amount': float(row.amount) if row.amount is not None else None,
+            'status': row.status,
+            'confirmed': row.confirmed,
+            'submitted_by': row.submitted_by,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None
+        } for row, listing, _ in page]
+
+        result = {'ok': True, 'submissions': entries, 'next_cursor': next_cursor}
+        if not after:
+            result['counts'] = counts
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"❌ Error loading submissions inbox: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to load submissions'), 500
+
 # ============================================
 # INVESTMENT VS LOAN ENDPOINTS
 # ============================================
@@ -710,7 +1170,9 @@ def delete_conversion_submission(submission_id):
 def investment_loan():
     """Handle investment vs loan form submission"""
     b = request.form
-    f = request.files.get("supporting_file")  # Changed from "attachment" to match HTML form
+    f, file_error = request_file("supporting_file")  # Changed from "attachment" to match HTML form
+    if file_error:
+        return file_error
     
     # Get actual form fields that match ivl_form_entries table
     partner_name = (b.get("partner_name") or "").strip()
@@ -835,10 +1297,19 @@ def get_investment_loan_submissions():
 @bp.get("/ivl/entries")
 def get_ivl_entries():
     """Get all investment vs loan entries from ivl_form_entries table"""
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+    include_summary = request.args.get('include_summary') in ('1', 'true')
+
     try:
         with SessionLocal() as s:
-            rows = s.execute(text("""
-                SELECT 
+            cursor = _sync_cursor(s)
+
+            summary_columns = _summary_columns('ivl') if include_summary else ""
+            query = f"""
+                SELECT
                     ivl.investment_id as id,
                     ivl.partner_name,
                     ivl.expected_profit_pct,
@@ -851,10 +1322,14 @@ def get_ivl_entries():
                     ivl.created_at,
                     ivl.updated_at,
                     ivl.created_by,
-                    ivl.updated_by
+                    ivl.updated_by{summary_columns}
                 FROM ivl_form_entries ivl
-                ORDER BY ivl.created_at DESC
-            """)).fetchall()
+            """
+            conditions, params = _listing_filters('ivl', None, None, since, request.args)
+            query += _where(conditions)
+            query += " ORDER BY ivl.created_at DESC"
+
+            rows = s.execute(text(query), params).fetchall()
             
             entries = []
             for row in rows:
@@ -874,9 +1349,15 @@ def get_ivl_entries():
                     'created_by': row.created_by,
                     'updated_by': row.updated_by
                 })
-            
-            return jsonify(ok=True, entries=entries), 200
-            
+
+            response = {'ok': True, 'entries': entries, 'cursor': cursor.isoformat()}
+            if include_summary:
+                response['summary'] = _summary_values('ivl', rows[0] if rows else None, prefix='summary_')
+            if since:
+                response['deleted_ids'] = _deleted_since(s, 'ivl', None, None, since)
+
+            return jsonify(response), 200
+
     except Exception as e:
         print(f"❌ Error loading IVL entries: {e}")
         import traceback
@@ -889,25 +1370,10 @@ def get_ivl_entries():
 
 @bp.get("/ivl/summary")
 def get_ivl_summary():
-    """Get summary statistics from ivl_form_entries table"""
+    """Get summary statistics from ivl_form_entries table (accepts the listing filters, e.g. ?q=)"""
     try:
         with SessionLocal() as s:
-            row = s.execute(text("""
-                SELECT 
-                    COUNT(*) as total_entries,
-                    SUM(investment_amount) as total_investment,
-                    SUM(last_loan) as total_last_loan,
-                    SUM(difference) as total_difference
-                FROM ivl_form_entries
-            """)).fetchone()
-            
-            summary = {
-                'total_entries': row.total_entries or 0,
-                'total_investment': float(row.total_investment) if row.total_investment else 0,
-                'total_last_loan': float(row.total_last_loan) if row.total_last_loan else 0,
-                'total_difference': float(row.total_difference) if row.total_difference else 0
-            }
-            
+            summary = _listing_summary(s, 'ivl', request.args)
             return jsonify(ok=True, summary=summary), 200
             
     except Exception as e:
@@ -963,16 +1429,24 @@ def get_ivl_entry(entry_id):
 def update_ivl_entry(entry_id):
     """Update an IVL entry"""
     try:
-        data = request.json
+        data = request.json or {}
+        # The table calls them investment_amount / last_loan; the IVL schema uses the template names
+        entry, validation_error = validate_fields('ivl_entry', {
+            **data,
+            'investment_l': data.get('investment_amount'),
+            'last_loan_l': data.get('last_loan')
+        })
+        if validation_error:
+            return validation_error
         user_id = session.get('user_id', 1)
         
         with SessionLocal() as s, s.begin():
             # Calculate difference
-            investment_amount = data.get('investment_amount')
-            last_loan = data.get('last_loan')
+            investment_amount = entry['investment_l']
+            last_loan = entry['last_loan_l']
             difference = None
             if investment_amount is not None and last_loan is not None:
-                difference = float(last_loan) - float(investment_amount)
+                difference = last_loan - investment_amount
             
             s.execute(text("""
                 UPDATE ivl_form_entries
@@ -986,12 +1460,12 @@ def update_ivl_entry(entry_id):
                 WHERE investment_id = :id
             """), {
                 "id": entry_id,
-                "partner_name": data.get('partner_name'),
-                "expected_profit_pct": data.get('expected_profit_pct'),
+                "partner_name": entry['partner_name'],
+                "expected_profit_pct": entry['expected_profit_pct'],
                 "investment_amount": investment_amount,
                 "last_loan": last_loan,
                 "difference": difference,
-                "comments": data.get('comments'),
+                "comments": entry['comments'],
                 "updated_by": user_id
             })
         
@@ -1012,9 +1486,11 @@ def delete_ivl_entry(entry_id):
                 DELETE FROM ivl_form_entries
                 WHERE investment_id = :id
             """), {"id": entry_id})
-            
+
             if result.rowcount == 0:
                 return jsonify(ok=False, error='Entry not found'), 404
+
+            _record_delete(s, 'ivl_form_entries', entry_id)
         
         return jsonify(ok=True, message='Entry deleted successfully'), 200
         
@@ -1040,7 +1516,9 @@ def create_ivl_entry():
         comments = request.form.get('comments')
 
         # Handle file upload
-        file = request.files.get('supporting_file')
+        file, file_error = request_file('supporting_file')
+        if file_error:
+            return file_error
         file_path = None
         if file and file.filename:
             file_path = _save(file, f'ivl-{int(time.time())}')
@@ -1115,175 +1593,330 @@ def create_ivl_entry():
 
 
 # ============================================
-# VALIDATION FUNCTIONS FOR ALL-OR-NOTHING CSV UPLOAD
+# CHUNKED MULTI-ROW INSERT (shared by the bulk uploads)
 # ============================================
 
-def validate_matching_equity_record(row, row_num):
-    """
-    Validate a single matching equity CSV record
-    Returns: (is_valid: bool, error_message: str or None, parsed_data: dict or None)
-    """
-    errors = []
-    parsed_data = {}
-    
-    # Check required: Partner Name
-    partner_name = (row.get('partner_name') or "").strip()
-    if not partner_name:
-        errors.append("Partner Name is required")
-    else:
-        parsed_data['partner_name'] = partner_name
-    
-    # Check required: Expected Profit %
-    expected_profit_pct_str = (row.get('expected_profit_pct') or "").strip()
-    if not expected_profit_pct_str:
-        errors.append("Expected Profit % is required")
-    else:
-        try:
-            expected_profit_pct = float(expected_profit_pct_str)
-            if expected_profit_pct < 0 or expected_profit_pct > 100:
-                errors.append(f"Expected Profit % must be between 0 and 100 (got {expected_profit_pct})")
-            else:
-                parsed_data['expected_profit_pct'] = expected_profit_pct
-        except ValueError:
-            errors.append(f"Expected Profit % must be a valid number (got '{expected_profit_pct_str}')")
-    
-    # Optional: Year
-    year_str = (row.get('year') or "").strip()
-    if year_str:
-        try:
-            year = int(year_str)
-            if year < 1900 or year > 2100:
-                errors.append(f"Year must be between 1900 and 2100 (got {year})")
-            else:
-                parsed_data['year'] = year
-        except ValueError:
-            errors.append(f"Year must be a valid integer (got '{year_str}')")
-    else:
-        parsed_data['year'] = None
-    
-    # Optional: Reported Shares
-    reported_shares_str = (row.get('reported_shares') or "").strip()
-    if reported_shares_str:
-        try:
-            reported_shares = float(reported_shares_str)
-            if reported_shares < 0:
-                errors.append(f"Reported Shares cannot be negative (got {reported_shares})")
-            else:
-                parsed_data['reported_shares'] = reported_shares
-        except ValueError:
-            errors.append(f"Reported Shares must be a valid number (got '{reported_shares_str}')")
-    else:
-        parsed_data['reported_shares'] = None
-    
-    # Optional: Share Capital Multiplied
-    share_capital_str = (row.get('share_capital_multiplied') or "").strip()
-    if share_capital_str:
-        try:
-            share_capital = float(share_capital_str)
-            if share_capital < 0:
-                errors.append(f"Share Capital cannot be negative (got {share_capital})")
-            else:
-                parsed_data['share_capital_multiplied'] = share_capital
-        except ValueError:
-            errors.append(f"Share Capital must be a valid number (got '{share_capital_str}')")
-    else:
-        parsed_data['share_capital_multiplied'] = None
-    
-    # Optional: Investment (L)
-    investment_l_str = (row.get('investment_l') or "").strip()
-    if investment_l_str:
-        try:
-            investment_l = float(investment_l_str)
-            if investment_l < 0:
-                errors.append(f"Investment (L) cannot be negative (got {investment_l})")
-            else:
-                parsed_data['investment_l'] = investment_l
-        except ValueError:
-            errors.append(f"Investment (L) must be a valid number (got '{investment_l_str}')")
-    else:
-        parsed_data['investment_l'] = None
-    
-    # Optional: Investment (USD)
-    investment_usd_str = (row.get('investment_usd') or "").strip()
-    if investment_usd_str:
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 500))
+
+def _bulk_insert(s, table, columns, rows, chunk_size=None, on_chunk=None, update_columns=None):
+    """Insert rows (dicts keyed by column) as multi-row INSERTs of chunk_size rows each.
+    Runs in the caller's transaction, so a failing chunk rolls back every chunk before it.
+    on_chunk(rows_inserted_so_far) runs after each chunk; raising from it aborts the insert.
+    update_columns: on a duplicate unique key, overwrite these columns of the existing row instead"""
+    chunk_size = chunk_size or BULK_INSERT_CHUNK_SIZE
+    column_sql = ", ".join(columns)
+    upsert_sql = ""
+    if update_columns:
+        upsert_sql = " AS new ON DUPLICATE KEY UPDATE " + ", ".join(f"{col} = new.{col}" for col in update_columns)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        values_sql = []
+        params = {}
+        for i, row in enumerate(chunk):
+            values_sql.append("(" + ", ".join(f":{col}_{i}" for col in columns) + ")")
+            for col in columns:
+                params[f"{col}_{i}"] = row[col]
+        s.execute(text(f"INSERT INTO {table} ({column_sql}) VALUES {', '.join(values_sql)}{upsert_sql}"), params)
+        if on_chunk:
+            on_chunk(start + len(chunk))
+
+def _timed_bulk_import(kind, rows, mode='insert'):
+    """Write all rows for a bulk upload in one transaction (see _bulk_import) and log a single
+    summary line. Returns (counts, elapsed seconds, rows per second)"""
+    started = time.perf_counter()
+    with SessionLocal() as s, s.begin():
+        counts = _bulk_import(s, kind, rows, mode)
+    elapsed = time.perf_counter() - started
+    rows_per_second = len(rows) / elapsed if elapsed > 0 else float(len(rows))
+    print(f"  💾 {mode.capitalize()}ed {len(rows)} rows into {BULK_IMPORTS[kind]['table']} in {elapsed:.2f}s "
+          f"({rows_per_second:.0f} rows/s, chunks of {BULK_INSERT_CHUNK_SIZE}): "
+          f"{counts['inserted']} new, {counts['updated']} updated, {counts['unchanged']} unchanged")
+    return counts, elapsed, rows_per_second
+
+
+# ============================================
+# STREAMING CSV / XLSX INPUT (shared by the bulk uploads)
+# ============================================
+
+CSV_SNIFF_BYTES = 64 * 1024
+# .xlsx files are zip archives
+XLSX_MAGIC = b'PK\x03\x04'
+BULK_UPLOAD_EXTENSIONS = ('.csv', '.xlsx')
+# How far down a sheet to look for the header row (title rows may sit above it)
+XLSX_HEADER_SEARCH_ROWS = 20
+# Validation stops after this many bad rows (0 = report every error)
+BULK_MAX_VALIDATION_ERRORS = int(os.getenv("BULK_MAX_VALIDATION_ERRORS", 100))
+BULK_PROGRESS_EVERY = 1000
+# Background import jobs longer than this many rows validate the rest across
+# BULK_VALIDATION_WORKERS processes, 0 = one per CPU (web requests always validate in-process)
+BULK_PARALLEL_MIN_ROWS = int(os.getenv("BULK_PARALLEL_MIN_ROWS", 50000))
+BULK_VALIDATION_WORKERS = int(os.getenv("BULK_VALIDATION_WORKERS", 0))
+
+class _UploadText(io.TextIOWrapper):
+    """TextIOWrapper that leaves the upload's byte stream open when it is closed or collected"""
+    def close(self):
         try:
-            investment_usd = float(investment_usd_str)
-            if investment_usd < 0:
-                errors.append(f"Investment (USD) cannot be negative (got {investment_usd})")
-            else:
-                parsed_data['investment_usd'] = investment_usd
+            self.detach()
         except ValueError:
-            errors.append(f"Investment (USD) must be a valid number (got '{investment_usd_str}')")
+            pass
+
+def _csv_text(source):
+    """Text stream for csv.DictReader from a str, a text stream or a binary upload stream.
+    Binary streams are decoded incrementally; the encoding comes from the BOM, else UTF-8
+    if the first 64 KB decode cleanly, else cp1252 (what Excel writes on Windows)"""
+    if isinstance(source, str):
+        return StringIO(source)
+    if isinstance(source, io.TextIOBase):
+        return source
+
+    head = source.read(CSV_SNIFF_BYTES)
+    source.seek(0)
+    if head.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
     else:
-        parsed_data['investment_usd'] = None
-    
-    # Optional: Exchange Rate
-    exchange_rate_str = (row.get('exchange_rate') or "").strip()
-    if exchange_rate_str:
         try:
-            exchange_rate = float(exchange_rate_str)
-            if exchange_rate <= 0:
-                errors.append(f"Exchange Rate must be positive (got {exchange_rate})")
-            else:
-                parsed_data['exchange_rate'] = exchange_rate
-        except ValueError:
-            errors.append(f"Exchange Rate must be a valid number (got '{exchange_rate_str}')")
-    else:
-        parsed_data['exchange_rate'] = None
-    
-    # Optional text fields
-    parsed_data['bank_id'] = (row.get('bank_id') or "").strip() or None
-    parsed_data['technician'] = (row.get('technician') or "").strip() or None
-    parsed_data['proposal_state'] = (row.get('proposal_state') or "").strip() or None
-    parsed_data['transaction_type'] = (row.get('transaction_type') or "").strip() or None
-    parsed_data['business_category'] = (row.get('business_category') or "").strip() or None
-    parsed_data['company_type'] = (row.get('company_type') or "").strip() or None
-    parsed_data['community'] = (row.get('community') or "").strip() or None
-    parsed_data['municipality'] = (row.get('municipality') or "").strip() or None
-    parsed_data['state'] = (row.get('state') or "").strip() or None
-    parsed_data['comments'] = (row.get('comments') or "").strip() or None
-    parsed_data['start_date'] = (row.get('start_date') or "").strip() or None
-    
-    # Monthly distributions (default to 0)
-    monthly_fields = ['january_l', 'february_l', 'march_l', 'april_l', 'may_l', 'june_l',
-                      'july_l', 'august_l', 'september_l', 'october_l', 'november_l', 'december_l']
-    
-    for month_field in monthly_fields:
-        month_str = (row.get(month_field) or "").strip()
-        if month_str:
-            try:
-                month_val = float(month_str)
-                if month_val < 0:
-                    errors.append(f"{month_field} cannot be negative (got {month_val})")
-                else:
-                    parsed_data[month_field] = month_val
-            except ValueError:
-                errors.append(f"{month_field} must be a valid number (got '{month_str}')")
+            # final=False: the sample may end in the middle of a multi-byte character
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = 'cp1252'
+    return _UploadText(source, encoding=encoding, newline='')
+
+class UploadFormatError(ValueError):
+    """The upload can't be read as a CSV or XLSX table; the message is shown to the user"""
+
+def _header_field(header):
+    """Template field a column header stands for (case-insensitive, display names allowed), or None"""
+    lower_header = (header or '').lower().strip()
+    if 'partner name' in lower_header or lower_header == 'partner_name':
+        return 'partner_name'
+    elif 'expected profit' in lower_header or lower_header == 'expected_profit_pct':
+        return 'expected_profit_pct'
+    elif 'investment amount' in lower_header or lower_header == 'investment_l':
+        return 'investment_l'
+    elif 'last loan' in lower_header or lower_header == 'last_loan_l':
+        return 'last_loan_l'
+    elif lower_header == 'comments':
+        return 'comments'
+    return None
+
+def _xlsx_text(cell):
+    """A cell as the text Excel's CSV export would give the validators"""
+    value = cell.value
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        # A cell showing 12.5% holds 0.125
+        if '%' in (cell.number_format or ''):
+            value = round(value * 100, 10)
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+    if isinstance(value, datetime):
+        if (value.hour, value.minute, value.second, value.microsecond) == (0, 0, 0, 0):
+            return value.date().isoformat()
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+def _xlsx_rows(sheet):
+    """Sheet rows as lists of strings, trailing empty cells dropped"""
+    for cells in sheet.iter_rows():
+        row = [_xlsx_text(cell) for cell in cells]
+        while row and not row[-1]:
+            row.pop()
+        yield row
+
+def _xlsx_table(source, sheet_name=None, display_names=True):
+    """(rows, header, header_row) for an .xlsx upload, read in streaming (read-only) mode.
+    The sheet is ?sheet= (name or 1-based number), else the first sheet with a header row.
+    The header row is the first of the top XLSX_HEADER_SEARCH_ROWS rows with a Partner Name column.
+    display_names=False: only a literal partner_name header counts, for templates whose parser
+    matches the field names exactly (matching, profit)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise UploadFormatError('Excel uploads are not available on this server. Please upload a CSV file.')
+
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except Exception:
+        raise UploadFormatError('The Excel file could not be opened. Save it as .xlsx and try again.')
+
+    if sheet_name:
+        if sheet_name in workbook.sheetnames:
+            sheets = [workbook[sheet_name]]
+        elif sheet_name.isdigit() and 1 <= int(sheet_name) <= len(workbook.sheetnames):
+            sheets = [workbook.worksheets[int(sheet_name) - 1]]
         else:
-            parsed_data[month_field] = 0
-    
-    # Return validation result
-    if errors:
-        return False, '; '.join(errors), None
-    return True, None, parsed_data
+            workbook.close()
+            raise UploadFormatError(f"Sheet '{sheet_name}' not found. Sheets in this file: {', '.join(workbook.sheetnames)}")
+    else:
+        sheets = workbook.worksheets
+
+    for sheet in sheets:
+        rows = _xlsx_rows(sheet)
+        for header_row, row in enumerate(rows, start=1):
+            if header_row > XLSX_HEADER_SEARCH_ROWS:
+                break
+            if any((_header_field(cell) if display_names else cell) == 'partner_name' for cell in row):
+                return _closing(workbook, _padded(rows, len(row))), row, header_row
+
+    workbook.close()
+    column = 'Partner Name' if display_names else 'partner_name'
+    raise UploadFormatError(f'No header row with a {column} column was found in the Excel file.')
+
+def _padded(rows, width):
+    # Short rows read as blank cells, as in a CSV export; longer rows keep their extra cells.
+    # Empty rows are padded too, so they still count towards the sheet's row numbers
+    for row in rows:
+        yield row + [''] * (width - len(row)) if len(row) < width else row
+
+def _closing(workbook, rows):
+    try:
+        yield from rows
+    finally:
+        workbook.close()
+
+def _upload_table(source, sheet=None, display_names=True):
+    """(rows, header, header_row) for a bulk upload: a CSV (any source _csv_text takes) or an
+    .xlsx byte stream, told apart by the file's first bytes. rows is positioned after the header.
+    display_names: whether the parser maps display-name headers (see _xlsx_table)"""
+    if not isinstance(source, (str, io.TextIOBase)):
+        head = source.read(len(XLSX_MAGIC))
+        source.seek(0)
+        if head == XLSX_MAGIC:
+            return _xlsx_table(source, sheet, display_names)
+    csv_reader = csv.reader(_csv_text(source))
+    return csv_reader, next(csv_reader, []), 1
+
+def _error_cap_reached(validation_errors):
+    """True (and a closing note appended) once validation_errors hits BULK_MAX_VALIDATION_ERRORS"""
+    if not BULK_MAX_VALIDATION_ERRORS or len(validation_errors) < BULK_MAX_VALIDATION_ERRORS:
+        return False
+    validation_errors.append({
+        'row': 'File',
+        'error': f'Stopped checking after {BULK_MAX_VALIDATION_ERRORS} errors. Fix these rows and upload again.'
+    })
+    return True
+
+# Validation process pool, only used inside an import job worker (see enable_validation_pool).
+# Created on first use and kept for the rest of the job instead of once per upload
+_validation_pool = None
+_validation_pool_enabled = False
+_validation_workers = 1
+
+def enable_validation_pool():
+    """Let large uploads validated in this process use the shared pool. Called by import job
+    workers only: a web worker must not start child processes per request"""
+    global _validation_pool_enabled, _validation_workers
+    _validation_pool_enabled = True
+    _validation_workers = BULK_VALIDATION_WORKERS or os.cpu_count() or 1
+
+def shutdown_validation_pool():
+    global _validation_pool, _validation_pool_enabled
+    _validation_pool_enabled = False
+    if _validation_pool is not None:
+        _validation_pool.shutdown(wait=False, cancel_futures=True)
+        _validation_pool = None
+
+def _shared_validation_pool():
+    global _validation_pool
+    if _validation_pool is None:
+        print(f"  ⚙️ Starting {_validation_workers} validation worker processes")
+        _validation_pool = ProcessPoolExecutor(_validation_workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+    return _validation_pool
+
+def _validate_in_batches(fields, header, csv_reader, valid_records, validation_errors, progress=None,
+                         field_names=None, header_row=1):
+    """Validation (validators.py) of the rows left in csv_reader, BULK_PROGRESS_EVERY
+    rows at a time. Fills valid_records / validation_errors in row order and stops at the
+    error cap or when progress returns False.
+    In an import job worker, past BULK_PARALLEL_MIN_ROWS rows the remaining batches are validated
+    in the shared process pool; results are still collected in submission order, so errors stay
+    in row order.
+    field_names: schema field for each CSV column, when the headers aren't the field names
+    header_row: row number of the header, so errors point at the right spreadsheet row"""
+    names = field_names or header
+
+    def collect(records, errors, last_row_num):
+        """Merge one validated batch. Returns True when validation should stop"""
+        capped_at = None
+        for row_num, partner_name, error in errors:
+            validation_errors.append({'row': row_num, 'partner_name': partner_name, 'error': error})
+            if _error_cap_reached(validation_errors):
+                capped_at = row_num
+                break
+        valid_records.extend(record for row_num, record in records if capped_at is None or row_num < capped_at)
+
+        if capped_at is not None:
+            return True
+        return bool(progress and progress(last_row_num - header_row) is False)
+
+    def collect_packed(last_row_num, future):
+        record_names, packed, errors = future.result()
+        records = [(row_num, dict(zip(record_names, values))) for row_num, values in packed]
+        return collect(records, errors, last_row_num)
+
+    pool = None
+    pending = deque()
+    rows_read = 0
+    try:
+        for batch in iter_row_batches(csv_reader, header, BULK_PROGRESS_EVERY, header_row):
+            rows_read += len(batch)
+            if (pool is None and _validation_pool_enabled and _validation_workers > 1
+                    and rows_read > BULK_PARALLEL_MIN_ROWS):
+                print(f"  ⚙️ Large upload: validating the rest in {_validation_workers} worker processes")
+                pool = _shared_validation_pool()
+
+            if pool is None:
+                if collect(*validate_batch(fields, names, batch), batch[-1][0]):
+                    return
+                continue
+
+            pending.append((batch[-1][0], pool.submit(validate_batch_packed, fields, names, batch)))
+            # Bound the batches held in memory; the oldest is usually done by now
+            if len(pending) >= 2 * _validation_workers and collect_packed(*pending.popleft()):
+                return
+
+        while pending:
+            if collect_packed(*pending.popleft()):
+                return
+    finally:
+        # The pool outlives this upload; just drop the batches nobody will collect
+        for _, future in pending:
+            future.cancel()
 
 
-def parse_and_validate_matching_equity_csv(content):
+# ============================================
+# VALIDATION FUNCTIONS FOR ALL-OR-NOTHING CSV UPLOAD
+# Field rules for every table live in validators.py
+# ============================================
+
+def parse_and_validate_matching_equity_csv(source, progress=None, sheet=None):
     """
     Parse CSV and validate ALL records before inserting ANY
+    source: upload byte stream (CSV decoded incrementally, or .xlsx read as a stream), text stream or str
+    progress: optional callback(rows_checked), called every BULK_PROGRESS_EVERY rows; return False to stop
+    sheet: .xlsx sheet name or 1-based number (default: first sheet with a header row)
     Returns: (valid_records: list, validation_errors: list)
     """
     valid_records = []
     validation_errors = []
     
     try:
-        csv_reader = csv.DictReader(StringIO(content))
+        csv_reader, csv_headers, header_row = _upload_table(source, sheet, display_names=False)
         
         # Check for required headers
         required_headers = {'partner_name', 'expected_profit_pct'}
-        csv_headers = set(csv_reader.fieldnames or [])
         
-        missing_headers = required_headers - csv_headers
+        missing_headers = required_headers - set(csv_headers)
         if missing_headers:
             validation_errors.append({
                 'row': 'Header',
@@ -1292,24 +1925,9 @@ def parse_and_validate_matching_equity_csv(content):
             })
             return [], validation_errors
         
-        # Validate each row
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
-            # Skip completely empty rows
-            if all(not str(v).strip() for v in row.values()):
-                continue
-            
-            # Validate the record
-            is_valid, error_msg, parsed_data = validate_matching_equity_record(row, row_num)
-            
-            if not is_valid:
-                validation_errors.append({
-                    'row': row_num,
-                    'partner_name': (row.get('partner_name') or '').strip() or 'Unknown',
-                    'error': error_msg
-                })
-            else:
-                # Store validated and parsed record
-                valid_records.append(parsed_data)
+        # Validate each row, a batch at a time
+        _validate_in_batches(MATCHING_FIELDS, csv_headers, csv_reader, valid_records, validation_errors, progress,
+                             header_row=header_row)
         
         # If no valid records found
         if not valid_records and not validation_errors:
@@ -1318,6 +1936,16 @@ def parse_and_validate_matching_equity_csv(content):
                 'error': 'No valid data rows found in CSV file'
             })
     
+    except UploadFormatError as e:
+        validation_errors.append({
+            'row': 'File',
+            'error': str(e)
+        })
+    except UnicodeDecodeError:
+        validation_errors.append({
+            'row': 'File',
+            'error': 'The file contains characters that could not be read. Save it as "CSV UTF-8" and try again.'
+        })
     except csv.Error as e:
         validation_errors.append({
             'row': 'File',
@@ -1332,6 +1960,24 @@ def parse_and_validate_matching_equity_csv(content):
     return valid_records, validation_errors
 
 
+# Bulk-upload record keys that map 1:1 onto table columns
+MATCHING_INSERT_COLUMNS = [
+    'bank_id', 'partner_name', 'year', 'technician',
+    'reported_shares', 'share_capital_multiplied', 'expected_profit_pct',
+    'investment_l', 'investment_usd', 'exchange_rate',
+    'proposal_state', 'transaction_type',
+    'january_l', 'february_l', 'march_l', 'april_l', 'may_l', 'june_l',
+    'july_l', 'august_l', 'september_l', 'october_l', 'november_l', 'december_l',
+    'business_category', 'company_type', 'community', 'municipality', 'state',
+    'comments', 'start_date'
+]
+
+def _matching_insert_rows(valid_records, user_id):
+    return [
+        {**{col: record[col] for col in MATCHING_INSERT_COLUMNS}, 'created_by': user_id, 'updated_by': user_id}
+        for record in valid_records
+    ]
+
 @bp.post("/matching/bulk-upload")
 def matching_bulk_upload():
     """
@@ -1339,28 +1985,39 @@ def matching_bulk_upload():
     ALL-OR-NOTHING: Validates all records before inserting any
     """
     try:
-        if 'csv_file' not in request.files and 'file' not in request.files:
+        file, file_error = request_file('csv_file', 'file')
+        if file_error:
+            return file_error
+        if file is None:
             return jsonify(ok=False, error='No file provided'), 400
         
-        file = request.files.get("csv_file") or request.files.get("file")
-        file = request.files.get('csv_file') or request.files.get('file')
         if file.filename == '':
             return jsonify(ok=False, error='No file selected'), 400
         
-        if not file.filename.endswith('.csv'):
-            return jsonify(ok=False, error='File must be a CSV'), 400
+        if not file.filename.lower().endswith(BULK_UPLOAD_EXTENSIONS):
+            return jsonify(ok=False, error='File must be a CSV or Excel (.xlsx) file'), 400
         
         # Get user_id from session
         user_id = session.get('user_id', 1)
         username = session.get('username', 'System')
         print(f"📤 ALL-OR-NOTHING Matching Equity bulk upload initiated by: {username} (ID: {user_id})")
         
-        # Read and decode CSV content
-        content = file.stream.read().decode("UTF-8")
+        # ?mode=upsert: update rows already imported under the same natural key instead of duplicating them
+        mode = request.args.get('mode', 'insert')
+        if mode not in IMPORT_MODES:
+            return jsonify(ok=False, error=f"mode must be one of: {', '.join(IMPORT_MODES)}"), 400
+        
+        # ?sheet=: which sheet of an .xlsx workbook to read (name or 1-based number)
+        sheet = request.args.get('sheet') or None
+        
+        # ?async=1: hand the file to a background import job and return its ID right away
+        if request.args.get('async') in ('1', 'true'):
+            from import_jobs import start_import_job
+            return start_import_job('matching', file, user_id, mode, sheet)
         
         # STEP 1: Validate ALL records BEFORE inserting ANY
         print("🔍 STEP 1: Validating all records...")
-        valid_records, validation_errors = parse_and_validate_matching_equity_csv(content)
+        valid_records, validation_errors = parse_and_validate_matching_equity_csv(file.stream, sheet=sheet)
         
         # If there are ANY validation errors, reject the ENTIRE upload
         if validation_errors:
@@ -1389,72 +2046,24 @@ def matching_bulk_upload():
         # STEP 2: Insert ALL records in a single transaction
         print("💾 STEP 2: Inserting all records...")
         
-        with SessionLocal() as s, s.begin():
-            for idx, record in enumerate(valid_records, start=1):
-                s.execute(text("""
-                    INSERT INTO matching_equity_entries (
-                        bank_id, partner_name, year, technician,
-                        reported_shares, share_capital_multiplied, expected_profit_pct,
-                        investment_l, investment_usd, exchange_rate,
-                        proposal_state, transaction_type,
-                        january_l, february_l, march_l, april_l, may_l, june_l,
-                        july_l, august_l, september_l, october_l, november_l, december_l,
-                        business_category, company_type, community, municipality, state,
-                        comments, start_date, created_by, updated_by
-                    ) VALUES (
-                        :bank_id, :partner_name, :year, :technician,
-                        :reported_shares, :share_capital, :expected_profit_pct,
-                        :investment_l, :investment_usd, :exchange_rate,
-                        :proposal_state, :transaction_type,
-                        :january_l, :february_l, :march_l, :april_l, :may_l, :june_l,
-                        :july_l, :august_l, :september_l, :october_l, :november_l, :december_l,
-                        :business_category, :company_type, :community, :municipality, :state,
-                        :comments, :start_date, :created_by, :updated_by
-                    )
-                """), {
-                    "bank_id": record['bank_id'],
-                    "partner_name": record['partner_name'],
-                    "year": record['year'],
-                    "technician": record['technician'],
-                    "reported_shares": record['reported_shares'],
-                    "share_capital": record['share_capital_multiplied'],
-                    "expected_profit_pct": record['expected_profit_pct'],
-                    "investment_l": record['investment_l'],
-                    "investment_usd": record['investment_usd'],
-                    "exchange_rate": record['exchange_rate'],
-                    "proposal_state": record['proposal_state'],
-                    "transaction_type": record['transaction_type'],
-                    "january_l": record['january_l'],
-                    "february_l": record['february_l'],
-                    "march_l": record['march_l'],
-                    "april_l": record['april_l'],
-                    "may_l": record['may_l'],
-                    "june_l": record['june_l'],
-                    "july_l": record['july_l'],
-                    "august_l": record['august_l'],
-                    "september_l": record['september_l'],
-                    "october_l": record['october_l'],
-                    "november_l": record['november_l'],
-                    "december_l": record['december_l'],
-                    "business_category": record['business_category'],
-                    "company_type": record['company_type'],
-                    "community": record['community'],
-                    "municipality": record['municipality'],
-                    "state": record['state'],
-                    "comments": record['comments'],
-                    "start_date": record['start_date'],
-                    "created_by": user_id,
-                    "updated_by": user_id
-                })
-                print(f"  ✅ Inserted {idx}/{len(valid_records)}: {record['partner_name']}")
+        counts, elapsed, rows_per_second = _timed_bulk_import(
+            'matching', _matching_insert_rows(valid_records, user_id), mode
+        )
         
         print(f"🎉 SUCCESS: All {len(valid_records)} records uploaded by {username}")
         
         return jsonify({
             'ok': True,
-            'message': f'Successfully uploaded all {len(valid_records)} records',
+            'message': _import_message(mode, len(valid_records), counts),
+            'mode': mode,
             'uploaded_count': len(valid_records),
-            'uploaded_by': username
+            'inserted_count': counts['inserted'],
+            'updated_count': counts['updated'],
+            'unchanged_count': counts['unchanged'],
+            'duplicate_count': counts['duplicates'],
+            'uploaded_by': username,
+            'insert_seconds': round(elapsed, 3),
+            'rows_per_second': round(rows_per_second, 1)
         }), 201
         
     except Exception as e:
@@ -1472,142 +2081,24 @@ def matching_bulk_upload():
 # PROFIT TRACKING BULK UPLOAD
 # ============================================
 
-def safe_float(value, default=None):
-    """Safely convert a value to float, return default if empty/invalid"""
-    if value is None:
-        return default
-    val_str = str(value).strip()
-    if not val_str:
-        return default
-    try:
-        return float(val_str)
-    except (ValueError, TypeError):
-        return default
-
-def safe_int(value, default=None):
-    """Safely convert a value to int, return default if empty/invalid"""
-    if value is None:
-        return default
-    val_str = str(value).strip()
-    if not val_str:
-        return default
-    try:
-        return int(val_str)
-    except (ValueError, TypeError):
-        return default
-
-def safe_date(value):
-    """Safely convert a value to date string, return None if empty"""
-    if value is None:
-        return None
-    val_str = str(value).strip()
-    return val_str if val_str else None
-
-def validate_profit_record(row, row_num):
-    """
-    Validate a single profit CSV record
-    Returns: (is_valid: bool, error_message: str or None, parsed_data: dict or None)
-    """
-    errors = []
-    parsed_data = {}
-    
-    # Check required: Partner Name
-    partner_name = (row.get('partner_name') or "").strip()
-    if not partner_name:
-        errors.append("Partner Name is required")
-    else:
-        parsed_data['partner_name'] = partner_name
-    
-    # Check required: Year
-    year_str = (row.get('year') or "").strip()
-    if not year_str:
-        errors.append("Year is required")
-    else:
-        try:
-            year = int(year_str)
-            if year < 1900 or year > 2100:
-                errors.append(f"Year must be between 1900 and 2100 (got {year})")
-            else:
-                parsed_data['year'] = year
-        except ValueError:
-            errors.append(f"Year must be a valid integer (got '{year_str}')")
-    
-    # Optional numeric fields with validation
-    profit_l = safe_float(row.get('profit_l'))
-    if profit_l is not None and profit_l < 0:
-        errors.append(f"Profit (L) cannot be negative (got {profit_l})")
-    parsed_data['profit_l'] = profit_l
-    
-    company_value_l = safe_float(row.get('company_value_l'))
-    if company_value_l is not None and company_value_l < 0:
-        errors.append(f"Company Value (L) cannot be negative (got {company_value_l})")
-    parsed_data['company_value_l'] = company_value_l
-    
-    expected_profit_pct = safe_float(row.get('expected_profit_pct'))
-    if expected_profit_pct is not None and (expected_profit_pct < 0 or expected_profit_pct > 100):
-        errors.append(f"Expected Profit % must be between 0 and 100 (got {expected_profit_pct})")
-    parsed_data['expected_profit_pct'] = expected_profit_pct
-    
-    investment_l = safe_float(row.get('investment_l'))
-    if investment_l is not None and investment_l < 0:
-        errors.append(f"Investment (L) cannot be negative (got {investment_l})")
-    parsed_data['investment_l'] = investment_l
-    
-    investment_usd = safe_float(row.get('investment_usd'))
-    if investment_usd is not None and investment_usd < 0:
-        errors.append(f"Investment (USD) cannot be negative (got {investment_usd})")
-    parsed_data['investment_usd'] = investment_usd
-    
-    exchange_rate = safe_float(row.get('exchange_rate'))
-    if exchange_rate is not None and exchange_rate <= 0:
-        errors.append(f"Exchange Rate must be positive (got {exchange_rate})")
-    parsed_data['exchange_rate'] = exchange_rate
-    
-    # Optional text fields
-    parsed_data['bank_id'] = (row.get('bank_id') or "").strip() or None
-    parsed_data['technician'] = (row.get('technician') or "").strip() or None
-    parsed_data['proposal_state'] = (row.get('proposal_state') or "").strip() or None
-    parsed_data['transaction_type'] = (row.get('transaction_type') or "").strip() or None
-    parsed_data['business_category'] = (row.get('business_category') or "").strip() or None
-    parsed_data['company_type'] = (row.get('company_type') or "").strip() or None
-    parsed_data['community'] = (row.get('community') or "").strip() or None
-    parsed_data['municipality'] = (row.get('municipality') or "").strip() or None
-    parsed_data['state'] = (row.get('state') or "").strip() or None
-    parsed_data['comments'] = (row.get('comments') or "").strip() or None
-    parsed_data['start_date'] = safe_date(row.get('start_date'))
-    
-    # Monthly distributions (default to 0)
-    monthly_fields = ['january_l', 'february_l', 'march_l', 'april_l', 'may_l', 'june_l',
-                      'july_l', 'august_l', 'september_l', 'october_l', 'november_l', 'december_l']
-    
-    for month_field in monthly_fields:
-        month_val = safe_float(row.get(month_field), 0)
-        if month_val < 0:
-            errors.append(f"{month_field} cannot be negative (got {month_val})")
-        parsed_data[month_field] = month_val
-    
-    # Return validation result
-    if errors:
-        return False, '; '.join(errors), None
-    return True, None, parsed_data
-
-
-def parse_and_validate_profit_csv(content):
+def parse_and_validate_profit_csv(source, progress=None, sheet=None):
     """
     Parse CSV and validate ALL records before inserting ANY
+    source: upload byte stream (CSV decoded incrementally, or .xlsx read as a stream), text stream or str
+    progress: optional callback(rows_checked), called every BULK_PROGRESS_EVERY rows; return False to stop
+    sheet: .xlsx sheet name or 1-based number (default: first sheet with a header row)
     Returns: (valid_records: list, validation_errors: list)
     """
     valid_records = []
     validation_errors = []
     
     try:
-        csv_reader = csv.DictReader(StringIO(content))
+        csv_reader, csv_headers, header_row = _upload_table(source, sheet, display_names=False)
         
         # Check for required headers
         required_headers = {'partner_name', 'year'}
-        csv_headers = set(csv_reader.fieldnames or [])
         
-        missing_headers = required_headers - csv_headers
+        missing_headers = required_headers - set(csv_headers)
         if missing_headers:
             validation_errors.append({
                 'row': 'Header',
@@ -1616,56 +2107,9 @@ def parse_and_validate_profit_csv(content):
             })
             return [], validation_errors
         
-        # Validate each row
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
-            # Skip completely empty rows
-            if all(not str(v).strip() for v in row.values()):
-                continue
-            
-            # Validate the record
-            is_valid, error_msg, parsed_data = validate_profit_record(row, row_num)
-            
-            if not is_valid:
-                validation_errors.append({
-                    'row': row_num,
-                    'partner_name': (row.get('partner_name') or '').strip() or 'Unknown',
-                    'error': error_msg
-                })
-            else:
-                # Store validated and parsed record
-                valid_records.append({
-                    'bank_id': parsed_data['bank_id'],
-                    'partner_name': parsed_data['partner_name'],
-                    'year': parsed_data['year'],
-                    'technician': parsed_data['technician'],
-                    'profit_l': parsed_data['profit_l'],
-                    'company_value_l': parsed_data['company_value_l'],
-                    'expected_profit_pct': parsed_data['expected_profit_pct'],
-                    'investment_l': parsed_data['investment_l'],
-                    'investment_usd': parsed_data['investment_usd'],
-                    'exchange_rate': parsed_data['exchange_rate'],
-                    'proposal_state': parsed_data['proposal_state'],
-                    'transaction_type': (row.get('transaction_type') or "").strip() or None,
-                    'january_l': safe_float(row.get('january_l'), 0),
-                    'february_l': safe_float(row.get('february_l'), 0),
-                    'march_l': safe_float(row.get('march_l'), 0),
-                    'april_l': safe_float(row.get('april_l'), 0),
-                    'may_l': safe_float(row.get('may_l'), 0),
-                    'june_l': safe_float(row.get('june_l'), 0),
-                    'july_l': safe_float(row.get('july_l'), 0),
-                    'august_l': safe_float(row.get('august_l'), 0),
-                    'september_l': safe_float(row.get('september_l'), 0),
-                    'october_l': safe_float(row.get('october_l'), 0),
-                    'november_l': safe_float(row.get('november_l'), 0),
-                    'december_l': safe_float(row.get('december_l'), 0),
-                    'business_category': (row.get('business_category') or "").strip() or None,
-                    'company_type': (row.get('company_type') or "").strip() or None,
-                    'community': (row.get('community') or "").strip() or None,
-                    'municipality': (row.get('municipality') or "").strip() or None,
-                    'state': (row.get('state') or "").strip() or None,
-                    'comments': (row.get('comments') or "").strip() or None,
-                    'start_date': safe_date(row.get('start_date'))
-                })
+        # Validate each row, a batch at a time
+        _validate_in_batches(PROFIT_FIELDS, csv_headers, csv_reader, valid_records, validation_errors, progress,
+                             header_row=header_row)
         
         # If no valid records found
         if not valid_records and not validation_errors:
@@ -1674,6 +2118,16 @@ def parse_and_validate_profit_csv(content):
                 'error': 'No valid data rows found in CSV file'
             })
     
+    except UploadFormatError as e:
+        validation_errors.append({
+            'row': 'File',
+            'error': str(e)
+        })
+    except UnicodeDecodeError:
+        validation_errors.append({
+            'row': 'File',
+            'error': 'The file contains characters that could not be read. Save it as "CSV UTF-8" and try again.'
+        })
     except csv.Error as e:
         validation_errors.append({
             'row': 'File',
@@ -1688,6 +2142,24 @@ def parse_and_validate_profit_csv(content):
     return valid_records, validation_errors
 
 
+# Bulk-upload record keys that map 1:1 onto table columns
+PROFIT_INSERT_COLUMNS = [
+    'bank_id', 'partner_name', 'year', 'technician',
+    'profit_l', 'company_value_l', 'expected_profit_pct',
+    'investment_l', 'investment_usd', 'exchange_rate',
+    'proposal_state', 'transaction_type',
+    'january_l', 'february_l', 'march_l', 'april_l', 'may_l', 'june_l',
+    'july_l', 'august_l', 'september_l', 'october_l', 'november_l', 'december_l',
+    'business_category', 'company_type', 'community', 'municipality', 'state',
+    'comments', 'start_date'
+]
+
+def _profit_insert_rows(valid_records, user_id):
+    return [
+        {**{col: record[col] for col in PROFIT_INSERT_COLUMNS}, 'created_by': user_id, 'updated_by': user_id}
+        for record in valid_records
+    ]
+
 @bp.post("/profit/bulk-upload")
 def profit_bulk_upload():
     """
@@ -1695,28 +2167,39 @@ def profit_bulk_upload():
     ALL-OR-NOTHING: Validates all records before inserting any
     """
     try:
-        if 'csv_file' not in request.files and 'file' not in request.files:
+        file, file_error = request_file('csv_file', 'file')
+        if file_error:
+            return file_error
+        if file is None:
             return jsonify(ok=False, error='No file provided'), 400
         
-        file = request.files.get("csv_file") or request.files.get("file")
-        file = request.files.get('csv_file') or request.files.get('file')
         if file.filename == '':
             return jsonify(ok=False, error='No file selected'), 400
         
-        if not file.filename.endswith('.csv'):
-            return jsonify(ok=False, error='File must be a CSV'), 400
+        if not file.filename.lower().endswith(BULK_UPLOAD_EXTENSIONS):
+            return jsonify(ok=False, error='File must be a CSV or Excel (.xlsx) file'), 400
         
         # Get user_id from session
         user_id = session.get('user_id', 1)
         username = session.get('username', 'System')
         print(f"📤 ALL-OR-NOTHING Profit bulk upload initiated by: {username} (ID: {user_id})")
         
-        # Read and decode CSV content
-        content = file.stream.read().decode("UTF-8")
+        # ?mode=upsert: update rows already imported under the same natural key instead of duplicating them
+        mode = request.args.get('mode', 'insert')
+        if mode not in IMPORT_MODES:
+            return jsonify(ok=False, error=f"mode must be one of: {', '.join(IMPORT_MODES)}"), 400
+        
+        # ?sheet=: which sheet of an .xlsx workbook to read (name or 1-based number)
+        sheet = request.args.get('sheet') or None
+        
+        # ?async=1: hand the file to a background import job and return its ID right away
+        if request.args.get('async') in ('1', 'true'):
+            from import_jobs import start_import_job
+            return start_import_job('profit', file, user_id, mode, sheet)
         
         # STEP 1: Validate ALL records BEFORE inserting ANY
         print("🔍 STEP 1: Validating all records...")
-        valid_records, validation_errors = parse_and_validate_profit_csv(content)
+        valid_records, validation_errors = parse_and_validate_profit_csv(file.stream, sheet=sheet)
         
         # If there are ANY validation errors, reject the ENTIRE upload
         if validation_errors:
@@ -1745,72 +2228,24 @@ def profit_bulk_upload():
         # STEP 2: Insert ALL records in a single transaction
         print("💾 STEP 2: Inserting all records...")
         
-        with SessionLocal() as s, s.begin():
-            for idx, record in enumerate(valid_records, start=1):
-                s.execute(text("""
-                    INSERT INTO profit_form_entries (
-                        bank_id, partner_name, year, technician,
-                        profit_l, company_value_l, expected_profit_pct,
-                        investment_l, investment_usd, exchange_rate,
-                        proposal_state, transaction_type,
-                        january_l, february_l, march_l, april_l, may_l, june_l,
-                        july_l, august_l, september_l, october_l, november_l, december_l,
-                        business_category, company_type, community, municipality, state,
-                        comments, start_date, created_by, updated_by
-                    ) VALUES (
-                        :bank_id, :partner_name, :year, :technician,
-                        :profit_l, :company_value_l, :expected_profit_pct,
-                        :investment_l, :investment_usd, :exchange_rate,
-                        :proposal_state, :transaction_type,
-                        :january_l, :february_l, :march_l, :april_l, :may_l, :june_l,
-                        :july_l, :august_l, :september_l, :october_l, :november_l, :december_l,
-                        :business_category, :company_type, :community, :municipality, :state,
-                        :comments, :start_date, :created_by, :updated_by
-                    )
-                """), {
-                    "bank_id": record['bank_id'],
-                    "partner_name": record['partner_name'],
-                    "year": record['year'],
-                    "technician": record['technician'],
-                    "profit_l": record['profit_l'],
-                    "company_value_l": record['company_value_l'],
-                    "expected_profit_pct": record['expected_profit_pct'],
-                    "investment_l": record['investment_l'],
-                    "investment_usd": record['investment_usd'],
-                    "exchange_rate": record['exchange_rate'],
-                    "proposal_state": record['proposal_state'],
-                    "transaction_type": record['transaction_type'],
-                    "january_l": record['january_l'],
-                    "february_l": record['february_l'],
-                    "march_l": record['march_l'],
-                    "april_l": record['april_l'],
-                    "may_l": record['may_l'],
-                    "june_l": record['june_l'],
-                    "july_l": record['july_l'],
-                    "august_l": record['august_l'],
-                    "september_l": record['september_l'],
-                    "october_l": record['october_l'],
-                    "november_l": record['november_l'],
-                    "december_l": record['december_l'],
-                    "business_category": record['business_category'],
-                    "company_type": record['company_type'],
-                    "community": record['community'],
-                    "municipality": record['municipality'],
-                    "state": record['state'],
-                    "comments": record['comments'],
-                    "start_date": record['start_date'],
-                    "created_by": user_id,
-                    "updated_by": user_id
-                })
-                print(f"  ✅ Inserted {idx}/{len(valid_records)}: {record['partner_name']}")
+        counts, elapsed, rows_per_second = _timed_bulk_import(
+            'profit', _profit_insert_rows(valid_records, user_id), mode
+        )
         
         print(f"🎉 SUCCESS: All {len(valid_records)} records uploaded by {username}")
         
         return jsonify({
             'ok': True,
-            'message': f'Successfully uploaded all {len(valid_records)} records',
+            'message': _import_message(mode, len(valid_records), counts),
+            'mode': mode,
             'uploaded_count': len(valid_records),
-            'uploaded_by': username
+            'inserted_count': counts['inserted'],
+            'updated_count': counts['updated'],
+            'unchanged_count': counts['unchanged'],
+            'duplicate_count': counts['duplicates'],
+            'uploaded_by': username,
+            'insert_seconds': round(elapsed, 3),
+            'rows_per_second': round(rows_per_second, 1)
         }), 201
         
     except Exception as e:
@@ -1829,58 +2264,12 @@ def profit_bulk_upload():
 # NEW FEATURE - Added Nov 15, 2025
 # ============================================
 
-def validate_investment_vs_loan_record(row, row_num):
-    """
-    Validate a single investment vs loan CSV record
-    Returns: (is_valid: bool, error_message: str or None, parsed_data: dict or None)
-    
-    Expected CSV structure:
-    - Partner Name (required)
-    - Expected Profit % (optional)
-    - Investment Amount (L.) (optional)
-    - Last Loan (L.) (optional)
-    - Comments (optional)
-    """
-    errors = []
-    parsed_data = {}
-    
-    # Required: Partner Name
-    partner_name = (row.get('partner_name') or "").strip()
-    if not partner_name:
-        errors.append("Partner Name is required")
-    else:
-        parsed_data['partner_name'] = partner_name
-    
-    # Optional: Expected Profit %
-    expected_profit_pct = safe_float(row.get('expected_profit_pct'))
-    if expected_profit_pct is not None and (expected_profit_pct < 0 or expected_profit_pct > 100):
-        errors.append(f"Expected Profit % must be between 0 and 100 (got {expected_profit_pct})")
-    parsed_data['expected_profit_pct'] = expected_profit_pct
-    
-    # Optional: Investment Amount (L.)
-    investment_l = safe_float(row.get('investment_l'))
-    if investment_l is not None and investment_l < 0:
-        errors.append(f"Investment Amount (L.) cannot be negative (got {investment_l})")
-    parsed_data['investment_l'] = investment_l
-    
-    # Optional: Last Loan (L.)
-    last_loan_l = safe_float(row.get('last_loan_l'))
-    if last_loan_l is not None and last_loan_l < 0:
-        errors.append(f"Last Loan (L.) cannot be negative (got {last_loan_l})")
-    parsed_data['last_loan_l'] = last_loan_l
-    
-    # Optional: Comments
-    parsed_data['comments'] = (row.get('comments') or "").strip() or None
-    
-    # Return validation result
-    if errors:
-        return False, '; '.join(errors), None
-    return True, None, parsed_data
-
-
-def parse_and_validate_investment_vs_loan_csv(content):
+def parse_and_validate_investment_vs_loan_csv(source, progress=None, sheet=None):
     """
     Parse CSV and validate ALL records before inserting ANY
+    source: upload byte stream (CSV decoded incrementally, or .xlsx read as a stream), text stream or str
+    progress: optional callback(rows_checked), called every BULK_PROGRESS_EVERY rows; return False to stop
+    sheet: .xlsx sheet name or 1-based number (default: first sheet with a header row)
     Returns: (valid_records: list, validation_errors: list)
     
     Expected CSV columns (case-insensitive):
@@ -1894,15 +2283,15 @@ def parse_and_validate_investment_vs_loan_csv(content):
     validation_errors = []
     
     try:
-        csv_reader = csv.DictReader(StringIO(content))
+        csv_reader, csv_headers, header_row = _upload_table(source, sheet)
         
         # First, check for columns that indicate this is the WRONG CSV file
         wrong_file_indicators = ['year', 'reported shares', 'share capital', 'technician', 
                                   'business category', 'jan (l)', 'feb (l)', 'profit (l.)', 
                                   'transaction type', 'proposal state', 'municipality', 'state']
         
-        if csv_reader.fieldnames:
-            lower_headers = [h.lower().strip() for h in csv_reader.fieldnames]
+        if csv_headers:
+            lower_headers = [h.lower().strip() for h in csv_headers]
             
             # Check if this looks like a Matching Equity or Profit CSV
             found_wrong_columns = [col for col in wrong_file_indicators if col in lower_headers]
@@ -1917,18 +2306,10 @@ def parse_and_validate_investment_vs_loan_csv(content):
         
         # Map CSV headers to our expected field names (case-insensitive)
         header_mapping = {}
-        for header in (csv_reader.fieldnames or []):
-            lower_header = header.lower().strip()
-            if 'partner name' in lower_header or lower_header == 'partner_name':
-                header_mapping['partner_name'] = header
-            elif 'expected profit' in lower_header or lower_header == 'expected_profit_pct':
-                header_mapping['expected_profit_pct'] = header
-            elif 'investment amount' in lower_header or lower_header == 'investment_l':
-                header_mapping['investment_l'] = header
-            elif 'last loan' in lower_header or lower_header == 'last_loan_l':
-                header_mapping['last_loan_l'] = header
-            elif lower_header == 'comments':
-                header_mapping['comments'] = header
+        for header in csv_headers:
+            field_name = _header_field(header)
+            if field_name:
+                header_mapping[field_name] = header
         
         # Check for required header
         if 'partner_name' not in header_mapping:
@@ -1939,29 +2320,11 @@ def parse_and_validate_investment_vs_loan_csv(content):
             })
             return [], validation_errors
         
-        # Validate each row
-        for row_num, raw_row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
-            # Skip completely empty rows
-            if all(not str(v).strip() for v in raw_row.values()):
-                continue
-            
-            # Map the row data to our expected field names
-            row = {}
-            for field_name, csv_header in header_mapping.items():
-                row[field_name] = raw_row.get(csv_header, '')
-            
-            # Validate the record
-            is_valid, error_msg, parsed_data = validate_investment_vs_loan_record(row, row_num)
-            
-            if not is_valid:
-                validation_errors.append({
-                    'row': row_num,
-                    'partner_name': (row.get('partner_name') or '').strip() or 'Unknown',
-                    'error': error_msg
-                })
-            else:
-                # Store validated and parsed record
-                valid_records.append(parsed_data)
+        # Validate each row, a batch at a time, under the template's field names
+        mapped_headers = {csv_header: field_name for field_name, csv_header in header_mapping.items()}
+        _validate_in_batches(IVL_FIELDS, csv_headers, csv_reader, valid_records, validation_errors, progress,
+                             field_names=[mapped_headers.get(header) for header in csv_headers],
+                             header_row=header_row)
         
         # If no valid records found
         if not valid_records and not validation_errors:
@@ -1970,6 +2333,16 @@ def parse_and_validate_investment_vs_loan_csv(content):
                 'error': 'No valid data rows found in CSV file'
             })
     
+    except UploadFormatError as e:
+        validation_errors.append({
+            'row': 'File',
+            'error': str(e)
+        })
+    except UnicodeDecodeError:
+        validation_errors.append({
+            'row': 'File',
+            'error': 'The file contains characters that could not be read. Save it as "CSV UTF-8" and try again.'
+        })
     except csv.Error as e:
         validation_errors.append({
             'row': 'File',
@@ -1984,6 +2357,22 @@ def parse_and_validate_investment_vs_loan_csv(content):
     return valid_records, validation_errors
 
 
+IVL_INSERT_COLUMNS = [
+    'partner_name', 'expected_profit_pct', 'investment_amount', 'last_loan',
+    'comments', 'created_by', 'updated_by'
+]
+
+def _ivl_insert_rows(valid_records, user_id):
+    return [{
+        'partner_name': record['partner_name'],
+        'expected_profit_pct': record['expected_profit_pct'],
+        'investment_amount': record['investment_l'],
+        'last_loan': record['last_loan_l'],
+        'comments': record['comments'],
+        'created_by': user_id,
+        'updated_by': user_id
+    } for record in valid_records]
+
 @bp.post("/ivl/bulk-upload")
 def investment_loan_bulk_upload():
     """
@@ -1998,28 +2387,39 @@ def investment_loan_bulk_upload():
     - Comments (optional)
     """
     try:
-        if 'csv_file' not in request.files:
+        file, file_error = request_file('csv_file')
+        if file_error:
+            return file_error
+        if file is None:
             return jsonify(ok=False, error='No file provided'), 400
         
-        file = request.files['csv_file']
-        
         if file.filename == '':
             return jsonify(ok=False, error='No file selected'), 400
         
-        if not file.filename.endswith('.csv'):
-            return jsonify(ok=False, error='File must be a CSV'), 400
+        if not file.filename.lower().endswith(BULK_UPLOAD_EXTENSIONS):
+            return jsonify(ok=False, error='File must be a CSV or Excel (.xlsx) file'), 400
         
         # Get user_id from session
         user_id = session.get('user_id', 1)
         username = session.get('username', 'System')
         print(f"📤 ALL-OR-NOTHING Investment vs Loan bulk upload initiated by: {username} (ID: {user_id})")
         
-        # Read and decode CSV content
-        content = file.stream.read().decode("UTF-8")
+        # ?mode=upsert needs a natural key, which IVL rows don't have
+        mode = request.args.get('mode', 'insert')
+        if mode != 'insert':
+            return jsonify(ok=False, error='Upsert is only available for matching and profit uploads'), 400
+        
+        # ?sheet=: which sheet of an .xlsx workbook to read (name or 1-based number)
+        sheet = request.args.get('sheet') or None
+        
+        # ?async=1: hand the file to a background import job and return its ID right away
+        if request.args.get('async') in ('1', 'true'):
+            from import_jobs import start_import_job
+            return start_import_job('ivl', file, user_id, mode, sheet)
         
         # STEP 1: Validate ALL records BEFORE inserting ANY
         print("🔍 STEP 1: Validating all records...")
-        valid_records, validation_errors = parse_and_validate_investment_vs_loan_csv(content)
+        valid_records, validation_errors = parse_and_validate_investment_vs_loan_csv(file.stream, sheet=sheet)
         
         # If there are ANY validation errors, reject the ENTIRE upload
         if validation_errors:
@@ -2048,34 +2448,24 @@ def investment_loan_bulk_upload():
         # STEP 2: Insert ALL records in a single transaction
         print("💾 STEP 2: Inserting all records...")
         
-        with SessionLocal() as s, s.begin():
-            for idx, record in enumerate(valid_records, start=1):
-                s.execute(text("""
-                    INSERT INTO ivl_form_entries (
-                        partner_name, expected_profit_pct, investment_amount, last_loan,
-                        comments, created_by, updated_by
-                    ) VALUES (
-                        :partner_name, :expected_profit_pct, :investment_amount, :last_loan,
-                        :comments, :created_by, :updated_by
-                    )
-                """), {
-                    "partner_name": record['partner_name'],
-                    "expected_profit_pct": record['expected_profit_pct'],
-                    "investment_amount": record['investment_l'],
-                    "last_loan": record['last_loan_l'],
-                    "comments": record['comments'],
-                    "created_by": user_id,
-                    "updated_by": user_id
-                })
-                print(f"  ✅ Inserted {idx}/{len(valid_records)}: {record['partner_name']}")
+        counts, elapsed, rows_per_second = _timed_bulk_import(
+            'ivl', _ivl_insert_rows(valid_records, user_id), mode
+        )
         
         print(f"🎉 SUCCESS: All {len(valid_records)} records uploaded by {username}")
         
         return jsonify({
             'ok': True,
-            'message': f'Successfully uploaded all {len(valid_records)} records',
+            'message': _import_message(mode, len(valid_records), counts),
+            'mode': mode,
             'uploaded_count': len(valid_records),
-            'uploaded_by': username
+            'inserted_count': counts['inserted'],
+            'updated_count': counts['updated'],
+            'unchanged_count': counts['unchanged'],
+            'duplicate_count': counts['duplicates'],
+            'uploaded_by': username,
+            'insert_seconds': round(elapsed, 3),
+            'rows_per_second': round(rows_per_second, 1)
         }), 201
         
     except Exception as e:
@@ -2089,6 +2479,182 @@ def investment_loan_bulk_upload():
             'message': 'An error occurred while uploading your CSV file. Please check that your file follows the template format and all required fields are filled in correctly. If the problem persists, contact support.'
         }), 500
 
+
+# ============================================
+# BULK IMPORT REGISTRY
+# Everything import_jobs.py needs to run an upload in the background
+# ============================================
+
+BULK_IMPORTS = {
+    'matching': {
+        'parse': parse_and_validate_matching_equity_csv,
+        'table': 'matching_equity_entries',
+        'columns': MATCHING_INSERT_COLUMNS + ['created_by', 'updated_by'],
+        'rows': _matching_insert_rows,
+        'upsert': True,
+    },
+    'profit': {
+        'parse': parse_and_validate_profit_csv,
+        'table': 'profit_form_entries',
+        'columns': PROFIT_INSERT_COLUMNS + ['created_by', 'updated_by'],
+        'rows': _profit_insert_rows,
+        'upsert': True,
+    },
+    'ivl': {
+        'parse': parse_and_validate_investment_vs_loan_csv,
+        'table': 'ivl_form_entries',
+        'columns': IVL_INSERT_COLUMNS,
+        'rows': _ivl_insert_rows,
+    },
+}
+
+# ============================================
+# UPSERT / DE-DUPLICATION (bulk uploads with ?mode=upsert)
+# Matching and profit rows carry import_key, a SHA-1 of their natural key
+# (UPSERT_KEY_COLUMNS, trimmed and lower-cased) under a UNIQUE index. Manual
+# entries and edits keep it current too, so an upsert always finds the row
+# that has that key today.
+# Existing keys are looked up once per chunk, then new and changed rows go
+# in as one INSERT ... ON DUPLICATE KEY UPDATE per chunk. Rows identical
+# to what is stored are skipped.
+# ============================================
+
+IMPORT_MODES = ('insert', 'upsert')
+# Natural key matched by ?mode=upsert. Fixed rather than configurable: the stored
+# import_key values (and the backfill in migrations/005) are hashes of these columns
+UPSERT_KEY_COLUMNS = ('bank_id', 'partner_name', 'year')
+# Columns an upsert never overwrites on an existing row
+UPSERT_KEEP_COLUMNS = ('created_by',)
+
+def _import_key(row):
+    """SHA-1 of the natural key. Same value as the SQL backfill in migrations/005:
+    SHA1(CONCAT_WS(CHAR(31), LOWER(TRIM(IFNULL(col, ''))), ...))"""
+    natural_key = "\x1f".join("" if row[col] is None else str(row[col]).strip().lower() for col in UPSERT_KEY_COLUMNS)
+    return hashlib.sha1(natural_key.encode("utf-8")).hexdigest()
+
+def _claim_import_key(s, table, row, investment_id=None):
+    """import_key for a hand-entered (investment_id=None) or edited row: the hash of its
+    natural key, or None when another row already holds that key. Same rule as an insert-mode
+    bulk upload, where only the first row with a given key gets it.
+    An edit that moves a row off its old key passes that key on to the newest other row with
+    the old natural key, so an upsert keeps finding it"""
+    key = _import_key(row)
+    if investment_id is not None:
+        old_key = s.execute(text(f"SELECT import_key FROM {table} WHERE investment_id = :id FOR UPDATE"),
+                            {'id': investment_id}).scalar()
+        if old_key == key:
+            return key
+        if old_key is not None:
+            s.execute(text(f"UPDATE {table} SET import_key = NULL WHERE investment_id = :id"), {'id': investment_id})
+            _pass_on_import_key(s, table, investment_id, old_key)
+    holder = s.execute(text(f"SELECT investment_id FROM {table} WHERE import_key = :key FOR UPDATE"),
+                       {'key': key}).scalar()
+    return key if holder is None or holder == investment_id else None
+
+def _pass_on_import_key(s, table, investment_id, old_key):
+    """Give old_key to the newest row other than investment_id whose natural key hashes to it"""
+    stored = s.execute(text(f"SELECT {', '.join(UPSERT_KEY_COLUMNS)} FROM {table} WHERE investment_id = :id"),
+                       {'id': investment_id}).mappings().first()
+    candidates = s.execute(text(f"""
+        SELECT investment_id, {', '.join(UPSERT_KEY_COLUMNS)} FROM {table}
+        WHERE import_key IS NULL AND investment_id <> :id AND LOWER(TRIM(partner_name)) = :partner_name
+        ORDER BY investment_id DESC
+    """), {'id': investment_id, 'partner_name': (stored['partner_name'] or '').strip().lower()}).mappings()
+    for candidate in candidates:
+        if _import_key(candidate) == old_key:
+            s.execute(text(f"UPDATE {table} SET import_key = :key WHERE investment_id = :id"),
+                      {'key': old_key, 'id': candidate['investment_id']})
+            return
+
+def _same_value(new, old):
+    """Does an incoming upload value match what the database holds?"""
+    if new is None or old is None:
+        return new is None and old is None
+    if isinstance(old, Decimal):
+        # Compare at the column's scale: 5000.555 is stored as 5000.56
+        try:
+            return Decimal(str(new)).quantize(old) == old
+        except (InvalidOperation, ValueError):
+            return False
+    if isinstance(old, (date, datetime)):
+        return str(new) == old.isoformat()
+    return new == old
+
+def _import_message(mode, total, counts):
+    if mode != 'upsert':
+        message = f'Successfully uploaded all {total} records'
+    else:
+        message = (f"Imported {total} records: {counts['inserted']} new, {counts['updated']} updated, "
+                   f"{counts['unchanged']} unchanged")
+        if counts['duplicates']:
+            message += f" ({counts['duplicates']} repeated rows in the file were merged)"
+    filled = sum(counts.get('derived_filled', {}).values())
+    if filled:
+        message += f" ({filled} blank calculated values filled in from the active formulas)"
+    return message
+
+def _bulk_import(s, kind, rows, mode='insert', on_chunk=None):
+    """Write validated upload rows for BULK_IMPORTS[kind] in the caller's transaction.
+    insert: add every row, as before. A row also gets its import_key when no stored row or
+            earlier row in the file holds it yet, so a later upsert can find it
+    upsert: rows whose key is already stored update that row; identical rows are skipped.
+            If the file repeats a key, the last row wins
+    Blank derived cells (investment_usd, ...) are filled from the active formulas first.
+    Returns {'inserted', 'updated', 'unchanged', 'duplicates', 'derived_filled'}"""
+    spec = BULK_IMPORTS[kind]
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0,
+              'derived_filled': fill_derived(s, kind, rows) if kind in FORM_TABLES else {}}
+    if not spec.get('upsert'):
+        _bulk_insert(s, spec['table'], spec['columns'], rows, on_chunk=on_chunk)
+        counts['inserted'] = len(rows)
+        return counts
+
+    for row in rows:
+        row['import_key'] = _import_key(row)
+    if mode == 'upsert':
+        unique_rows = list({row['import_key']: row for row in rows}.values())
+        counts['duplicates'] = len(rows) - len(unique_rows)
+        rows = unique_rows
+
+    table = spec['table']
+    columns = spec['columns'] + ['import_key']
+    compare_columns = [col for col in spec['columns'] if col not in ('created_by', 'updated_by')]
+    update_columns = [col for col in spec['columns'] if col not in UPSERT_KEEP_COLUMNS]
+    lookup = text(f"SELECT import_key, {', '.join(compare_columns)} FROM {table} WHERE import_key IN :keys") \
+        .bindparams(bindparam('keys', expanding=True))
+
+    seen_keys = set()
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+        stored = {row.import_key: row for row in s.execute(lookup, {'keys': [row['import_key'] for row in chunk]})}
+
+        if mode == 'insert':
+            for row in chunk:
+                if row['import_key'] in stored or row['import_key'] in seen_keys:
+                    row['import_key'] = None
+                else:
+                    seen_keys.add(row['import_key'])
+            _bulk_insert(s, table, columns, chunk)
+            counts['inserted'] += len(chunk)
+        else:
+            to_write = []
+            for row in chunk:
+                existing = stored.get(row['import_key'])
+                if existing is None:
+                    counts['inserted'] += 1
+                elif all(_same_value(row[col], getattr(existing, col)) for col in compare_columns):
+                    counts['unchanged'] += 1
+                    continue
+                else:
+                    counts['updated'] += 1
+                to_write.append(row)
+            if to_write:
+                _bulk_insert(s, table, columns, to_write, update_columns=update_columns)
+
+        if on_chunk:
+            on_chunk(start + len(chunk))
+    return counts
+
 # ============================================
 # MATCHING EQUITY ENDPOINTS
 # ============================================
@@ -2102,8 +2668,12 @@ def matching_manual_entry():
         return auth_error
     
     # Get form data (sent as FormData, not JSON)
-    b = request.form
-    f = request.files.get("supporting_file")
+    entry, validation_error = validate_fields('matching_entry', request.form)
+    if validation_error:
+        return validation_error
+    f, file_error = request_file("supporting_file")
+    if file_error:
+        return file_error
     
     # Save file if present and store filename in notes
     notes = None
@@ -2123,49 +2693,16 @@ def matching_manual_entry():
                  community, municipality, state, comments, notes, start_date,
                  january_l, february_l, march_l, april_l, may_l, june_l,
                  july_l, august_l, september_l, october_l, november_l, december_l,
-                 created_by, updated_by)
+                 created_by, updated_by, import_key)
                 VALUES (:bank_id, :partner_name, :year, :technician, :reported_shares, :share_capital_multiplied,
                         :expected_profit_pct, :investment_l, :investment_usd, :exchange_rate,
                         :proposal_state, :transaction_type, :business_category, :company_type,
                         :community, :municipality, :state, :comments, :notes, :start_date,
                         :january_l, :february_l, :march_l, :april_l, :may_l, :june_l,
                         :july_l, :august_l, :september_l, :october_l, :november_l, :december_l,
-                        :user_id, :user_id)
-            """), {
-                "bank_id": (b.get("bank_id") or "").strip() or None,
-                "partner_name": (b.get("partner_name") or "").strip(),
-                "year": int(b.get("year")) if b.get("year") else None,
-                "technician": (b.get("technician") or "").strip() or None,
-                "reported_shares": float(b.get("reported_shares")) if b.get("reported_shares") else None,
-                "share_capital_multiplied": float(b.get("share_capital_multiplied")) if b.get("share_capital_multiplied") else None,
-                "expected_profit_pct": float(b.get("expected_profit_pct")) if b.get("expected_profit_pct") else None,
-                "investment_l": float(b.get("investment_l")) if b.get("investment_l") else None,
-                "investment_usd": float(b.get("investment_usd")) if b.get("investment_usd") else None,
-                "exchange_rate": float(b.get("exchange_rate")) if b.get("exchange_rate") else None,
-                "proposal_state": (b.get("proposal_state") or "").strip() or None,
-                "transaction_type": (b.get("transaction_type") or "").strip() or None,
-                "business_category": (b.get("business_category") or "").strip() or None,
-                "company_type": (b.get("company_type") or "").strip() or None,
-                "community": (b.get("community") or "").strip() or None,
-                "municipality": (b.get("municipality") or "").strip() or None,
-                "state": (b.get("state") or "").strip() or None,
-                "comments": (b.get("comments") or "").strip() or None,
-                "notes": notes,
-                "start_date": b.get("start_date") or None,
-                "january_l": float(b.get("january_l", 0)),
-                "february_l": float(b.get("february_l", 0)),
-                "march_l": float(b.get("march_l", 0)),
-                "april_l": float(b.get("april_l", 0)),
-                "may_l": float(b.get("may_l", 0)),
-                "june_l": float(b.get("june_l", 0)),
-                "july_l": float(b.get("july_l", 0)),
-                "august_l": float(b.get("august_l", 0)),
-                "september_l": float(b.get("september_l", 0)),
-                "october_l": float(b.get("october_l", 0)),
-                "november_l": float(b.get("november_l", 0)),
-                "december_l": float(b.get("december_l", 0)),
-                "user_id": user_id
-            })
+                        :user_id, :user_id, :import_key)
+            """), {**entry, "notes": notes, "user_id": user_id,
+                   "import_key": _claim_import_key(s, 'matching_equity_entries', entry)})
             
         return jsonify(ok=True, message="Matching equity entry saved successfully"), 201
         
@@ -2182,10 +2719,19 @@ def matching_manual_entry():
 @bp.get("/matching/entries")
 def get_matching_entries():
     """Get all micro equity matching entries with audit data"""
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+    include_summary = request.args.get('include_summary') in ('1', 'true')
+
     try:
         with SessionLocal() as s:
-            rows = s.execute(text("""
-                SELECT 
+            cursor = _sync_cursor(s)
+
+            summary_columns = _summary_columns('matching') if include_summary else ""
+            query = f"""
+                SELECT
                     m.investment_id, m.bank_id, m.partner_name, m.year, m.technician,
                     m.reported_shares, m.share_capital_multiplied, m.expected_profit_pct,
                     m.investment_l, m.investment_usd, m.exchange_rate,
@@ -2193,15 +2739,19 @@ def get_matching_entries():
                     m.business_category, m.company_type, m.community, m.municipality, m.state,
                     m.january_l, m.february_l, m.march_l, m.april_l, m.may_l, m.june_l,
                     m.july_l, m.august_l, m.september_l, m.october_l, m.november_l, m.december_l,
-                    m.comments, m.notes, m.start_date, 
+                    m.comments, m.notes, m.start_date,
                     m.created_by, m.created_at, m.updated_by, m.updated_at,
                     u1.username as created_by_name,
-                    u2.username as updated_by_name
+                    u2.username as updated_by_name{summary_columns}
                 FROM matching_equity_entries m
                 LEFT JOIN users u1 ON m.created_by = u1.user_id
                 LEFT JOIN users u2 ON m.updated_by = u2.user_id
-                ORDER BY m.created_at DESC
-            """)).fetchall()
+            """
+            conditions, params = _listing_filters('matching', None, None, since, request.args)
+            query += _where(conditions)
+            query += " ORDER BY m.created_at DESC"
+
+            rows = s.execute(text(query), params).fetchall()
             
             entries = []
             for row in rows:
@@ -2244,8 +2794,14 @@ def get_matching_entries():
                     'updated_by': row.updated_by_name if row.updated_by_name else 'System',
                     'updated_at': row.updated_at.isoformat() if row.updated_at else None
                 })
-            
-            return jsonify(ok=True, entries=entries), 200
+
+            response = {'ok': True, 'entries': entries, 'cursor': cursor.isoformat()}
+            if include_summary:
+                response['summary'] = _summary_values('matching', rows[0] if rows else None, prefix='summary_')
+            if since:
+                response['deleted_ids'] = _deleted_since(s, 'matching', None, None, since)
+
+            return jsonify(response), 200
             
     except Exception as e:
         print(f"❌ Error loading matching entries: {e}")
@@ -2255,25 +2811,10 @@ def get_matching_entries():
 
 @bp.get("/matching/summary")
 def get_matching_summary():
-    """Get summary statistics for matching entries"""
+    """Get summary statistics for matching entries (accepts the listing filters, e.g. ?year=)"""
     try:
         with SessionLocal() as s:
-            row = s.execute(text("""
-                SELECT 
-                    COALESCE(SUM(investment_l), 0) as total_investment_l,
-                    COALESCE(SUM(investment_usd), 0) as total_investment_usd,
-                    COALESCE(SUM(reported_shares), 0) as total_reported_shares,
-                    COUNT(*) as total_entries
-                FROM matching_equity_entries
-            """)).fetchone()
-            
-            summary = {
-                'total_investment_l': float(row.total_investment_l) if row.total_investment_l else 0,
-                'total_investment_usd': float(row.total_investment_usd) if row.total_investment_usd else 0,
-                'total_reported_shares': float(row.total_reported_shares) if row.total_reported_shares else 0,
-                'total_entries': row.total_entries
-            }
-            
+            summary = _listing_summary(s, 'matching', request.args)
             return jsonify(ok=True, summary=summary), 200
             
     except Exception as e:
@@ -2347,14 +2888,35 @@ def get_matching_entry(investment_id):
         traceback.print_exc()
         return jsonify(ok=False, error='Failed to load entry'), 500
 
+def _recalculate_derived(s, form, investment_id, entry):
+    """Compare the formula inputs in an edited entry with the stored row and re-evaluate only
+    the formulas downstream of the ones that changed (a new profit_l refreshes company_value_l,
+    investment_l and investment_usd; a new exchange_rate only investment_usd).
+    Updates entry in place and returns {field: recalculated value}"""
+    graph = formula_graph(s, form)
+    inputs = [name for name in graph.inputs if name in entry]
+    if not inputs:
+        return {}
+    stored = s.execute(text(f"""
+        SELECT {', '.join(inputs)} FROM {FORM_TABLES[form]} WHERE investment_id = :id
+    """), {"id": investment_id}).fetchone()
+    if stored is None:
+        return {}
+
+    changed = [name for name in inputs if not _same_value(entry[name], stored._mapping[name])]
+    return graph.recalculate(entry, changed)
+
 @bp.put("/matching/entry/<int:investment_id>")
 def update_matching_entry(investment_id):
     """Update a matching entry"""
     try:
-        data = request.json
+        entry, validation_error = validate_fields('matching_entry', request.json)
+        if validation_error:
+            return validation_error
         user_id = session.get('user_id', 1)
         
         with SessionLocal() as s, s.begin():
+            recalculated = _recalculate_derived(s, 'matching', investment_id, entry)
             s.execute(text("""
                 UPDATE matching_equity_entries
                 SET bank_id = :bank_id,
@@ -2387,44 +2949,13 @@ def update_matching_entry(investment_id):
                     november_l = :november_l,
                     december_l = :december_l,
                     comments = :comments,
-                    updated_by = :updated_by
+                    updated_by = :updated_by,
+                    import_key = :import_key
                 WHERE investment_id = :investment_id
-            """), {
-                "investment_id": investment_id,
-                "bank_id": data.get("bank_id"),
-                "partner_name": data.get("partner_name"),
-                "year": data.get("year"),
-                "technician": data.get("technician"),
-                "reported_shares": data.get("reported_shares"),
-                "share_capital_multiplied": data.get("share_capital_multiplied"),
-                "expected_profit_pct": data.get("expected_profit_pct"),
-                "investment_l": data.get("investment_l"),
-                "investment_usd": data.get("investment_usd"),
-                "exchange_rate": data.get("exchange_rate"),
-                "proposal_state": data.get("proposal_state"),
-                "transaction_type": data.get("transaction_type"),
-                "business_category": data.get("business_category"),
-                "company_type": data.get("company_type"),
-                "community": data.get("community"),
-                "municipality": data.get("municipality"),
-                "state": data.get("state"),
-                "january_l": data.get("january_l", 0),
-                "february_l": data.get("february_l", 0),
-                "march_l": data.get("march_l", 0),
-                "april_l": data.get("april_l", 0),
-                "may_l": data.get("may_l", 0),
-                "june_l": data.get("june_l", 0),
-                "july_l": data.get("july_l", 0),
-                "august_l": data.get("august_l", 0),
-                "september_l": data.get("september_l", 0),
-                "october_l": data.get("october_l", 0),
-                "november_l": data.get("november_l", 0),
-                "december_l": data.get("december_l", 0),
-                "comments": data.get("comments"),
-                "updated_by": user_id
-            })
+            """), {**entry, "investment_id": investment_id, "updated_by": user_id,
+                   "import_key": _claim_import_key(s, 'matching_equity_entries', entry, investment_id)})
         
-        return jsonify(ok=True, message='Entry updated successfully'), 200
+        return jsonify(ok=True, message='Entry updated successfully', recalculated=recalculated), 200
         
     except Exception as e:
         print(f"❌ Error updating matching entry: {e}")
@@ -2441,9 +2972,11 @@ def delete_matching_entry(investment_id):
                 DELETE FROM matching_equity_entries
                 WHERE investment_id = :id
             """), {"id": investment_id})
-            
+
             if result.rowcount == 0:
                 return jsonify(ok=False, error='Entry not found'), 404
+
+            _record_delete(s, 'matching_equity_entries', investment_id)
         
         return jsonify(ok=True, message='Entry deleted successfully'), 200
         
@@ -2465,7 +2998,9 @@ def profit_entry():
     if auth_error:
         return auth_error
     
-    data = request.get_json()
+    entry, validation_error = validate_fields('profit_entry', request.get_json(silent=True))
+    if validation_error:
+        return validation_error
     
     try:
         with SessionLocal() as s, s.begin():
@@ -2477,48 +3012,16 @@ def profit_entry():
                  community, municipality, state, comments, start_date,
                  january_l, february_l, march_l, april_l, may_l, june_l,
                  july_l, august_l, september_l, october_l, november_l, december_l,
-                 created_by, updated_by)
+                 created_by, updated_by, import_key)
                 VALUES (:bank_id, :partner_name, :year, :technician, :profit_l, :company_value_l,
                         :expected_profit_pct, :investment_l, :investment_usd, :exchange_rate,
                         :proposal_state, :transaction_type, :business_category, :company_type,
                         :community, :municipality, :state, :comments, :start_date,
                         :january_l, :february_l, :march_l, :april_l, :may_l, :june_l,
                         :july_l, :august_l, :september_l, :october_l, :november_l, :december_l,
-                        :user_id, :user_id)
-            """), {
-                "bank_id": data.get("bank_id"),
-                "partner_name": data.get("partner_name"),
-                "year": data.get("year"),
-                "technician": data.get("technician"),
-                "profit_l": data.get("profit_l"),
-                "company_value_l": data.get("company_value_l"),
-                "expected_profit_pct": data.get("expected_profit_pct"),
-                "investment_l": data.get("investment_l"),
-                "investment_usd": data.get("investment_usd"),
-                "exchange_rate": data.get("exchange_rate"),
-                "proposal_state": data.get("proposal_state"),
-                "transaction_type": data.get("transaction_type"),
-                "business_category": data.get("business_category"),
-                "company_type": data.get("company_type"),
-                "community": data.get("community"),
-                "municipality": data.get("municipality"),
-                "state": data.get("state"),
-                "comments": data.get("comments"),
-                "start_date": data.get("start_date"),
-                "january_l": data.get("january_l", 0),
-                "february_l": data.get("february_l", 0),
-                "march_l": data.get("march_l", 0),
-                "april_l": data.get("april_l", 0),
-                "may_l": data.get("may_l", 0),
-                "june_l": data.get("june_l", 0),
-                "july_l": data.get("july_l", 0),
-                "august_l": data.get("august_l", 0),
-                "september_l": data.get("september_l", 0),
-                "october_l": data.get("october_l", 0),
-                "november_l": data.get("november_l", 0),
-                "december_l": data.get("december_l", 0),
-                "user_id": user_id
-            })
+                        :user_id, :user_id, :import_key)
+            """), {**entry, "user_id": user_id,
+                   "import_key": _claim_import_key(s, 'profit_form_entries', entry)})
             
         return jsonify(ok=True, message="Profit entry saved successfully"), 201
         
@@ -2535,10 +3038,19 @@ def profit_entry():
 @bp.get("/profit/entries")
 def get_profit_entries():
     """Get all profit entries with audit data"""
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+    include_summary = request.args.get('include_summary') in ('1', 'true')
+
     try:
         with SessionLocal() as s:
-            rows = s.execute(text("""
-                SELECT 
+            cursor = _sync_cursor(s)
+
+            summary_columns = _summary_columns('profit') if include_summary else ""
+            query = f"""
+                SELECT
                     p.investment_id, p.bank_id, p.partner_name, p.year, p.technician,
                     p.profit_l, p.company_value_l, p.expected_profit_pct,
                     p.investment_l, p.investment_usd, p.exchange_rate,
@@ -2548,12 +3060,16 @@ def get_profit_entries():
                     p.business_category, p.company_type, p.community, p.municipality, p.state,
                     p.comments, p.start_date, p.created_by, p.created_at, p.updated_at, p.updated_by,
                     u1.username as created_by_name,
-                    u2.username as updated_by_name
+                    u2.username as updated_by_name{summary_columns}
                 FROM profit_form_entries p
                 LEFT JOIN users u1 ON p.created_by = u1.user_id
                 LEFT JOIN users u2 ON p.updated_by = u2.user_id
-                ORDER BY p.investment_id DESC
-            """)).fetchall()
+            """
+            conditions, params = _listing_filters('profit', None, None, since, request.args)
+            query += _where(conditions)
+            query += " ORDER BY p.investment_id DESC"
+
+            rows = s.execute(text(query), params).fetchall()
             
             entries = []
             for row in rows:
@@ -2595,8 +3111,14 @@ def get_profit_entries():
                     'updated_by': row.updated_by_name if row.updated_by_name else 'System',
                     'updated_at': row.updated_at.isoformat() if row.updated_at else None
                 })
-            
-            return jsonify(ok=True, entries=entries), 200
+
+            response = {'ok': True, 'entries': entries, 'cursor': cursor.isoformat()}
+            if include_summary:
+                response['summary'] = _summary_values('profit', rows[0] if rows else None, prefix='summary_')
+            if since:
+                response['deleted_ids'] = _deleted_since(s, 'profit', None, None, since)
+
+            return jsonify(response), 200
             
     except Exception as e:
         print(f"❌ Error loading profit entries: {e}")
@@ -2606,25 +3128,10 @@ def get_profit_entries():
 
 @bp.get("/profit/summary")
 def get_profit_summary():
-    """Get summary statistics for profit entries"""
+    """Get summary statistics for profit entries (accepts the listing filters, e.g. ?year=)"""
     try:
         with SessionLocal() as s:
-            row = s.execute(text("""
-                SELECT 
-                    COUNT(*) as total_entries,
-                    COALESCE(SUM(investment_l), 0) as total_investment_l,
-                    COALESCE(SUM(investment_usd), 0) as total_investment_usd,
-                    COALESCE(AVG(expected_profit_pct), 0) as avg_expected_profit
-                FROM profit_form_entries
-            """)).fetchone()
-            
-            summary = {
-                'total_entries': row.total_entries,
-                'total_investment_l': float(row.total_investment_l),
-                'total_investment_usd': float(row.total_investment_usd),
-                'avg_expected_profit': float(row.avg_expected_profit)
-            }
-            
+            summary = _listing_summary(s, 'profit', request.args)
             return jsonify(ok=True, summary=summary), 200
             
     except Exception as e:
@@ -2702,10 +3209,13 @@ def get_profit_entry(investment_id):
 def update_profit_entry(investment_id):
     """Update a profit entry"""
     try:
-        data = request.json
+        entry, validation_error = validate_fields('profit_entry', request.json)
+        if validation_error:
+            return validation_error
         user_id = session.get('user_id', 1)
         
         with SessionLocal() as s, s.begin():
+            recalculated = _recalculate_derived(s, 'profit', investment_id, entry)
             s.execute(text("""
                 UPDATE profit_form_entries
                 SET bank_id = :bank_id,
@@ -2738,44 +3248,13 @@ def update_profit_entry(investment_id):
                     municipality = :municipality,
                     state = :state,
                     comments = :comments,
-                    updated_by = :updated_by
+                    updated_by = :updated_by,
+                    import_key = :import_key
                 WHERE investment_id = :investment_id
-            """), {
-                "investment_id": investment_id,
-                "bank_id": data.get("bank_id"),
-                "partner_name": data.get("partner_name"),
-                "year": data.get("year"),
-                "technician": data.get("technician"),
-                "profit_l": data.get("profit_l"),
-                "company_value_l": data.get("company_value_l"),
-                "expected_profit_pct": data.get("expected_profit_pct"),
-                "investment_l": data.get("investment_l"),
-                "investment_usd": data.get("investment_usd"),
-                "exchange_rate": data.get("exchange_rate"),
-                "proposal_state": data.get("proposal_state"),
-                "transaction_type": data.get("transaction_type"),
-                "january_l": data.get("january_l", 0),
-                "february_l": data.get("february_l", 0),
-                "march_l": data.get("march_l", 0),
-                "april_l": data.get("april_l", 0),
-                "may_l": data.get("may_l", 0),
-                "june_l": data.get("june_l", 0),
-                "july_l": data.get("july_l", 0),
-                "august_l": data.get("august_l", 0),
-                "september_l": data.get("september_l", 0),
-                "october_l": data.get("october_l", 0),
-                "november_l": data.get("november_l", 0),
-                "december_l": data.get("december_l", 0),
-                "business_category": data.get("business_category"),
-                "company_type": data.get("company_type"),
-                "community": data.get("community"),
-                "municipality": data.get("municipality"),
-                "state": data.get("state"),
-                "comments": data.get("comments"),
-                "updated_by": user_id
-            })
+            """), {**entry, "investment_id": investment_id, "updated_by": user_id,
+                   "import_key": _claim_import_key(s, 'profit_form_entries', entry, investment_id)})
         
-        return jsonify(ok=True, message='Entry updated successfully'), 200
+        return jsonify(ok=True, message='Entry updated successfully', recalculated=recalculated), 200
         
     except Exception as e:
         print(f"❌ Error updating profit entry: {e}")
@@ -2792,9 +3271,11 @@ def delete_profit_entry(investment_id):
                 DELETE FROM profit_form_entries
                 WHERE investment_id = :id
             """), {"id": investment_id})
-            
+
             if result.rowcount == 0:
                 return jsonify(ok=False, error='Entry not found'), 404
+
+            _record_delete(s, 'profit_form_entries', investment_id)
         
         return jsonify(ok=True, message='Entry deleted successfully'), 200
         
@@ -2808,6 +3289,9 @@ def delete_profit_entry(investment_id):
 # FORMULA MANAGEMENT ENDPOINTS
 # ============================================
 
+# Seconds a browser may reuse /formulas/for-form without revalidating
+FORMULA_CACHE_MAX_AGE = int(os.getenv("FORMULA_CACHE_MAX_AGE", 0))
+
 @bp.get("/formulas")
 def get_formulas():
     """Get all active formulas"""
@@ -2856,29 +3340,27 @@ def get_formulas():
 
 @bp.get("/formulas/for-form/<form_type>")
 def get_formulas_for_form(form_type):
-    """Get active formulas for a specific form type - returns all since form_type doesn't exist in table"""
-    user_id, role, auth_error = require_auth()
+    """Get active formulas for a form type (the formula_key prefix, e.g. profit_investment_usd -> profit),
+    keyed by field. Served from the in-process formula cache with an ETag, so a form reload that
+    still has the current formulas gets a 304 without touching the database"""
+    user_id, auth_error = require_login()
     if auth_error:
         return auth_error
     
     try:
-        with SessionLocal() as s:
-            rows = s.execute(text("""
-                SELECT formula_key, expression
-                FROM formulas
-                WHERE effective_to IS NULL
-            """)).fetchall()
-            
-            formulas = {}
-            for row in rows:
-                # Extract field name from formula_key (e.g., profit_investment_usd -> investment_usd)
-                field_name = row.formula_key.split('_', 1)[1] if '_' in row.formula_key else row.formula_key
-                formulas[field_name] = {
-                    'formula_key': row.formula_key,
-                    'expression': row.expression
-                }
-            
-            return jsonify(ok=True, formulas=formulas), 200
+        cached = form_formulas(SessionLocal, form_type)
+        if cached is None:
+            return jsonify(ok=False, error=f'Unknown form type: {form_type}'), 404
+        formulas, etag = cached
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = jsonify(ok=True, formulas=formulas)
+        response.set_etag(etag)
+        # Browsers keep the copy but revalidate it (cheaply) on every load
+        response.headers['Cache-Control'] = f'private, max-age={FORMULA_CACHE_MAX_AGE}, must-revalidate'
+        return response
             
     except Exception as e:
         print(f"❌ Error loading formulas for form: {e}")
@@ -2907,11 +3389,11 @@ def get_all_formula_history():
                     JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.new_expression')) as new_expression,
                     JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.old_version')) as old_version,
                     JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.new_version')) as new_version,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.reason')) as reason,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.changed_by_username')) as changed_by_username,
+                    al.change_reason as reason,
+                    al.changed_by_username,
                     f.formula_key
                 FROM audit_log al
-                LEFT JOIN formulas f ON CAST(al.row_pk AS UNSIGNED) = f.formula_id
+                LEFT JOIN formulas f ON f.formula_id = al.row_id
                 WHERE al.table_name = 'formulas'
                 ORDER BY al.changed_at DESC
                 LIMIT 100
@@ -3012,12 +3494,12 @@ def get_formula_history(formula_key):
                     f.effective_from, 
                     f.effective_to, 
                     f.description,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.reason')) as change_reason,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.changed_by_username')) as changed_by
+                    al.change_reason,
+                    al.changed_by_username as changed_by
                 FROM formulas f
                 LEFT JOIN audit_log al ON 
                     al.table_name = 'formulas' 
-                    AND CAST(al.row_pk AS UNSIGNED) = f.formula_id
+                    AND al.row_id = f.formula_id
                 WHERE f.formula_key = :key
                 ORDER BY f.version DESC
             """), {"key": formula_key}).fetchall()
@@ -3065,6 +3547,12 @@ def update_formula(formula_key):
     if not new_expression:
         return jsonify(ok=False, error='Expression is required'), 400
     
+    # Only arithmetic on known fields can be saved (see formula_engine.py)
+    try:
+        validate_expression(new_expression)
+    except FormulaError as e:
+        return jsonify(ok=False, error=str(e)), 400
+    
     try:
         with SessionLocal() as s, s.begin():
             # Get current formula
@@ -3081,6 +3569,13 @@ def update_formula(formula_key):
             new_version = old_version + 1
             old_expression = current.expression
             
+            # The new expression can't read (even indirectly) the field it fills
+            try:
+                graph = formula_graph(s, formula_key.partition('_')[0],
+                                      replace=CompiledFormula(None, formula_key, new_version, new_expression))
+            except FormulaError as e:
+                return jsonify(ok=False, error=str(e)), 400
+            
             # Mark current version as expired
             s.execute(text("""
                 UPDATE formulas
@@ -3102,6 +3597,10 @@ def update_formula(formula_key):
             
             new_formula_id = result.lastrowid
             
+            # Re-apply the new expression, and the formulas downstream of it, to the stored rows (same transaction)
+            new_formula = compile_formula(new_formula_id, formula_key, new_version, new_expression)
+            recompute = recompute_chain(s, new_formula, graph) or []
+            
             # Create audit log entry with username
             import json
             audit_diff = {
@@ -3112,25 +3611,336 @@ def update_formula(formula_key):
                 'reason': change_reason,
                 'changed_by_username': username
             }
+            if recompute:
+                audit_diff['recompute'] = [{k: v for k, v in summary.items() if k != 'largest_changes'}
+                                           for summary in recompute]
             
             s.execute(text("""
-                INSERT INTO audit_log (table_name, row_pk, action, diff_json, changed_by, changed_at)
-                VALUES ('formulas', :row_pk, 'UPDATE', :diff_json, :changed_by, NOW())
+                INSERT INTO audit_log (table_name, row_pk, row_id, action, diff_json, changed_by, changed_at)
+                VALUES ('formulas', :row_pk, :row_id, 'UPDATE', :diff_json, :changed_by, NOW())
             """), {
                 "row_pk": str(new_formula_id),
+                "row_id": new_formula_id,
                 "diff_json": json.dumps(audit_diff),
                 "changed_by": user_id
             })
         
+        # Committed: drop the compiled formulas cached by every worker
+        invalidate_formulas()
+        
         return jsonify(
             ok=True,
             message='Formula updated successfully',
             old_version=old_version,
-            new_version=new_version
+            new_version=new_version,
+            recompute=recompute[0] if recompute else None,
+            recompute_downstream=recompute[1:]
         ), 200
         
     except Exception as e:
         print(f"❌ Error updating formula: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify(ok=False, error='Failed to update formula'), 500
\ No newline at end of file
+        return jsonify(ok=False, error='Failed to update formula'), 500
+
+@bp.post("/formulas/recompute/<formula_key>")
+def recompute_formula(formula_key):
+    """Re-apply the current version of a formula, then the formulas downstream of it, to every
+    stored row of its form. ?dry_run=1 returns the diff summaries without writing anything"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+    
+    dry_run = request.args.get('dry_run') in ('1', 'true')
+    
+    try:
+        with SessionLocal() as s, s.begin():
+            formula = active_formulas(s).get(formula_key)
+            if not formula:
+                return jsonify(ok=False, error='Formula not found'), 404
+            
+            recompute = recompute_chain(s, formula, formula_graph(s, formula.form), dry_run=dry_run)
+            if recompute is None:
+                return jsonify(ok=False, error=f'{formula_key} does not fill a stored column'), 400
+        
+        return jsonify(ok=True, recompute=recompute[0], recompute_downstream=recompute[1:]), 200
+        
+    except Exception as e:
+        print(f"❌ Error recomputing formula {formula_key}: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to recompute formula'), 500
+
+@bp.post("/formulas/simulate")
+def simulate_formula_change():
+    """What-if for the Formula Manager: evaluate a candidate expression for formula_key against
+    every stored row of its form and report how the values would move. Nothing is written.
+    JSON body: {formula_key, expression, top_n?}"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+    
+    data = request.get_json(silent=True) or {}
+    formula_key = data.get('formula_key')
+    expression = data.get('expression')
+    if not formula_key or not expression:
+        return jsonify(ok=False, error='formula_key and expression are required'), 400
+    try:
+        top_n = min(max(int(data.get('top_n', SIMULATION_TOP_PARTNERS)), 1), 100)
+    except (TypeError, ValueError):
+        return jsonify(ok=False, error='top_n must be a number'), 400
+    
+    try:
+        with SessionLocal() as s:
+            current = active_formulas(s).get(formula_key)
+            if not current:
+                return jsonify(ok=False, error='Formula not found'), 404
+            
+            try:
+                candidate = CompiledFormula(None, formula_key, current.version + 1, expression)
+                graph = formula_graph(s, candidate.form, replace=candidate)
+            except FormulaError as e:
+                return jsonify(ok=False, error=str(e)), 400
+            
+            simulation = simulate_formula(s, candidate, graph, top_n=top_n)
+            if simulation is None:
+                return jsonify(ok=False, error=f'{formula_key} does not fill a stored column'), 400
+        
+        simulation['current_expression'] = current.expression
+        return jsonify(ok=True, simulation=simulation), 200
+        
+    except Exception as e:
+        print(f"❌ Error simulating formula {formula_key}: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to simulate formula'), 500
+
+# Rows one /formulas/evaluate-as-of call may evaluate
+AS_OF_MAX_ROWS = 10000
+
+@bp.post("/formulas/evaluate-as-of")
+def evaluate_formulas_as_of():
+    """Reproduce historical figures: evaluate rows under the formula versions that were in effect
+    at a given moment (the timeline in formula_engine, one binary search per formula, no query per row).
+    JSON body: {form, as_of?, rows: [{field: value, ..., as_of?}]}
+           or  {form, as_of?, investment_ids: [...]} for stored rows, which default to their
+               created_at and come back with their stored values for comparison"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+    
+    data = request.get_json(silent=True) or {}
+    form = data.get('form')
+    if form not in FORM_TABLES:
+        return jsonify(ok=False, error=f"form must be one of: {', '.join(FORM_TABLES)}"), 400
+    rows = data.get('rows')
+    investment_ids = data.get('investment_ids')
+    if not isinstance(rows, list) and not isinstance(investment_ids, list):
+        return jsonify(ok=False, error='rows or investment_ids is required'), 400
+    if len(rows or investment_ids) > AS_OF_MAX_ROWS:
+        return jsonify(ok=False, error=f'At most {AS_OF_MAX_ROWS} rows per call'), 400
+    
+    try:
+        as_of = _parse_since(data.get('as_of'))
+        if isinstance(rows, list):
+            if not all(isinstance(row, dict) for row in rows):
+                return jsonify(ok=False, error='rows must be objects'), 400
+            times = [_parse_since(row.get('as_of')) or as_of for row in rows]
+    except (TypeError, ValueError):
+        return jsonify(ok=False, error='as_of must be an ISO timestamp'), 400
+    
+    fields = FORM_FIELDS[form]
+    try:
+        with SessionLocal() as s:
+            stored = None
+            if not isinstance(rows, list):
+                try:
+                    ids = [int(i) for i in investment_ids]
+                except (TypeError, ValueError):
+                    return jsonify(ok=False, error='investment_ids must be numbers'), 400
+                found = {}
+                if ids:
+                    query = text(f"""
+                        SELECT investment_id, created_at, {', '.join(fields)}
+                        FROM {FORM_TABLES[form]}
+                        WHERE investment_id IN :ids
+                    """).bindparams(bindparam('ids', expanding=True))
+                    found = {row.investment_id: row for row in s.execute(query, {'ids': ids})}
+                missing = [i for i in ids if i not in found]
+                if missing:
+                    return jsonify(ok=False, error=f'Entries not found: {missing[:20]}'), 404
+                stored = [{field: None if found[i]._mapping[field] is None else float(found[i]._mapping[field])
+                           for field in fields} for i in ids]
+                rows = stored
+                times = [as_of or found[i].created_at for i in ids]
+            
+            if any(when is None for when in times):
+                return jsonify(ok=False, error='as_of is required'), 400
+            
+            inputs = [{field: row.get(field) for field in fields} for row in rows]
+            values, versions = formula_timeline(s).evaluate(form, inputs, times)
+        
+        results = []
+        for i, (row_values, used) in enumerate(zip(values, versions)):
+            result = {'as_of': times[i].isoformat() if hasattr(times[i], 'isoformat') else str(times[i]),
+                      'values': row_values, 'versions': used}
+            if stored is not None:
+                result['investment_id'] = ids[i]
+                result['stored'] = stored[i]
+            results.append(result)
+        
+        return jsonify(ok=True, form=form, results=results), 200
+        
+    except Exception as e:
+        print(f"❌ Error evaluating {form} formulas as of a date: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to evaluate formulas'), 500
+
+# ============================================
+# CSV EXPORT
+# Streams straight from a server-side cursor, so memory stays flat no
+# matter how big the table is
+# ============================================
+
+EXPORT_FLUSH_ROWS = 500
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+@bp.get("/<listing>/export.csv")
+def export_listing_csv(listing):
+    """Download a whole table (matching, profit, ivl, entry, conversion) as CSV.
+    Accepts the same filters as the JSON listing (?since=, ?q=, ?year=...) and applies the same role rules"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    spec = LISTINGS.get(listing)
+    if not spec:
+        return jsonify(ok=False, error=f'Unknown table: {listing}'), 404
+
+    try:
+        since = _parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify(ok=False, error='Invalid since cursor'), 400
+
+    conditions, params = _listing_filters(listing, user_id, role, since, request.args)
+    columns = spec['export_columns']
+    query = (
+        "SELECT " + ", ".join(f"{expr} AS {name}" for name, expr in columns)
+        + " FROM " + spec['from']
+        + _where(conditions)
+        + " ORDER BY " + spec['order_by']
+    )
+
+    def generate():
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([name for name, _ in columns])
+        exported = 0
+        try:
+            with SessionLocal() as s:
+                result = s.execute(text(query), params, execution_options={"stream_results": True})
+                for row in result:
+                    writer.writerow([_csv_value(v) for v in row])
+                    exported += 1
+                    if exported % EXPORT_FLUSH_ROWS == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate(0)
+            yield buffer.getvalue()
+            print(f"✅ Exported {exported} rows from {spec['table']}")
+        except Exception as e:
+            # Headers are already sent: re-raise so the server aborts the response and the
+            # client sees a failed download instead of a complete-looking, truncated CSV
+            print(f"❌ Error exporting {spec['table']} after {exported} rows: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+
+    filename = f"{spec['table']}_{datetime.now().strftime('%Y-%m-%d')}.csv"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+# ============================================
+# SEARCH
+# Ranked full-text search across all data tables (FULLTEXT indexes,
+# see migrations/002_fulltext_search.sql)
+# ============================================
+
+SEARCH_MAX_RESULTS = 200
+
+def _fulltext_terms(raw):
+    """Free text -> BOOLEAN MODE query: every word required, prefix-matched ("coop san" -> "+coop* +san*")"""
+    words = re.findall(r"\w+", raw or "", re.UNICODE)
+    return " ".join(f"+{w}*" for w in words)
+
+@bp.get("/search")
+def search():
+    """Search partners by name, community, municipality and comments.
+    ?q=<text>&tables=matching,profit,...&limit=50 - returns hits ranked by relevance"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    q = (request.args.get('q') or '').strip()
+    terms = _fulltext_terms(q)
+    if not terms:
+        return jsonify(ok=True, query=q, hits=[], took_ms=0), 200
+
+    tables = [t.strip() for t in (request.args.get('tables') or '').split(',') if t.strip()] or list(LISTINGS)
+    unknown = [t for t in tables if t not in LISTINGS]
+    if unknown:
+        return jsonify(ok=False, error=f"Unknown table: {', '.join(unknown)}"), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), SEARCH_MAX_RESULTS)
+    except ValueError:
+        return jsonify(ok=False, error='Invalid limit'), 400
+
+    params = {"q": terms, "limit": limit}
+    parts = []
+    for name in tables:
+        spec = LISTINGS[name]
+        match = f"MATCH({', '.join(spec['search_columns'])}) AGAINST(:q IN BOOLEAN MODE)"
+        conditions, table_params = _listing_filters(name, user_id, role)
+        conditions.append(match)
+        params.update(table_params)
+        parts.append(f"""
+            SELECT '{name}' AS source, '{spec['table']}' AS table_name,
+                   {spec['id_column']} AS id, {spec['label_column']} AS label,
+                   {match} AS score
+            FROM {spec['table']} {spec['alias']}{_where(conditions)}
+        """)
+    query = "(" + ") UNION ALL (".join(parts) + ") ORDER BY score DESC LIMIT :limit"
+
+    try:
+        started = time.perf_counter()
+        with SessionLocal() as s:
+            rows = s.execute(text(query), params).fetchall()
+        took_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        hits = [{
+            'source': row.source,
+            'table': row.table_name,
+            'id': row.id,
+            'label': row.label,
+            'score': float(row.score)
+        } for row in rows]
+
+        return jsonify(ok=True, query=q, hits=hits, took_ms=took_ms), 200
+
+    except Exception as e:
+        print(f"❌ Error searching for '{q}': {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(ok=False, error='Search failed'), 500
@@ -86,17 +86,18 @@
   // ============================================
   // SEARCH FUNCTIONALITY
   // ============================================
-  function filterEntries(searchTerm) {
-    const filtered = allEntries.filter(entry => {
-      const term = searchTerm.toLowerCase();
-      return (
-        (entry.partner_name || '').toLowerCase().includes(term) ||
-        (entry.comments || '').toLowerCase().includes(term) ||
-        (entry.created_by || '').toLowerCase().includes(term) ||
-        (entry.updated_by || '').toLowerCase().includes(term)
-      );
-    });
-    displayEntries(filtered);
+  function filterParams() {
+    const params = new URLSearchParams();
+    const searchTerm = document.getElementById('ivl-search')?.value.trim() || '';
+    if (searchTerm) params.set('q', searchTerm);
+    return params;
+  }
+
+  // Filtering runs on the server; debounce so typing doesn't fire a request per key
+  let filterTimer = null;
+  function filterEntries() {
+    clearTimeout(filterTimer);
+    filterTimer = setTimeout(() => loadEntries(), 250);
   }
 
   // ============================================
@@ -108,51 +109,8 @@
       return;
     }
 
-    // CSV Headers
-    const headers = [
-      'Partner Name',
-      'Expected Profit %',
-      'Investment Amount (L.)',
-      'Last Loan (L.)',
-      'Difference (L.)',
-      'Comments',
-      'Date Entered',
-      'Created By',
-      'Last Edited',
-      'Last Edited By'
-    ];
-
-    // CSV Rows
-    const rows = allEntries.map(entry => {
-      return [
-        entry.partner_name || '',
-        entry.expected_profit_pct || '',
-        entry.investment_amount || '',
-        entry.last_loan || '',
-        entry.difference || '',
-        (entry.comments || '').replace(/"/g, '""'), // Escape quotes
-        entry.created_at || '',
-        entry.created_by || '',
-        entry.updated_at || '',
-        entry.updated_by || ''
-      ].map(val => `"${val}"`).join(',');
-    });
-
-    // Combine headers and rows
-    const csv = [headers.join(','), ...rows].join('\n');
-
-    // Create download
-    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
-    const link = document.createElement('a');
-    const url = URL.createObjectURL(blob);
-    link.setAttribute('href', url);
-    link.setAttribute('download', `ivl_entries_${new Date().toISOString().split('T')[0]}.csv`);
-    link.style.visibility = 'hidden';
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
-
-    showBanner('success', 'CSV downloaded successfully!', '¡CSV descargado correctamente!');
+    // Streamed by the server with the same search as the table
+    window.location.href = `${API_BASE}/api/equity/ivl/export.csv?${filterParams()}`;
   }
 
   // ============================================
@@ -194,6 +152,52 @@
     showBanner('success', 'CSV template downloaded!', '¡Plantilla CSV descargada!');
   }
 
+  // ============================================
+  // BULK CSV UPLOAD - BACKGROUND JOB POLLING
+  // ============================================
+  // Polls the import job until it finishes and returns { status, json }
+  // shaped like the synchronous bulk-upload response
+  async function waitForImportJob(statusUrl, onProgress) {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+
+      const resp = await fetch(`${API_BASE}${statusUrl}`, { credentials: 'include' });
+      const json = await resp.json();
+      if (!resp.ok || !json.ok) {
+        return { status: resp.status, json };
+      }
+
+      const job = json.job;
+      if (job.status === 'SUCCEEDED') {
+        return {
+          status: 200,
+          json: {
+            ok: true,
+            message: job.message,
+            uploaded_count: job.rows_inserted + job.rows_updated + job.rows_unchanged
+          }
+        };
+      }
+      if (job.status === 'FAILED' && job.error_count) {
+        return {
+          status: 400,
+          json: {
+            ok: false,
+            error: job.message,
+            validation_errors: job.validation_errors,
+            valid_count: job.rows_validated - job.error_count,
+            invalid_count: job.error_count
+          }
+        };
+      }
+      if (job.status === 'FAILED' || job.status === 'CANCELLED') {
+        return { status: 500, json: { ok: false, error: job.message } };
+      }
+
+      if (onProgress) onProgress(job);
+    }
+  }
+
   // ============================================
   // CSV BULK UPLOAD FUNCTIONALITY - ALL OR NOTHING
   // ============================================
@@ -210,15 +214,28 @@
     formData.append('csv_file', file);
 
     try {
-      const resp = await fetch(`${API_BASE}/api/equity/ivl/bulk-upload`, {
+      const resp = await fetch(`${API_BASE}/api/equity/ivl/bulk-upload?async=1`, {
         method: 'POST',
         body: formData,
         credentials: 'include'
       });
 
-      const json = await resp.json();
+      let status = resp.status;
+      let json = await resp.json();
+
+      // Large files are processed by a background job; poll it until it finishes
+      if (status === 202 && json.status_url) {
+        ({ status, json } = await waitForImportJob(json.status_url, (job) => {
+          const msg = job.status === 'INSERTING' && job.rows_total
+            ? [`Uploading records... ${job.rows_inserted} of ${job.rows_total}`,
+               `Subiendo registros... ${job.rows_inserted} de ${job.rows_total}`]
+            : [`Validating CSV file... ${job.rows_validated} rows checked`,
+               `Validando archivo CSV... ${job.rows_validated} filas revisadas`];
+          showBanner('success', msg[0], msg[1]);
+        }));
+      }
 
-      if (!resp.ok || !json.ok) {
+      if (status !== 200 || !json.ok) {
         // Handle validation errors
         if (json.validation_errors && json.validation_errors.length > 0) {
           const errorList = json.validation_errors
@@ -242,14 +259,13 @@
 
       // Success - all records passed validation and were added
       const successMsg = window.currentLang === 'es'
-        ? `✅ ¡Éxito! Se agregaron ${json.entries_created} registro(s) correctamente. Todos los registros pasaron la validación.`
-        : `✅ Success! ${json.entries_created} record(s) have been successfully added. All records passed validation.`;
+        ? `✅ ¡Éxito! Se agregaron ${json.uploaded_count} registro(s) correctamente. Todos los registros pasaron la validación.`
+        : `✅ Success! ${json.uploaded_count} record(s) have been successfully added. All records passed validation.`;
       
       showBanner('success', successMsg, successMsg);
 
       // Reload entries and summary
       await loadEntries();
-      await loadSummary();
 
     } catch (err) {
       console.error('Error uploading CSV:', err);
@@ -269,7 +285,10 @@
       tableNoData.style.display = 'none';
       entriesTable.style.display = 'none';
 
-      const resp = await fetch(`${API_BASE}/api/equity/ivl/entries`, {
+      const params = filterParams();
+      params.set('include_summary', '1');
+
+      const resp = await fetch(`${API_BASE}/api/equity/ivl/entries?${params}`, {
         credentials: 'include'  // Send session cookies
       });
       const json = await resp.json();
@@ -283,6 +302,7 @@
 
       allEntries = json.entries || [];
       displayEntries(allEntries);
+      renderSummary(json.summary || {});
 
     } catch (err) {
       console.error('Error loading entries:', err);
@@ -349,39 +369,17 @@
   }
 
   // ============================================
-  // LOAD SUMMARY
+  // RENDER SUMMARY (RETURNED WITH THE LISTING, FOR THE CURRENT SEARCH)
   // ============================================
-  async function loadSummary() {
+  function renderSummary(summary) {
     if (!summaryLoading || !summaryContent) return;
 
-    try {
-      summaryLoading.style.display = 'block';
-      summaryContent.style.display = 'none';
+    if (totalInvestmentEl) totalInvestmentEl.textContent = formatCurrency(summary.total_investment || 0);
+    if (totalLastLoanEl) totalLastLoanEl.textContent = formatCurrency(summary.total_last_loan || 0);
+    if (totalDifferenceEl) totalDifferenceEl.textContent = formatCurrency(summary.total_difference || 0);
 
-      const resp = await fetch(`${API_BASE}/api/equity/ivl/summary`, {
-        credentials: 'include'  // Send session cookies
-      });
-      const json = await resp.json();
-
-      if (!json.ok) {
-        console.error('Failed to load summary:', json.error);
-        summaryLoading.innerHTML = '<p style="color: #e74c3c;">Failed to load summary</p>';
-        return;
-      }
-
-      const summary = json.summary || {};
-      
-      if (totalInvestmentEl) totalInvestmentEl.textContent = formatCurrency(summary.total_investment || 0);
-      if (totalLastLoanEl) totalLastLoanEl.textContent = formatCurrency(summary.total_last_loan || 0);
-      if (totalDifferenceEl) totalDifferenceEl.textContent = formatCurrency(summary.total_difference || 0);
-
-      summaryLoading.style.display = 'none';
-      summaryContent.style.display = 'grid';
-
-    } catch (err) {
-      console.error('Error loading summary:', err);
-      summaryLoading.innerHTML = '<p style="color: #e74c3c;">Network error</p>';
-    }
+    summaryLoading.style.display = 'none';
+    summaryContent.style.display = 'grid';
   }
 
   // ============================================
@@ -428,7 +426,6 @@
         showBanner('success', 'Entry submitted successfully!', '¡Solicitud enviada correctamente!');
         form.reset();
         loadEntries();
-        loadSummary();
       }
     } catch (err) {
       console.error(err);
@@ -516,7 +513,6 @@
         showBanner('success', 'Entry updated successfully!', '¡Entrada actualizada correctamente!');
         closeEditModal();
         loadEntries();
-        loadSummary();
       }
     } catch (err) {
       console.error('Error updating entry:', err);
@@ -547,7 +543,6 @@
       } else {
         showBanner('success', 'Entry deleted successfully!', '¡Entrada eliminada correctamente!');
         loadEntries();
-        loadSummary();
       }
     } catch (err) {
       console.error('Error deleting entry:', err);
@@ -575,9 +570,7 @@
   // ============================================
   const searchInput = document.getElementById('ivl-search');
   if (searchInput) {
-    searchInput.addEventListener('input', (e) => {
-      filterEntries(e.target.value);
-    });
+    searchInput.addEventListener('input', filterEntries);
   }
 
   // ============================================
@@ -626,7 +619,6 @@
   // INITIALIZE
   // ============================================
   loadEntries();
-  loadSummary();
 })();
 
 // Initialize autosave
@@ -103,15 +103,13 @@
   }
 
   // ============================================
-  // UPDATE STATISTICS (FOR FILTERED ENTRIES)
+  // UPDATE STATISTICS (SUMMARY FOR THE FILTERED ENTRIES, FROM THE SERVER)
   // ============================================
-  function updateStats(entries) {
-    const totalEntries = entries.length;
-    const totalInvestmentL = entries.reduce((sum, e) => sum + (parseFloat(e.investment_l) || 0), 0);
-    const totalInvestmentUSD = entries.reduce((sum, e) => sum + (parseFloat(e.investment_usd) || 0), 0);
-    const avgProfit = entries.length > 0 
-      ? entries.reduce((sum, e) => sum + (parseFloat(e.expected_profit_pct) || 0), 0) / entries.length 
-      : 0;
+  function updateStats(summary) {
+    const totalEntries = summary.total_entries || 0;
+    const totalInvestmentL = summary.total_investment_l || 0;
+    const totalInvestmentUSD = summary.total_investment_usd || 0;
+    const avgProfit = summary.avg_expected_profit || 0;
 
     document.getElementById('stat-total-entries').textContent = totalEntries.toLocaleString();
     document.getElementById('stat-investment-l').textContent = 
@@ -124,36 +122,25 @@
   // ============================================
   // SEARCH AND FILTER FUNCTIONALITY
   // ============================================
-  function filterEntries() {
-    const searchTerm = document.getElementById('search-input')?.value.toLowerCase() || '';
+  function filterParams() {
+    const params = new URLSearchParams();
+    const searchTerm = document.getElementById('search-input')?.value.trim() || '';
     const yearFilter = document.getElementById('year-filter')?.value || '';
     const proposalFilter = document.getElementById('proposal-filter')?.value || '';
     const transactionFilter = document.getElementById('transaction-filter')?.value || '';
-    
-    filteredEntries = allEntries.filter(entry => {
-      // Text search across multiple fields
-      const matchesSearch = 
-        (entry.partner_name || '').toLowerCase().includes(searchTerm) ||
-        (entry.bank_id || '').toLowerCase().includes(searchTerm) ||
-        (entry.comments || '').toLowerCase().includes(searchTerm) ||
-        (entry.technician || '').toLowerCase().includes(searchTerm) ||
-        (entry.created_by || '').toLowerCase().includes(searchTerm) ||
-        (entry.updated_by || '').toLowerCase().includes(searchTerm);
-      
-      // Filter by year
-      const matchesYear = !yearFilter || entry.year?.toString() === yearFilter;
-      
-      // Filter by proposal state
-      const matchesProposal = !proposalFilter || entry.proposal_state === proposalFilter;
-      
-      // Filter by transaction type
-      const matchesTransaction = !transactionFilter || entry.transaction_type === transactionFilter;
-      
-      return matchesSearch && matchesYear && matchesProposal && matchesTransaction;
-    });
 
-    renderTable(filteredEntries);
-    updateStats(filteredEntries);
+    if (searchTerm) params.set('q', searchTerm);
+    if (yearFilter) params.set('year', yearFilter);
+    if (proposalFilter) params.set('proposal_state', proposalFilter);
+    if (transactionFilter) params.set('transaction_type', transactionFilter);
+    return params;
+  }
+
+  // Filtering runs on the server; debounce so typing doesn't fire a request per key
+  let filterTimer = null;
+  function filterEntries() {
+    clearTimeout(filterTimer);
+    filterTimer = setTimeout(() => loadEntries(), 250);
   }
 
   // ============================================
@@ -230,7 +217,11 @@
       tableNoData.style.display = 'none';
       entriesTable.style.display = 'none';
 
-      const resp = await fetch(`${API_BASE}/api/equity/profit/entries`, {
+      const params = filterParams();
+      const filtersActive = params.toString() !== '';
+      params.set('include_summary', '1');
+
+      const resp = await fetch(`${API_BASE}/api/equity/profit/entries?${params}`, {
         credentials: 'include'
       });
       const json = await resp.json();
@@ -244,7 +235,8 @@
       }
 
       allEntries = json.entries || [];
-      filteredEntries = [...allEntries];
+      filteredEntries = allEntries;
+      updateStats(json.summary || {});
       
       if (allEntries.length === 0) {
         tableNoData.textContent = window.currentLang === 'es' ? 'No se encontraron entradas' : 'No entries found';
@@ -252,9 +244,11 @@
         return;
       }
 
-      populateFilters();
+      // Dropdown options come from the unfiltered list so they don't shrink as filters apply
+      if (!filtersActive) {
+        populateFilters();
+      }
       renderTable(filteredEntries);
-      updateStats(filteredEntries);
       entriesTable.style.display = 'table';
 
       // If highlighting specific ID, scroll to it
@@ -297,61 +291,8 @@
   // DOWNLOAD CSV FUNCTIONALITY
   // ============================================
   function downloadCSV() {
-    const headers = [
-      'Partner Name', 'Bank ID', 'Year', 'Technician', 'Profit (L)', 'Expected %',
-      'Company Value (L)', 'Investment (L)', 'Investment ($)', 'Exchange Rate',
-      'Proposal State', 'Transaction Type',
-      'Jan (L)', 'Feb (L)', 'Mar (L)', 'Apr (L)', 'May (L)', 'Jun (L)',
-      'Jul (L)', 'Aug (L)', 'Sep (L)', 'Oct (L)', 'Nov (L)', 'Dec (L)',
-      'Business Category', 'Company Type',
-      'Community', 'Municipality', 'State', 'Comments', 'Last Edited By', 'Last Edited'
-    ];
-
-    const rows = filteredEntries.map(entry => [
-      entry.partner_name || '',
-      entry.bank_id || '',
-      entry.year || '',
-      entry.technician || '',
-      entry.profit_l || '',
-      entry.expected_profit_pct || '',
-      entry.company_value_l || '',
-      entry.investment_l || '',
-      entry.investment_usd || '',
-      entry.exchange_rate || '',
-      entry.proposal_state || '',
-      entry.transaction_type || '',
-      entry.january_l || 0,
-      entry.february_l || 0,
-      entry.march_l || 0,
-      entry.april_l || 0,
-      entry.may_l || 0,
-      entry.june_l || 0,
-      entry.july_l || 0,
-      entry.august_l || 0,
-      entry.september_l || 0,
-      entry.october_l || 0,
-      entry.november_l || 0,
-      entry.december_l || 0,
-      entry.business_category || '',
-      entry.company_type || '',
-      entry.community || '',
-      entry.municipality || '',
-      entry.state || '',
-      entry.comments || '',
-      entry.updated_by || entry.created_by || '',
-      formatDateTime(entry.updated_at || entry.created_at)
-    ]);
-
-    const csvContent = [
-      headers.join(','),
-      ...rows.map(row => row.map(cell => `"${String(cell).replace(/"/g, '""')}"`).join(','))
-    ].join('\n');
-
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-    const link = document.createElement('a');
-    link.href = URL.createObjectURL(blob);
-    link.download = `profit_entries_${new Date().toISOString().split('T')[0]}.csv`;
-    link.click();
+    // Streamed by the server with the same filters as the table
+    window.location.href = `${API_BASE}/api/equity/profit/export.csv?${filterParams()}`;
   }
 
   if (downloadCsvBtn) {
@@ -481,6 +422,52 @@
     }
   }
 
+  // ============================================
+  // BULK CSV UPLOAD - BACKGROUND JOB POLLING
+  // ============================================
+  // Polls the import job until it finishes and returns { status, json }
+  // shaped like the synchronous bulk-upload response
+  async function waitForImportJob(statusUrl, onProgress) {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+
+      const resp = await fetch(`${API_BASE}${statusUrl}`, { credentials: 'include' });
+      const json = await resp.json();
+      if (!resp.ok || !json.ok) {
+        return { status: resp.status, json };
+      }
+
+      const job = json.job;
+      if (job.status === 'SUCCEEDED') {
+        return {
+          status: 200,
+          json: {
+            ok: true,
+            message: job.message,
+            uploaded_count: job.rows_inserted + job.rows_updated + job.rows_unchanged
+          }
+        };
+      }
+      if (job.status === 'FAILED' && job.error_count) {
+        return {
+          status: 400,
+          json: {
+            ok: false,
+            error: job.message,
+            validation_errors: job.validation_errors,
+            valid_count: job.rows_validated - job.error_count,
+            invalid_count: job.error_count
+          }
+        };
+      }
+      if (job.status === 'FAILED' || job.status === 'CANCELLED') {
+        return { status: 500, json: { ok: false, error: job.message } };
+      }
+
+      if (onProgress) onProgress(job);
+    }
+  }
+
   // ============================================
   // BULK CSV UPLOAD - UPLOAD FUNCTION (ALL-OR-NOTHING)
   // ============================================
@@ -503,13 +490,27 @@
       progressBar.style.width = '50%';
       progressText.textContent = 'Uploading and validating records...';
 
-      const resp = await fetch(`${API_BASE}/api/equity/profit/bulk-upload`, {
+      const resp = await fetch(`${API_BASE}/api/equity/profit/bulk-upload?async=1`, {
         method: 'POST',
         body: formData,
         credentials: 'include'
       });
 
-      const json = await resp.json();
+      let status = resp.status;
+      let json = await resp.json();
+
+      // Large files are processed by a background job; poll it until it finishes
+      if (status === 202 && json.status_url) {
+        ({ status, json } = await waitForImportJob(json.status_url, (job) => {
+          if (job.status === 'INSERTING' && job.rows_total) {
+            progressBar.style.width = `${75 + Math.round(25 * job.rows_inserted / job.rows_total)}%`;
+            progressText.textContent = `Uploading records... ${job.rows_inserted} of ${job.rows_total}`;
+          } else {
+            progressBar.style.width = '60%';
+            progressText.textContent = `Validating records... ${job.rows_validated} checked`;
+          }
+        }));
+      }
 
       progressBar.style.width = '100%';
       progressText.textContent = 'Complete!';
@@ -519,7 +520,7 @@
       }, 1000);
 
       // Handle successful upload (all records passed validation and were inserted)
-      if (resp.ok && json.ok) {
+      if (status === 200 && json.ok) {
         const uploadedCount = json.uploaded_count || 0;
         
         showUploadResult(
@@ -533,7 +534,7 @@
         
       } 
       // Handle validation failures (no records were inserted)
-      else if (resp.status === 400 && json.validation_errors) {
+      else if (status === 400 && json.validation_errors) {
         const validCount = json.valid_count || 0;
         const invalidCount = json.invalid_count || 0;
         const totalCount = validCount + invalidCount;
@@ -610,8 +611,8 @@
     uploadCsvInput.addEventListener('change', (e) => {
       const file = e.target.files[0];
       if (file) {
-        if (!file.name.endsWith('.csv')) {
-          alert('Please select a CSV file');
+        if (!/\.(csv|xlsx)$/i.test(file.name)) {
+          alert('Please select a CSV or Excel (.xlsx) file');
           return;
         }
         uploadCSV(file);
@@ -0,0 +1,651 @@
+"""
+Formula engine for the expressions in the formulas table
+(e.g. profit_investment_l = company_value_l * (expected_profit_pct / 100)).
+Expressions are parsed once with Python's ast module, checked against a
+whitelist (numbers, field names, + - * / and parentheses, which is all the
+Formula Builder can produce) and compiled to bytecode. Compiled formulas are
+cached by (formula_id, version); a formula row never changes once written,
+update_formula inserts a new version instead.
+The same compiled function evaluates one row (plain floats) or a whole
+batch (NumPy arrays), with the browser's evaluateFormula semantics:
+a missing or non-numeric input counts as 0, and a result that is not a
+finite number (e.g. division by zero) is None.
+Within a form, formulas chain: the field one fills is an input of another
+(profit_l -> company_value_l -> investment_l -> investment_usd). FormulaGraph
+keeps that DAG, rejects cycles and gives the evaluation order.
+FormulaTimeline indexes every version by its validity interval, so a row can
+be evaluated under the formulas in effect at any past moment.
+recompute_derived() re-applies a formula to every stored row of its form,
+vectorised, when the formula changes; fill_derived() does the same for the
+blank derived cells of a bulk import.
+"""
+
+import ast
+import hashlib
+import json
+import math
+import os
+import pathlib
+import time
+from collections import deque
+
+import numpy as np
+from sqlalchemy import text
+
+# Fields a formula may read (the Formula Builder's AVAILABLE_VARIABLES)
+FORMULA_VARIABLES = ('profit_l', 'expected_profit_pct', 'company_value_l', 'investment_l', 'exchange_rate')
+MAX_EXPRESSION_LENGTH = 500
+
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+                  ast.Add, ast.Sub, ast.Mult, ast.Div, ast.UAdd, ast.USub)
+
+# Form prefix of a formula_key -> table holding its rows
+FORM_TABLES = {'profit': 'profit_form_entries', 'matching': 'matching_equity_entries'}
+# Columns a formula may write (decimal(18,2) in both tables)
+DERIVED_COLUMNS = ('company_value_l', 'investment_l', 'investment_usd')
+RECOMPUTE_CHUNK_SIZE = 500
+RECOMPUTE_SAMPLE_SIZE = 20
+
+# Touched by invalidate_formulas() so every gunicorn worker reloads the active set
+FORMULA_STAMP = pathlib.Path(__file__).parent / "formula-cache.stamp"
+
+
+class FormulaError(ValueError):
+    """An expression that isn't a valid formula; the message is shown to the admin"""
+
+
+# ============================================
+# PARSE AND COMPILE
+# ============================================
+
+def parse_formula(expression):
+    """(validated AST, variables in first-use order). Raises FormulaError"""
+    expression = (expression or '').strip()
+    if not expression:
+        raise FormulaError('Expression is required')
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise FormulaError(f'Expression is too long (max {MAX_EXPRESSION_LENGTH} characters)')
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        raise FormulaError(f"'{expression}' is not a valid formula. Check the operators and parentheses.")
+
+    variables = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise FormulaError('Formulas can only use numbers, fields, + - * / and parentheses')
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise FormulaError(f'Unsupported value in formula: {node.value!r}')
+            # Evaluation is in floats (NumPy float64 for batches): an int past ~1e308 overflows there
+            try:
+                finite = math.isfinite(node.value)
+            except OverflowError:
+                finite = False
+            if not finite:
+                raise FormulaError('Numbers in a formula must be finite and below 1e308')
+        if isinstance(node, ast.Name):
+            if node.id not in FORMULA_VARIABLES:
+                raise FormulaError(f"Unknown field '{node.id}'. Available fields: {', '.join(FORMULA_VARIABLES)}")
+            if node.id not in variables:
+                variables.append(node.id)
+    return tree, variables
+
+
+class CompiledFormula:
+    """One version of one formula, compiled to a function of its input fields"""
+
+    def __init__(self, formula_id, formula_key, version, expression):
+        tree, variables = parse_formula(expression)
+        self.formula_id = formula_id
+        self.formula_key = formula_key
+        self.version = version
+        self.expression = expression
+        self.variables = tuple(variables)
+        # e.g. profit_investment_usd -> form 'profit', field 'investment_usd'
+        self.form, _, self.field = formula_key.partition('_')
+        # The AST is whitelisted above, so the lambda can only do arithmetic on its arguments
+        source = f"lambda {', '.join(self.variables)}: ({ast.unparse(tree.body)})"
+        self._fn = eval(compile(source, f"<formula {formula_key} v{version}>", 'eval'), {'__builtins__': {}})
+
+    def __repr__(self):
+        return f"<CompiledFormula {self.formula_key} v{self.version}: {self.expression}>"
+
+    def evaluate(self, row):
+        """Value for one row (a dict, or row._mapping for a DB row). None when the result isn't a finite number"""
+        try:
+            result = float(self._fn(*(_number(row.get(name)) for name in self.variables)))
+        except (ZeroDivisionError, OverflowError):
+            return None
+        return result if np.isfinite(result) else None
+
+    def evaluate_rows(self, rows):
+        return [self.evaluate(row) for row in rows]
+
+    def evaluate_arrays(self, columns):
+        """Vectorised evaluation: columns maps each input field to a float array (NaN = missing).
+        Returns a float array with NaN where the result isn't a finite number"""
+        args = [np.nan_to_num(np.asarray(columns[name], dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+                for name in self.variables]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            result = np.asarray(self._fn(*args), dtype=np.float64)
+        if result.ndim == 0:
+            # A formula without fields: broadcast the constant
+            result = np.full(len(next(iter(columns.values()), ())), float(result))
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+def _number(value):
+    """JavaScript's parseFloat(value) || 0 for the values a row can hold"""
+    if value is None or value == '':
+        return 0.0
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if np.isfinite(number) else 0.0
+
+
+# ============================================
+# CACHES
+# ============================================
+
+_compiled = {}              # (formula_id, version) -> CompiledFormula
+_active = {'stamp': None, 'formulas': None, 'graphs': {}, 'forms': {}}
+_timeline = {'stamp': None, 'timeline': None}
+
+def compile_formula(formula_id, formula_key, version, expression):
+    """CompiledFormula for a formula row, compiled at most once per process"""
+    key = (formula_id, version)
+    formula = _compiled.get(key)
+    if formula is None:
+        formula = _compiled[key] = CompiledFormula(formula_id, formula_key, version, expression)
+    return formula
+
+def validate_expression(expression):
+    """Raise FormulaError if expression can't be saved as a formula"""
+    parse_formula(expression)
+
+def _stamp():
+    try:
+        return FORMULA_STAMP.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def invalidate_formulas():
+    """Call after changing the formulas table: every worker reloads the active set on next use"""
+    tmp_path = FORMULA_STAMP.with_suffix('.tmp')
+    tmp_path.write_text(str(os.getpid()))
+    os.replace(tmp_path, FORMULA_STAMP)
+    _active.update(formulas=None, graphs={}, forms={})
+    _timeline.update(timeline=None)
+
+def active_formulas(s):
+    """{formula_key: CompiledFormula} for the current version of every formula.
+    Loaded with session s and kept until invalidate_formulas() runs in any worker.
+    A stored expression that doesn't compile is logged and left out"""
+    stamp = _stamp()
+    if _active['formulas'] is not None and _active['stamp'] == stamp:
+        return _active['formulas']
+
+    formulas = {}
+    rows = s.execute(text("""
+        SELECT formula_id, formula_key, expression, version
+        FROM formulas
+        WHERE effective_to IS NULL
+    """)).fetchall()
+    for row in rows:
+        try:
+            formulas[row.formula_key] = compile_formula(row.formula_id, row.formula_key, row.version, row.expression)
+        except FormulaError as e:
+            print(f"⚠️ Formula {row.formula_key} v{row.version} skipped: {e}")
+
+    _active.update(stamp=stamp, formulas=formulas, graphs={}, forms={})
+    return formulas
+
+def formulas_for_form(s, form):
+    """{target field: CompiledFormula} for one form ('profit', 'matching')"""
+    return {f.field: f for f in active_formulas(s).values() if f.form == form}
+
+def form_formulas(session_factory, form):
+    """(formulas, etag) for the entry forms: formulas is {field: {formula_key, expression}} for
+    one form, etag a hash of it. A hit costs one stat() of the stamp file; session_factory is
+    only opened to reload after invalidate_formulas().
+    None for a form that is neither in FORM_TABLES nor the prefix of an active formula, so
+    arbitrary names from the URL don't grow the cache"""
+    if _active['stamp'] == _stamp() and form in _active['forms']:
+        return _active['forms'][form]
+
+    with session_factory() as s:
+        if form not in FORM_TABLES and all(f.form != form for f in active_formulas(s).values()):
+            return None
+        formulas = {field: {'formula_key': f.formula_key, 'expression': f.expression}
+                    for field, f in sorted(formulas_for_form(s, form).items())}
+    etag = hashlib.sha1(json.dumps(formulas, sort_keys=True).encode()).hexdigest()[:20]
+    _active['forms'][form] = (formulas, etag)
+    return formulas, etag
+
+def formula_graph(s, form, replace=None):
+    """FormulaGraph of a form's active formulas. replace: a CompiledFormula standing in for
+    the active version of its key (a formula about to be saved); raises FormulaError if it
+    would close a cycle"""
+    formulas = formulas_for_form(s, form)
+    if replace is not None:
+        formulas[replace.field] = replace
+        return FormulaGraph(formulas.values())
+
+    graphs = _active['graphs']
+    if form not in graphs:
+        try:
+            graphs[form] = FormulaGraph(formulas.values())
+        except FormulaError as e:
+            # Only reachable with rows written outside update_formula
+            print(f"⚠️ {form} formulas not recalculated: {e}")
+            graphs[form] = FormulaGraph(())
+    return graphs[form]
+
+
+# ============================================
+# DEPENDENCIES
+# ============================================
+
+class FormulaGraph:
+    """Dependency DAG of one form's formulas: an edge runs from the formula filling a field
+    to every formula reading that field. Raises FormulaError if the formulas form a cycle"""
+
+    def __init__(self, formulas):
+        self.by_field = {f.field: f for f in formulas}
+        self.readers = {}           # field -> formulas with it as an input
+        for formula in self.by_field.values():
+            for name in formula.variables:
+                self.readers.setdefault(name, []).append(formula)
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        # Kahn's algorithm over the inputs that another formula fills
+        pending = {field: sum(1 for name in f.variables if name in self.by_field)
+                   for field, f in self.by_field.items()}
+        ready = deque(field for field, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            field = ready.popleft()
+            order.append(self.by_field[field])
+            for reader in self.readers.get(field, ()):
+                pending[reader.field] -= 1
+                if pending[reader.field] == 0:
+                    ready.append(reader.field)
+
+        if len(order) < len(self.by_field):
+            remaining = [field for field, count in pending.items() if count]
+            raise FormulaError(f"Circular reference between formulas: {' -> '.join(self._cycle(remaining))}")
+        return order
+
+    def _cycle(self, remaining):
+        """One cycle among the fields Kahn's algorithm couldn't order, in evaluation direction.
+        Each of them still waits on an input from the set, so walking inputs must loop"""
+        path = [remaining[0]]
+        while True:
+            formula = self.by_field[path[-1]]
+            field = next(name for name in formula.variables if name in remaining)
+            if field in path:
+                cycle = path[path.index(field):] + [field]
+                return list(reversed(cycle))
+            path.append(field)
+
+    @property
+    def inputs(self):
+        """Every field some formula reads"""
+        return tuple(self.readers)
+
+    def downstream(self, fields):
+        """Formulas to re-evaluate, in evaluation order, when fields change"""
+        affected = set()
+        stack = list(fields)
+        while stack:
+            for reader in self.readers.get(stack.pop(), ()):
+                if reader.field not in affected:
+                    affected.add(reader.field)
+                    stack.append(reader.field)
+        return [f for f in self.order if f.field in affected]
+
+    def recalculate(self, row, changed):
+        """Re-evaluate on row (a dict, updated in place) only the formulas downstream of the
+        changed fields. Like the entry forms, a field only takes a positive result (rounded
+        to 2 places). Returns {field: new value}"""
+        updated = {}
+        for formula in self.downstream(changed):
+            value = formula.evaluate(row)
+            if value is not None and value > 0:
+                row[formula.field] = updated[formula.field] = round(value, 2)
+        return updated
+
+
+# ============================================
+# FILL IMPORTED ROWS
+# ============================================
+
+def _import_column(rows, name):
+    """One field of the import rows as float64, blank -> NaN"""
+    return np.fromiter((np.nan if row.get(name) in (None, '') else _number(row.get(name)) for row in rows),
+                       dtype=np.float64, count=len(rows))
+
+def _apply_formulas(order, rows, only_blank=False):
+    """Evaluate formulas (in the given dependency order) over rows, a list of dicts updated in
+    place, one array pass per formula so each result feeds the formulas after it. A field only
+    takes a positive result (rounded to 2 places); only_blank: and only where it was blank.
+    Formulas whose field the rows don't have are skipped. Returns {field: rows set}"""
+    columns = {}
+    def column(name):
+        if name not in columns:
+            columns[name] = _import_column(rows, name)
+        return columns[name]
+
+    applied = {}
+    for formula in order:
+        if formula.field not in rows[0]:
+            continue
+        current = column(formula.field)
+        target = np.isnan(current) if only_blank else np.ones(len(rows), dtype=bool)
+        if not target.any():
+            continue
+        new = np.round(formula.evaluate_arrays({name: column(name) for name in formula.variables}), 2)
+        target &= np.isfinite(new) & (new > 0)
+        for i in np.flatnonzero(target).tolist():
+            rows[i][formula.field] = float(new[i])
+        current[target] = new[target]
+        if target.any():
+            applied[formula.field] = int(target.sum())
+    return applied
+
+def fill_derived(s, form, rows):
+    """Give the derived fields a bulk upload left blank the value the entry form would compute.
+    rows are the insert dicts; the form's active formulas run once each over all of them, in
+    dependency order, so a filled company_value_l feeds investment_l in the same pass. Values
+    the file provides are kept, and like the form a field only takes a positive result.
+    Returns {field: rows filled}"""
+    graph = formula_graph(s, form)
+    if not rows:
+        return {}
+
+    filled = _apply_formulas(graph.order, rows, only_blank=True)
+    if filled:
+        print(f"  🧮 Filled blank {form} fields from the active formulas: "
+              + ", ".join(f"{field} x{count}" for field, count in filled.items()))
+    return filled
+
+
+# ============================================
+# RECOMPUTE STORED ROWS
+# ============================================
+
+def _float_column(rows, index):
+    """One result column as float64, NULL -> NaN"""
+    return np.fromiter((np.nan if row[index] is None else float(row[index]) for row in rows),
+                       dtype=np.float64, count=len(rows))
+
+def _evaluate_stored(s, formula, pending=None):
+    """Evaluate formula over every stored row of its form's table.
+    Returns (table, rows, ids, old, new, writable, changed_idx), or None when the formula
+    doesn't target a stored column. new is rounded to the column's 2 places; writable marks
+    the rows the entry forms would fill (positive results), changed_idx those that differ
+    from the stored value"""
+    table = FORM_TABLES.get(formula.form)
+    column = formula.field
+    if table is None or column not in DERIVED_COLUMNS:
+        return None
+
+    columns = list(dict.fromkeys(formula.variables + (column,)))
+    rows = s.execute(text(f"""
+        SELECT investment_id, partner_name, {', '.join(columns)} FROM {table} ORDER BY investment_id
+    """)).fetchall()
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    data = {name: _float_column(rows, i + 2) for i, name in enumerate(columns)}
+    if pending:
+        data.update((name, values) for name, values in pending.items() if name in formula.variables)
+
+    old = data[column]
+    new = np.round(formula.evaluate_arrays(data), 2)
+    writable = np.isfinite(new) & (new > 0)
+    changed_idx = np.flatnonzero(writable & (np.isnan(old) | (np.abs(new - old) >= 0.005)))
+    if pending is not None:
+        pending[column] = np.where(writable, new, old)
+    return table, rows, ids, old, new, writable, changed_idx
+
+def _diff_summary(formula, evaluated, dry_run, started):
+    table, rows, ids, old, new, writable, changed_idx = evaluated
+    delta = np.where(np.isnan(old[changed_idx]), new[changed_idx], new[changed_idx] - old[changed_idx])
+    largest = changed_idx[np.argsort(-np.abs(delta), kind='stable')[:RECOMPUTE_SAMPLE_SIZE]]
+    return {
+        'formula_key': formula.formula_key,
+        'version': formula.version,
+        'table': table,
+        'column': formula.field,
+        'dry_run': dry_run,
+        'rows_scanned': len(rows),
+        'rows_changed': len(changed_idx),
+        'rows_unchanged': int(writable.sum()) - len(changed_idx),
+        'rows_skipped': int((~writable).sum()),
+        'total_before': round(float(np.nansum(old[changed_idx])), 2),
+        'total_after': round(float(new[changed_idx].sum()), 2),
+        'max_change': round(float(np.abs(delta).max()), 2) if len(delta) else 0.0,
+        'largest_changes': [
+            {'investment_id': int(ids[i]),
+             'partner_name': rows[i][1],
+             'old': None if np.isnan(old[i]) else round(float(old[i]), 2),
+             'new': float(new[i])}
+            for i in largest.tolist()
+        ],
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+def recompute_derived(s, formula, dry_run=False, pending=None):
+    """Re-apply formula to every row of its form's table in session s.
+    Inputs are loaded as arrays, the formula runs once over all of them, and rows whose
+    rounded result differs from the stored value are written back RECOMPUTE_CHUNK_SIZE at a
+    time (one UPDATE ... CASE per chunk). Like the entry forms, a row is only given a value
+    when the result is a positive number; other rows are left alone and counted as skipped.
+    dry_run: compute the diff without writing. pending: {column: values} shared along a
+    chain (see recompute_chain), so a dry run reads the inputs an upstream formula would
+    have written. Returns the diff summary, or None when the formula doesn't target a
+    stored column"""
+    started = time.perf_counter()
+    evaluated = _evaluate_stored(s, formula, pending)
+    if evaluated is None:
+        return None
+    table, rows, ids, old, new, writable, changed_idx = evaluated
+    column = formula.field
+
+    if not dry_run:
+        for start in range(0, len(changed_idx), RECOMPUTE_CHUNK_SIZE):
+            chunk = changed_idx[start:start + RECOMPUTE_CHUNK_SIZE]
+            params = {}
+            cases = []
+            for n, i in enumerate(chunk.tolist()):
+                params[f"id{n}"] = int(ids[i])
+                params[f"v{n}"] = float(new[i])
+                cases.append(f"WHEN :id{n} THEN :v{n}")
+            s.execute(text(f"""
+                UPDATE {table}
+                SET {column} = CASE investment_id {' '.join(cases)} END
+                WHERE investment_id IN ({', '.join(f':id{n}' for n in range(len(chunk)))})
+            """), params)
+
+    summary = _diff_summary(formula, evaluated, dry_run, started)
+    print(f"  🔁 {formula.formula_key} v{formula.version}: {summary['rows_changed']} of {len(rows)} "
+          f"{table}.{column} values {'would change' if dry_run else 'updated'} in {summary['seconds']}s")
+    return summary
+
+def recompute_chain(s, formula, graph, dry_run=False):
+    """recompute_derived for formula, then for every formula downstream of it in graph, in
+    evaluation order. Returns the summaries, or None when formula doesn't target a stored column"""
+    pending = {}
+    first = recompute_derived(s, formula, dry_run, pending)
+    if first is None:
+        return None
+    summaries = [first]
+    for downstream in graph.downstream([formula.field]):
+        summary = recompute_derived(s, downstream, dry_run, pending)
+        if summary is not None:
+            summaries.append(summary)
+    return summaries
+
+
+# ============================================
+# WHAT-IF SIMULATION
+# ============================================
+
+SIMULATION_TOP_PARTNERS = 10
+_PERCENTILES = (0, 25, 50, 75, 100)
+
+def _distribution(values):
+    """min / quartiles / max / mean / sum of the non-NaN values"""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    stats = dict(zip(('min', 'p25', 'median', 'p75', 'max'),
+                     (round(float(v), 2) for v in np.percentile(values, _PERCENTILES))))
+    stats.update(count=len(values), mean=round(float(values.mean()), 2), sum=round(float(values.sum()), 2))
+    return stats
+
+def _partner_deltas(rows, changed_idx, delta, top_n):
+    """The top_n partners by absolute total change"""
+    if not len(changed_idx):
+        return []
+    partners = np.array([rows[i][1] or '' for i in changed_idx.tolist()], dtype=object)
+    names, inverse = np.unique(partners, return_inverse=True)
+    totals = np.bincount(inverse, weights=delta, minlength=len(names))
+    counts = np.bincount(inverse, minlength=len(names))
+    top = np.argsort(-np.abs(totals), kind='stable')[:top_n]
+    return [{'partner_name': names[i] or None, 'rows_changed': int(counts[i]),
+             'total_change': round(float(totals[i]), 2)} for i in top.tolist()]
+
+def simulate_formula(s, formula, graph, top_n=SIMULATION_TOP_PARTNERS):
+    """What saving formula (a candidate CompiledFormula) would do to the stored rows, without
+    writing: old vs new distribution of its column, the size of the changes and the partners
+    most affected, plus a dry-run summary for each formula downstream of it in graph.
+    Returns None when formula doesn't target a stored column"""
+    started = time.perf_counter()
+    pending = {}
+    evaluated = _evaluate_stored(s, formula, pending)
+    if evaluated is None:
+        return None
+    table, rows, ids, old, new, writable, changed_idx = evaluated
+
+    delta = np.where(np.isnan(old[changed_idx]), new[changed_idx], new[changed_idx] - old[changed_idx])
+    simulation = _diff_summary(formula, evaluated, True, started)
+    simulation.update(
+        sum_change=round(float(delta.sum()), 2),
+        rows_increased=int((delta > 0).sum()),
+        rows_decreased=int((delta < 0).sum()),
+        distribution={'old': _distribution(old), 'new': _distribution(np.where(writable, new, old))},
+        top_partners=_partner_deltas(rows, changed_idx, delta, top_n),
+        downstream=[summary for downstream in graph.downstream([formula.field])
+                    if (summary := recompute_derived(s, downstream, dry_run=True, pending=pending))]
+    )
+    simulation['seconds'] = round(time.perf_counter() - started, 3)
+    print(f"  🧪 Simulated {formula.formula_key} = {formula.expression}: {simulation['rows_changed']} of "
+          f"{len(rows)} rows would change in {simulation['seconds']}s")
+    return simulation
+
+
+# ============================================
+# AS-OF EVALUATION
+# ============================================
+
+# Fields each form's table stores that formulas read or fill
+FORM_FIELDS = {
+    'profit': FORMULA_VARIABLES + ('investment_usd',),
+    'matching': ('expected_profit_pct', 'investment_l', 'exchange_rate', 'investment_usd'),
+}
+_OPEN_END = np.datetime64('9999-12-31T23:59:59', 'us')
+
+class FormulaTimeline:
+    """Every version of every formula as sorted validity intervals [effective_from, effective_to),
+    so finding the version in effect at a moment is a binary search"""
+
+    def __init__(self, versions):
+        """versions: (CompiledFormula, effective_from, effective_to) sorted by effective_from"""
+        by_key = {}
+        for formula, start, end in versions:
+            by_key.setdefault(formula.formula_key, []).append((formula, start, end))
+        self.formulas = {key: [formula for formula, _, _ in entries] for key, entries in by_key.items()}
+        self._starts = {key: np.array([start for _, start, _ in entries], dtype='datetime64[us]')
+                        for key, entries in by_key.items()}
+        self._ends = {key: np.array([_OPEN_END if end is None else end for _, _, end in entries], dtype='datetime64[us]')
+                      for key, entries in by_key.items()}
+
+    def version_indexes(self, formula_key, times):
+        """Index into self.formulas[formula_key] of the version in effect at each of times
+        (a datetime64 array), -1 where none was"""
+        starts = self._starts[formula_key]
+        index = np.searchsorted(starts, times, side='right') - 1
+        in_effect = index >= 0
+        in_effect[in_effect] = times[in_effect] < self._ends[formula_key][index[in_effect]]
+        index[~in_effect] = -1
+        return index
+
+    def at(self, formula_key, when):
+        """The CompiledFormula in effect at when, or None"""
+        if formula_key not in self.formulas:
+            return None
+        index = self.version_indexes(formula_key, np.array([when], dtype='datetime64[us]'))[0]
+        return self.formulas[formula_key][index] if index >= 0 else None
+
+    def evaluate(self, form, rows, times):
+        """Evaluate each row (a dict of the form's fields) under the form's formula versions in
+        effect at its time. Rows sharing a set of versions are evaluated together, as arrays.
+        Returns (values, versions): per row, a copy of the row with the derived fields
+        recalculated, and {formula_key: version used}"""
+        keys = sorted(key for key in self.formulas if key.partition('_')[0] == form)
+        times = np.array(times, dtype='datetime64[us]')
+        indexes = [self.version_indexes(key, times) for key in keys]
+
+        groups = {}
+        for i, signature in enumerate(zip(*indexes) if keys else [()] * len(rows)):
+            groups.setdefault(signature, []).append(i)
+
+        values = [dict(row) for row in rows]
+        versions = [None] * len(rows)
+        for signature, members in groups.items():
+            formulas = [self.formulas[key][index] for key, index in zip(keys, signature) if index >= 0]
+            used = {formula.formula_key: formula.version for formula in formulas}
+            try:
+                order = FormulaGraph(formulas).order
+            except FormulaError:
+                # Only reachable with versions written outside update_formula
+                order = formulas
+            group = [values[i] for i in members]
+            for row in group:
+                for formula in order:
+                    row.setdefault(formula.field, None)
+            _apply_formulas(order, group)
+            for i in members:
+                versions[i] = used
+        return values, versions
+
+def formula_timeline(s):
+    """FormulaTimeline of every formula version, loaded with session s and kept until
+    invalidate_formulas() runs in any worker. A version that doesn't compile is left out"""
+    stamp = _stamp()
+    if _timeline['timeline'] is not None and _timeline['stamp'] == stamp:
+        return _timeline['timeline']
+
+    versions = []
+    rows = s.execute(text("""
+        SELECT formula_id, formula_key, expression, version, effective_from, effective_to
+        FROM formulas
+        WHERE effective_from IS NOT NULL
+        ORDER BY effective_from, version
+    """)).fetchall()
+    for row in rows:
+        try:
+            formula = compile_formula(row.formula_id, row.formula_key, row.version, row.expression)
+        except FormulaError as e:
+            print(f"⚠️ Formula {row.formula_key} v{row.version} left out of the timeline: {e}")
+            continue
+        versions.append((formula, row.effective_from, row.effective_to))
+
+    timeline = FormulaTimeline(versions)
+    _timeline.update(stamp=stamp, timeline=timeline)
+    return timeline
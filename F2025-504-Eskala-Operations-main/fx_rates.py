@@ -8,59 +8,136 @@ from flask import Blueprint, request, jsonify
 from sqlalchemy import text
 from db import SessionLocal
 from datetime import datetime
+import bisect
 import json
+import os
+import pathlib
 
 bp = Blueprint("fx_rates", __name__, url_prefix="/api/fx-rates")
 
+# ============================================
+# IN-PROCESS RATE CACHE
+# Every fx_rates validity window, per currency pair, sorted by valid_from,
+# so /current and /rate-at-date are a binary search in memory instead of
+# a query. update_rate touches FX_CACHE_STAMP after committing; each
+# gunicorn worker checks its mtime on lookup and reloads when it moved.
+# ============================================
+
+FX_CACHE_STAMP = pathlib.Path(__file__).parent / "fx-cache.stamp"
+_rate_cache = {'stamp': None, 'pairs': None}
+
+class RateHistory:
+    """One currency pair's rates, sorted by valid_from (then fx_rate_id)"""
+
+    def __init__(self, rates):
+        self.rates = rates
+        self.starts = [rate['valid_from'] for rate in rates]
+        # /current: the open-ended rate with the latest valid_from
+        self.current = next((rate for rate in reversed(rates) if rate['valid_to'] is None), None)
+
+    def at(self, when):
+        """The rate valid at when: the latest valid_from <= when whose window is still open at when.
+        Normally the first candidate; a window closed before its own start (a back-dated update) is skipped"""
+        i = bisect.bisect_right(self.starts, when) - 1
+        while i >= 0:
+            rate = self.rates[i]
+            if rate['valid_to'] is None or rate['valid_to'] > when:
+                return rate
+            i -= 1
+        return None
+
+def _stamp():
+    try:
+        return FX_CACHE_STAMP.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def invalidate_rates():
+    """Call after changing fx_rates: every worker reloads the rate history on next lookup"""
+    tmp_path = FX_CACHE_STAMP.with_suffix('.tmp')
+    tmp_path.write_text(str(os.getpid()))
+    os.replace(tmp_path, FX_CACHE_STAMP)
+    _rate_cache['pairs'] = None
+
+def _currency(code):
+    """Currency codes compare like the old SQL lookup (case-insensitive collation): 'hnl ' is HNL"""
+    return str(code).strip().upper()
+
+def rate_history(from_curr, to_curr):
+    """RateHistory for a currency pair (None if it has no rates), reloading all pairs
+    in one query when the cache is empty or stale"""
+    # One read of the cache: invalidate_rates() may set it to None from another thread at any time
+    pairs, stamp = _rate_cache['pairs'], _stamp()
+    if pairs is None or _rate_cache['stamp'] != stamp:
+        with SessionLocal() as s:
+            rows = s.execute(text("""
+                SELECT fx_rate_id, from_currency, to_currency, rate, valid_from, valid_to
+                FROM fx_rates
+                ORDER BY from_currency, to_currency, valid_from, fx_rate_id
+            """)).fetchall()
+        grouped = {}
+        for row in rows:
+            grouped.setdefault((_currency(row.from_currency), _currency(row.to_currency)), []).append(dict(row._mapping))
+        pairs = {pair: RateHistory(rates) for pair, rates in grouped.items()}
+        _rate_cache.update(stamp=stamp, pairs=pairs)
+        print(f"💱 FX rate cache loaded: {len(rows)} rates, {len(grouped)} currency pairs")
+    return pairs.get((_currency(from_curr), _currency(to_curr)))
+
+def warm_rate_cache():
+    """Load the rate history at startup so the first form load doesn't pay for it"""
+    try:
+        rate_history('HNL', 'USD')
+    except Exception as e:
+        # The database may not be up yet; the first lookup loads it instead
+        print(f"⚠️ FX rate cache not preloaded: {e}")
+
+def _parse_rate_date(date_str):
+    """'YYYY-MM-DD HH:MM:SS', ISO 8601 with a 'T' (optional Z/offset) or a bare 'YYYY-MM-DD'
+    (start of that day). Returns a naive datetime: windows are stored that way, and the SQL
+    lookup ignored the offset too. Raises ValueError"""
+    if 'T' in date_str:
+        when = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    elif len(date_str) == 10:
+        when = datetime.strptime(date_str, '%Y-%m-%d')
+    else:
+        when = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+    return when.replace(tzinfo=None)
+
+def _rate_json(rate):
+    return {
+        'fx_rate_id': rate['fx_rate_id'],
+        'from_currency': rate['from_currency'],
+        'to_currency': rate['to_currency'],
+        'rate': str(rate['rate']),
+        'valid_from': rate['valid_from'].isoformat() if rate['valid_from'] else None,
+        'valid_to': rate['valid_to'].isoformat() if rate['valid_to'] else None
+    }
+
 # ============================================
 # GET CURRENT EXCHANGE RATE
 # ============================================
 
 @bp.get("/current")
 def get_current_rate():
-    """Get the current active exchange rate for HNL to USD"""
+    """Get the current active exchange rate for HNL to USD (from the in-process rate cache)"""
     try:
-        with SessionLocal() as s:
-            row = s.execute(text("""
-                SELECT 
-                    fx_rate_id,
-                    from_currency,
-                    to_currency,
-                    rate,
-                    valid_from,
-                    valid_to
-                FROM fx_rates
-                WHERE from_currency = 'HNL'
-                  AND to_currency = 'USD'
-                  AND valid_to IS NULL
-                ORDER BY valid_from DESC
-                LIMIT 1
-            """)).fetchone()
-            
-            if not row:
-                # Return default rate if none exists
-                return jsonify(
-                    success=True,
-                    rate={
-                        'from_currency': 'HNL',
-                        'to_currency': 'USD',
-                        'rate': '25.2500',
-                        'valid_from': datetime.now().isoformat(),
-                        'valid_to': None
-                    }
-                ), 200
-            
+        history = rate_history('HNL', 'USD')
+        rate = history.current if history else None
+        
+        if not rate:
+            # Return default rate if none exists
             return jsonify(
                 success=True,
                 rate={
-                    'fx_rate_id': row.fx_rate_id,
-                    'from_currency': row.from_currency,
-                    'to_currency': row.to_currency,
-                    'rate': str(row.rate),
-                    'valid_from': row.valid_from.isoformat() if row.valid_from else None,
-                    'valid_to': row.valid_to.isoformat() if row.valid_to else None
+                    'from_currency': 'HNL',
+                    'to_currency': 'USD',
+                    'rate': '25.2500',
+                    'valid_from': datetime.now().isoformat(),
+                    'valid_to': None
                 }
             ), 200
+        
+        return jsonify(success=True, rate=_rate_json(rate)), 200
             
     except Exception as e:
         print(f"ERROR in get_current_rate: {e}")
@@ -131,8 +208,8 @@ def get_history():
                     al.changed_by,
                     al.changed_at,
                     al.diff_json,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.reason')) as reason,
-                    JSON_UNQUOTE(JSON_EXTRACT(al.diff_json, '$.changed_by_username')) as changed_by_username
+                    al.change_reason as reason,
+                    al.changed_by_username
                 FROM fx_rates curr
                 LEFT JOIN fx_rates prev ON 
                     curr.from_currency = prev.from_currency
@@ -140,7 +217,7 @@ def get_history():
                     AND prev.valid_to = curr.valid_from
                 LEFT JOIN audit_log al ON 
                     al.table_name = 'fx_rates'
-                    AND CAST(al.row_pk AS CHAR) = CAST(curr.fx_rate_id AS CHAR)
+                    AND al.row_id = curr.fx_rate_id
                     AND al.action = 'INSERT'
                 WHERE curr.from_currency = 'HNL' 
                   AND curr.to_currency = 'USD'
@@ -292,13 +369,17 @@ def update_rate():
             }
             
             s.execute(text("""
-                INSERT INTO audit_log (table_name, row_pk, action, diff_json, changed_by, changed_at)
-                VALUES ('fx_rates', :row_pk, 'INSERT', :diff_json, :changed_by, NOW())
+                INSERT INTO audit_log (table_name, row_pk, row_id, action, diff_json, changed_by, changed_at)
+                VALUES ('fx_rates', :row_pk, :row_id, 'INSERT', :diff_json, :changed_by, NOW())
             """), {
                 "row_pk": str(new_rate_id),
+                "row_id": new_rate_id,
                 "diff_json": json.dumps(audit_diff),
                 "changed_by": user_id
             })
+        
+        # Committed: every worker reloads its rate cache
+        invalidate_rates()
             
         return jsonify(
             success=True,
@@ -326,7 +407,7 @@ def update_rate():
 
 @bp.get("/rate-at-date")
 def get_rate_at_date():
-    """Get the exchange rate that was valid at a specific date"""
+    """Get the exchange rate that was valid at a specific date (from the in-process rate cache)"""
     from_curr = request.args.get('from', 'HNL')
     to_curr = request.args.get('to', 'USD')
     date_str = request.args.get('date')
@@ -335,56 +416,109 @@ def get_rate_at_date():
         return jsonify(success=False, message='Date parameter is required'), 400
     
     try:
-        if 'T' in date_str:
-            query_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        else:
-            query_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+        query_date = _parse_rate_date(date_str)
     except ValueError:
         return jsonify(success=False, message='Invalid date format'), 400
     
     try:
-        with SessionLocal() as s:
-            row = s.execute(text("""
-                SELECT 
-                    fx_rate_id,
-                    from_currency,
-                    to_currency,
-                    rate,
-                    valid_from,
-                    valid_to
-                FROM fx_rates
-                WHERE from_currency = :from_curr
-                  AND to_currency = :to_curr
-                  AND valid_from <= :query_date
-                  AND (valid_to IS NULL OR valid_to > :query_date)
-                ORDER BY valid_from DESC
-                LIMIT 1
-            """), {
-                "from_curr": from_curr,
-                "to_curr": to_curr,
-                "query_date": query_date
-            }).fetchone()
-            
-            if not row:
-                return jsonify(
-                    success=False, 
-                    message='No exchange rate found for the specified date'
-                ), 404
-            
+        history = rate_history(from_curr, to_curr)
+        rate = history.at(query_date) if history else None
+        
+        if not rate:
             return jsonify(
-                success=True,
-                rate={
-                    'fx_rate_id': row.fx_rate_id,
-                    'from_currency': row.from_currency,
-                    'to_currency': row.to_currency,
-                    'rate': str(row.rate),
-                    'valid_from': row.valid_from.isoformat() if row.valid_from else None,
-                    'valid_to': row.valid_to.isoformat() if row.valid_to else None
-                }
-            ), 200
+                success=False, 
+                message='No exchange rate found for the specified date'
+            ), 404
+        
+        return jsonify(success=True, rate=_rate_json(rate)), 200
             
     except Exception as e:
         print(f"ERROR in get_rate_at_date: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify(success=False, error=str(e)), 500
\ No newline at end of file
+        return jsonify(success=False, error=str(e)), 500
+
+
+# ============================================
+# GET EXCHANGE RATES FOR MANY DATES
+# ============================================
+
+# Dates one /rates-at-dates call may resolve
+MAX_BATCH_DATES = 20000
+
+def _rates_for_sorted(history, dates):
+    """Rates valid at each of dates (ascending datetimes), in one merge pass over the
+    history's windows. None where no rate applies"""
+    rates = []
+    starts = history.starts
+    j = -1
+    for when in dates:
+        # Advance to the last window starting at or before this date
+        while j + 1 < len(starts) and starts[j + 1] <= when:
+            j += 1
+        rate = history.rates[j] if j >= 0 else None
+        if rate is not None and rate['valid_to'] is not None and rate['valid_to'] <= when:
+            # A window closed early (back-dated update): fall back to the bisect walk
+            rate = history.at(when)
+        rates.append(rate)
+    return rates
+
+@bp.post("/rates-at-dates")
+def get_rates_at_dates():
+    """Exchange rates valid at many dates in one call, e.g. to convert historical entries to USD.
+    JSON body: {"dates": [...], "from": "HNL", "to": "USD"}
+           or  {"items": [{"date": ..., "from": ..., "to": ...}, ...]} to mix currency pairs
+    (from/to default to the top-level values, then HNL/USD). Dates take the /rate-at-date formats
+    or a bare YYYY-MM-DD. Each pair's dates are sorted and merged against its rate history once.
+    Returns rates in input order; an item gets an error instead when its date is invalid or
+    no rate applies"""
+    data = request.get_json(silent=True) or {}
+    default_from = data.get('from', 'HNL')
+    default_to = data.get('to', 'USD')
+    
+    if isinstance(data.get('items'), list):
+        items = [item if isinstance(item, dict) else {'date': item} for item in data['items']]
+    elif isinstance(data.get('dates'), list):
+        items = [{'date': date_str} for date_str in data['dates']]
+    else:
+        return jsonify(success=False, message='dates or items (a list) is required'), 400
+    if len(items) > MAX_BATCH_DATES:
+        return jsonify(success=False, message=f'At most {MAX_BATCH_DATES} dates per call'), 400
+    
+    results = [None] * len(items)
+    by_pair = {}
+    for i, item in enumerate(items):
+        pair = (_currency(item.get('from') or default_from), _currency(item.get('to') or default_to))
+        date_str = item.get('date')
+        results[i] = {'date': date_str, 'from_currency': pair[0], 'to_currency': pair[1],
+                      'fx_rate_id': None, 'rate': None}
+        try:
+            when = _parse_rate_date(date_str)
+        except (TypeError, ValueError):
+            results[i]['error'] = 'Invalid date format'
+            continue
+        by_pair.setdefault(pair, []).append((when, i))
+    
+    try:
+        for pair, dated in by_pair.items():
+            history = rate_history(*pair)
+            if history is None:
+                for _, i in dated:
+                    results[i]['error'] = 'No exchange rate found for the specified date'
+                continue
+            dated.sort(key=lambda entry: entry[0])
+            rates = _rates_for_sorted(history, [when for when, _ in dated])
+            for (_, i), rate in zip(dated, rates):
+                if rate is None:
+                    results[i]['error'] = 'No exchange rate found for the specified date'
+                else:
+                    results[i].update(fx_rate_id=rate['fx_rate_id'], rate=str(rate['rate']))
+        
+        found = sum(1 for result in results if result['rate'] is not None)
+        return jsonify(success=True, rates=results, found=found, missing=len(results) - found), 200
+        
+    except Exception as e:
+        print(f"ERROR in get_rates_at_dates: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify(success=False, error=str(e)), 500
@@ -0,0 +1,304 @@
+"""
+Bulk Import Jobs - Flask Blueprint
+Runs matching / profit / IVL CSV uploads in a background worker process so
+large files don't hold a gunicorn worker (or hit its timeout). Progress lives
+in the import_jobs table, so any web worker can answer a status poll.
+Workers are spawned, not forked: a fresh interpreter inherits none of the
+web worker's threads, locks or pooled connections.
+"""
+
+import json
+import multiprocessing
+import os
+import pathlib
+import traceback
+
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+from db import SessionLocal
+from equity import (BULK_IMPORTS, require_auth, enable_validation_pool, shutdown_validation_pool,
+                    _bulk_import, _import_message)
+
+bp = Blueprint("import_jobs", __name__, url_prefix="/api/equity/import-jobs")
+
+# Not under uploads/, which is served publicly
+JOB_DIR = pathlib.Path(__file__).parent / "import-jobs"
+JOB_DIR.mkdir(exist_ok=True)
+
+ACTIVE_STATUSES = ('QUEUED', 'VALIDATING', 'INSERTING')
+# Validation errors kept on the job row (the parser already caps how many it collects)
+MAX_STORED_ERRORS = 500
+# Seconds after which a job that still has no worker never got one started
+WORKER_START_GRACE = 120
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+# ============================================
+# JOB STATE HELPERS
+# ============================================
+
+def _update_job(job_id, **fields):
+    """Set columns on a job row in its own short transaction, so pollers see it right away"""
+    assignments = ", ".join(f"{name} = :{name}" for name in fields)
+    with SessionLocal() as s, s.begin():
+        s.execute(text(f"UPDATE import_jobs SET {assignments} WHERE job_id = :job_id"),
+                  {**fields, "job_id": job_id})
+
+def _finish_job(job_id, status, message, **fields):
+    with SessionLocal() as s, s.begin():
+        assignments = "".join(f", {name} = :{name}" for name in fields)
+        s.execute(text(f"""
+            UPDATE import_jobs
+            SET status = :status, message = :message, finished_at = NOW(){assignments}
+            WHERE job_id = :job_id
+        """), {**fields, "status": status, "message": message, "job_id": job_id})
+
+def _cancel_requested(job_id):
+    with SessionLocal() as s:
+        return bool(s.execute(text("SELECT cancel_requested FROM import_jobs WHERE job_id = :job_id"),
+                              {"job_id": job_id}).scalar())
+
+def _worker_alive(pid):
+    """Is the worker process still running? A worker that was killed stays a zombie until
+    the web worker that started it reaps it, which counts as gone"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            return fh.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except OSError:
+        return True
+
+def _fail_orphaned_job(s, job):
+    """Mark an active job FAILED when its worker is gone (OOM kill, deploy, restart), so it
+    doesn't sit in VALIDATING/INSERTING forever. The insert runs in one transaction, so a
+    dead worker has written nothing. Returns True when the job was marked"""
+    if job.status not in ACTIVE_STATUSES or (job.worker_pid and _worker_alive(job.worker_pid)):
+        return False
+
+    # Only if the row still shows what was checked (the same worker, or none past the grace period)
+    result = s.execute(text(f"""
+        UPDATE import_jobs
+        SET status = 'FAILED', message = :message, rows_inserted = 0, finished_at = NOW()
+        WHERE job_id = :job_id
+          AND status IN ({', '.join(f"'{status}'" for status in ACTIVE_STATUSES)})
+          AND worker_pid <=> :worker_pid
+          AND (:worker_pid IS NOT NULL OR created_at < NOW() - INTERVAL {WORKER_START_GRACE} SECOND)
+    """), {"job_id": job.job_id, "worker_pid": job.worker_pid,
+           "message": 'The import stopped unexpectedly. No records were uploaded. Please try again.'})
+    if not result.rowcount:
+        return False
+    if job.file_path:
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+    print(f"⚠️ Import job {job.job_id}: worker {job.worker_pid or '(never started)'} is gone, marked FAILED")
+    return True
+
+
+# ============================================
+# START A JOB (called from the bulk-upload endpoints with ?async=1)
+# ============================================
+
+def start_import_job(kind, fsfile, user_id, mode='insert', sheet=None):
+    """Save the upload, record a QUEUED job and spawn a worker. Returns a 202 response with the job ID"""
+    # Reap workers that have already exited
+    multiprocessing.active_children()
+
+    with SessionLocal() as s, s.begin():
+        job_id = s.execute(text("""
+            INSERT INTO import_jobs (kind, mode, status, filename, created_by)
+            VALUES (:kind, :mode, 'QUEUED', :filename, :created_by)
+        """), {"kind": kind, "mode": mode, "filename": fsfile.filename, "created_by": user_id}).lastrowid
+
+    try:
+        suffix = '.xlsx' if fsfile.filename.lower().endswith('.xlsx') else '.csv'
+        path = JOB_DIR / f"{job_id}-{kind}{suffix}"
+        fsfile.save(path)
+
+        worker = multiprocessing.get_context('spawn').Process(
+            target=_run_job, args=(job_id, str(path), sheet), name=f"import-job-{job_id}"
+        )
+        worker.start()
+        _update_job(job_id, file_path=str(path), worker_pid=worker.pid)
+    except Exception as e:
+        print(f"❌ Could not start import job {job_id}: {e}")
+        traceback.print_exc()
+        _finish_job(job_id, 'FAILED', 'Could not start the import. Please try again.')
+        return jsonify(ok=False, error='Could not start import job'), 500
+
+    print(f"📤 Import job {job_id} ({kind}) started in worker {worker.pid}")
+    return jsonify(
+        ok=True,
+        job_id=job_id,
+        status='QUEUED',
+        status_url=f"/api/equity/import-jobs/{job_id}"
+    ), 202
+
+
+# ============================================
+# WORKER PROCESS
+# Same all-or-nothing rules as the synchronous upload: validate every row
+# first, then insert everything in one transaction
+# ============================================
+
+def _run_job(job_id, path, sheet=None):
+    enable_validation_pool()
+    try:
+        with SessionLocal() as s:
+            job = s.execute(text("SELECT kind, mode, created_by FROM import_jobs WHERE job_id = :job_id"),
+                            {"job_id": job_id}).fetchone()
+        spec = BULK_IMPORTS[job.kind]
+
+        # STEP 1: validate everything
+        _update_job(job_id, status='VALIDATING')
+
+        def validation_progress(rows_checked):
+            _update_job(job_id, rows_validated=rows_checked)
+            return not _cancel_requested(job_id)
+
+        with open(path, 'rb') as fh:
+            valid_records, validation_errors = spec['parse'](fh, progress=validation_progress, sheet=sheet)
+
+        if _cancel_requested(job_id):
+            raise ImportCancelled()
+
+        if validation_errors:
+            _finish_job(
+                job_id, 'FAILED',
+                f'Found {len(validation_errors)} validation error(s). No records were uploaded.',
+                rows_validated=len(valid_records) + len(validation_errors),
+                error_count=len(validation_errors),
+                errors_json=json.dumps(validation_errors[:MAX_STORED_ERRORS], default=str)
+            )
+            print(f"❌ Import job {job_id}: validation failed ({len(validation_errors)} errors)")
+            return
+
+        if not valid_records:
+            _finish_job(job_id, 'FAILED', 'No valid records found in CSV file')
+            return
+
+        # STEP 2: insert everything in a single transaction
+        _update_job(job_id, status='INSERTING', rows_validated=len(valid_records), rows_total=len(valid_records))
+
+        def insert_progress(rows_inserted):
+            _update_job(job_id, rows_inserted=rows_inserted)
+            if _cancel_requested(job_id):
+                raise ImportCancelled()
+
+        rows = spec['rows'](valid_records, job.created_by)
+        with SessionLocal() as s, s.begin():
+            counts = _bulk_import(s, job.kind, rows, job.mode, on_chunk=insert_progress)
+
+        _finish_job(job_id, 'SUCCEEDED', _import_message(job.mode, len(rows), counts),
+                    rows_inserted=counts['inserted'], rows_updated=counts['updated'],
+                    rows_unchanged=counts['unchanged'])
+        print(f"🎉 Import job {job_id}: {len(rows)} records uploaded")
+
+    except ImportCancelled:
+        _finish_job(job_id, 'CANCELLED', 'Import cancelled. No records were uploaded.', rows_inserted=0)
+        print(f"🛑 Import job {job_id} cancelled")
+    except Exception as e:
+        print(f"❌ Import job {job_id} failed: {e}")
+        traceback.print_exc()
+        _finish_job(job_id, 'FAILED',
+                    'An error occurred while uploading your CSV file. No records were uploaded.',
+                    rows_inserted=0)
+    finally:
+        shutdown_validation_pool()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ============================================
+# STATUS / CANCEL ENDPOINTS
+# ============================================
+
+def _load_visible_job(s, job_id, user_id, role):
+    job = s.execute(text("SELECT * FROM import_jobs WHERE job_id = :job_id"), {"job_id": job_id}).fetchone()
+    # Community reps only see their own jobs
+    if job and role == "COMMUNITY_REP" and job.created_by != user_id:
+        return None
+    return job
+
+@bp.get("/<int:job_id>")
+def get_import_job(job_id):
+    """Progress of a background import: status, rows validated/inserted, validation errors"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    try:
+        with SessionLocal() as s, s.begin():
+            job = _load_visible_job(s, job_id, user_id, role)
+            if job and _fail_orphaned_job(s, job):
+                job = _load_visible_job(s, job_id, user_id, role)
+        if not job:
+            return jsonify(ok=False, error='Import job not found'), 404
+
+        errors = job.errors_json
+        if isinstance(errors, str):
+            errors = json.loads(errors)
+
+        return jsonify(ok=True, job={
+            'job_id': job.job_id,
+            'kind': job.kind,
+            'mode': job.mode,
+            'status': job.status,
+            'filename': job.filename,
+            'rows_validated': job.rows_validated,
+            'rows_total': job.rows_total,
+            'rows_inserted': job.rows_inserted,
+            'rows_updated': job.rows_updated,
+            'rows_unchanged': job.rows_unchanged,
+            'error_count': job.error_count,
+            'validation_errors': errors or [],
+            'message': job.message,
+            'cancel_requested': bool(job.cancel_requested),
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'updated_at': job.updated_at.isoformat() if job.updated_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }), 200
+
+    except Exception as e:
+        print(f"❌ Error loading import job {job_id}: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to load import job'), 500
+
+@bp.post("/<int:job_id>/cancel")
+def cancel_import_job(job_id):
+    """Ask the worker to stop. It checks between validation batches and insert chunks and rolls back"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    try:
+        with SessionLocal() as s, s.begin():
+            job = _load_visible_job(s, job_id, user_id, role)
+            if not job:
+                return jsonify(ok=False, error='Import job not found'), 404
+            if _fail_orphaned_job(s, job):
+                return jsonify(ok=False, error='Import job already failed'), 409
+            if job.status not in ACTIVE_STATUSES:
+                return jsonify(ok=False, error=f'Import job already {job.status.lower()}'), 409
+
+            s.execute(text("UPDATE import_jobs SET cancel_requested = 1 WHERE job_id = :job_id"),
+                      {"job_id": job_id})
+
+        print(f"🛑 Cancel requested for import job {job_id}")
+        return jsonify(ok=True, message='Cancellation requested'), 202
+
+    except Exception as e:
+        print(f"❌ Error cancelling import job {job_id}: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Failed to cancel import job'), 500
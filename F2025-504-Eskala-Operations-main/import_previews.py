@@ -0,0 +1,250 @@
+"""
+Bulk Import Previews - Flask Blueprint
+Two-phase upload for the matching / profit / IVL bulk imports: the preview
+validates the file once and keeps the parsed records in a server-side cache
+under a token, the commit writes them without reading the file again.
+The cache is a directory of JSON files so every gunicorn worker sees it.
+"""
+
+import json
+import os
+import pathlib
+import re
+import secrets
+import time
+import traceback
+
+from flask import Blueprint, jsonify, request, session
+from chunked_uploads import request_file
+from db import SessionLocal
+from formula_engine import FORM_TABLES, fill_derived
+from equity import (BULK_IMPORTS, BULK_UPLOAD_EXTENSIONS, IMPORT_MODES, require_auth, _import_message,
+                    _timed_bulk_import)
+
+bp = Blueprint("import_previews", __name__, url_prefix="/api/equity/import-previews")
+
+# Not under uploads/, which is served publicly
+PREVIEW_DIR = pathlib.Path(__file__).parent / "import-previews"
+PREVIEW_DIR.mkdir(exist_ok=True)
+
+# Seconds a validated preview can still be committed
+IMPORT_PREVIEW_TTL = int(os.getenv("IMPORT_PREVIEW_TTL", 1800))
+PREVIEW_SAMPLE_ROWS = 20
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32}$")
+
+
+# ============================================
+# CACHE HELPERS
+# ============================================
+
+def _preview_path(token):
+    return PREVIEW_DIR / f"{token}.json"
+
+def _purge_expired():
+    """Drop previews (and commits that died half-way) older than the TTL"""
+    cutoff = time.time() - IMPORT_PREVIEW_TTL
+    for path in PREVIEW_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+def _save_preview(token, preview):
+    # Write then rename, so a reader never sees half a file
+    tmp_path = PREVIEW_DIR / f"{token}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(preview, fh, default=str)
+    os.replace(tmp_path, _preview_path(token))
+
+def _claim_preview(token, user_id, role):
+    """Take a preview out of the cache for a commit. Returns (preview, error_response).
+    The rename makes the claim atomic: two commits of the same token can't both insert"""
+    if not TOKEN_PATTERN.match(token or ""):
+        return None, (jsonify(ok=False, error='Import preview not found or expired'), 404)
+
+    path = _preview_path(token)
+    claimed = PREVIEW_DIR / f"{token}.committing"
+    try:
+        saved_at = path.stat().st_mtime
+        if time.time() - saved_at > IMPORT_PREVIEW_TTL:
+            path.unlink()
+            raise FileNotFoundError
+        os.rename(path, claimed)
+        # rename keeps the old mtime; restart it so _purge_expired can't take the file mid-commit
+        os.utime(claimed)
+    except FileNotFoundError:
+        return None, (jsonify(ok=False, error='Import preview not found or expired'), 404)
+
+    with open(claimed, encoding="utf-8") as fh:
+        preview = json.load(fh)
+    preview['claimed_path'] = str(claimed)
+    preview['saved_at'] = saved_at
+    # Community reps can only commit their own previews
+    if role == "COMMUNITY_REP" and preview['created_by'] != user_id:
+        _release_preview(preview, token)
+        return None, (jsonify(ok=False, error='Import preview not found or expired'), 404)
+    return preview, None
+
+def _release_preview(preview, token):
+    """Put a claimed preview back (the commit failed) so it can be retried until it expires"""
+    try:
+        os.utime(preview['claimed_path'], (preview['saved_at'], preview['saved_at']))
+        os.rename(preview['claimed_path'], _preview_path(token))
+    except OSError:
+        pass
+
+def _drop_claimed(preview):
+    """Delete a committed or discarded preview. It may already be gone (purged, or the
+    directory was cleared), which is fine: the work it stood for is done"""
+    try:
+        os.remove(preview['claimed_path'])
+    except OSError:
+        pass
+
+def _preview_stats(records):
+    """Row count, distinct partners and the columns left blank, for the preview screen"""
+    columns = list(records[0]) if records else []
+    blank_counts = {col: sum(1 for record in records if record.get(col) in (None, '')) for col in columns}
+    return {
+        'record_count': len(records),
+        'partner_count': len({(record.get('partner_name') or '').strip().lower() for record in records}),
+        'columns': columns,
+        'blank_counts': {col: count for col, count in blank_counts.items() if count}
+    }
+
+
+# ============================================
+# PREVIEW / COMMIT / DISCARD ENDPOINTS
+# ============================================
+
+@bp.post("/<kind>")
+def create_import_preview(kind):
+    """Validate an upload and cache its parsed records. Returns a token, stats and sample rows"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+    if kind not in BULK_IMPORTS:
+        return jsonify(ok=False, error=f"Unknown import type: {kind}"), 404
+
+    try:
+        file, file_error = request_file('csv_file', 'file')
+        if file_error:
+            return file_error
+        if not file or file.filename == '':
+            return jsonify(ok=False, error='No file provided'), 400
+        if not file.filename.lower().endswith(BULK_UPLOAD_EXTENSIONS):
+            return jsonify(ok=False, error='File must be a CSV or Excel (.xlsx) file'), 400
+
+        _purge_expired()
+        print(f"🔍 Import preview ({kind}) of {file.filename} by user {user_id}")
+        sheet = request.args.get('sheet') or None
+        valid_records, validation_errors = BULK_IMPORTS[kind]['parse'](file.stream, sheet=sheet)
+
+        if validation_errors:
+            return jsonify({
+                'ok': False,
+                'error': 'Validation failed',
+                'message': f'Found {len(validation_errors)} validation error(s). Fix them and preview again.',
+                'validation_errors': validation_errors,
+                'valid_count': len(valid_records),
+                'invalid_count': len(validation_errors)
+            }), 400
+        if not valid_records:
+            return jsonify(ok=False, error='No valid records found in CSV file'), 400
+
+        # Fill blank derived fields now, as the commit would, so the stats and sample rows show
+        # the values that will be stored. The cached records keep them: commit what was previewed
+        derived_filled = {}
+        if kind in FORM_TABLES:
+            with SessionLocal() as s:
+                derived_filled = fill_derived(s, kind, valid_records)
+
+        token = secrets.token_urlsafe(24)
+        _save_preview(token, {
+            'kind': kind,
+            'filename': file.filename,
+            'created_by': user_id,
+            'created_at': time.time(),
+            'records': valid_records
+        })
+        print(f"✅ Import preview {token[:8]}… cached: {len(valid_records)} records")
+
+        return jsonify({
+            'ok': True,
+            'token': token,
+            'kind': kind,
+            'filename': file.filename,
+            'expires_in': IMPORT_PREVIEW_TTL,
+            'stats': {**_preview_stats(valid_records), 'derived_filled': derived_filled},
+            'sample_rows': valid_records[:PREVIEW_SAMPLE_ROWS],
+            'commit_url': f"/api/equity/import-previews/{token}/commit"
+        }), 201
+
+    except Exception as e:
+        print(f"❌ Error previewing {kind} import: {e}")
+        traceback.print_exc()
+        return jsonify(ok=False, error='Preview failed',
+                       message='An error occurred while reading your file. Please check that it follows the template format.'), 500
+
+@bp.post("/<token>/commit")
+def commit_import_preview(token):
+    """Insert (or ?mode=upsert) the records cached by a preview. A token can be committed once"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    mode = request.args.get('mode', 'insert')
+    if mode not in IMPORT_MODES:
+        return jsonify(ok=False, error=f"mode must be one of: {', '.join(IMPORT_MODES)}"), 400
+
+    preview, claim_error = _claim_preview(token, user_id, role)
+    if claim_error:
+        return claim_error
+
+    kind = preview['kind']
+    if mode != 'insert' and not BULK_IMPORTS[kind].get('upsert'):
+        _release_preview(preview, token)
+        return jsonify(ok=False, error=f"mode={mode} is not supported for {kind} uploads"), 400
+
+    try:
+        records = preview['records']
+        rows = BULK_IMPORTS[kind]['rows'](records, user_id)
+        counts, elapsed, rows_per_second = _timed_bulk_import(kind, rows, mode)
+    except Exception as e:
+        print(f"❌ Error committing import preview {token[:8]}…: {e}")
+        traceback.print_exc()
+        _release_preview(preview, token)
+        return jsonify(ok=False, error='Upload failed',
+                       message='An error occurred while saving the records. No records were uploaded. Please try again.'), 500
+
+    # The records are saved; from here on nothing may turn that into an error response
+    _drop_claimed(preview)
+    username = session.get('username', 'System')
+    print(f"🎉 Import preview {token[:8]}… committed: {len(records)} {kind} records by {username}")
+    return jsonify({
+        'ok': True,
+        'message': _import_message(mode, len(records), counts),
+        'mode': mode,
+        'uploaded_count': len(records),
+        'inserted_count': counts['inserted'],
+        'updated_count': counts['updated'],
+        'unchanged_count': counts['unchanged'],
+        'duplicate_count': counts['duplicates'],
+        'uploaded_by': username,
+        'insert_seconds': round(elapsed, 3),
+        'rows_per_second': round(rows_per_second, 1)
+    }), 201
+
+@bp.delete("/<token>")
+def discard_import_preview(token):
+    """Drop a preview the user decided not to commit"""
+    user_id, role, auth_error = require_auth()
+    if auth_error:
+        return auth_error
+
+    preview, claim_error = _claim_preview(token, user_id, role)
+    if claim_error:
+        return claim_error
+    _drop_claimed(preview)
+    return jsonify(ok=True, message='Import preview discarded'), 200
@@ -0,0 +1,24 @@
+-- Delta sync (?since=) support for the equity table listings.
+-- Listings filter on created_at / updated_at, so both need an index
+-- on every synced table. Run once against an existing database;
+-- fresh installs get these from the Eskala_DB_*.sql dumps.
+
+ALTER TABLE `matching_equity_entries`
+  ADD KEY `idx_matching_created_at` (`created_at`),
+  ADD KEY `idx_matching_updated_at` (`updated_at`);
+
+ALTER TABLE `profit_form_entries`
+  ADD KEY `idx_profit_created_at` (`created_at`),
+  ADD KEY `idx_profit_updated_at` (`updated_at`);
+
+ALTER TABLE `ivl_form_entries`
+  ADD KEY `idx_ivl_created_at` (`created_at`),
+  ADD KEY `idx_ivl_updated_at` (`updated_at`);
+
+ALTER TABLE `dividend_payout_form_submissions`
+  ADD KEY `idx_dividend_created_at` (`created_at`),
+  ADD KEY `idx_dividend_updated_at` (`updated_at`);
+
+-- created_at is already covered by idx_conversion_date
+ALTER TABLE `equity_conversion_form_submissions`
+  ADD KEY `idx_conversion_updated_at` (`updated_at`);
@@ -0,0 +1,19 @@
+-- FULLTEXT indexes behind GET /api/equity/search.
+-- The MATCH() column lists in equity.LISTINGS[...]['search_columns']
+-- must stay identical to these index definitions. Run once against an
+-- existing database; fresh installs get these from the Eskala_DB_*.sql dumps.
+
+ALTER TABLE `matching_equity_entries`
+  ADD FULLTEXT KEY `ft_matching_search` (`partner_name`,`community`,`municipality`,`comments`);
+
+ALTER TABLE `profit_form_entries`
+  ADD FULLTEXT KEY `ft_profit_search` (`partner_name`,`community`,`municipality`,`comments`);
+
+ALTER TABLE `ivl_form_entries`
+  ADD FULLTEXT KEY `ft_ivl_search` (`partner_name`,`comments`);
+
+ALTER TABLE `dividend_payout_form_submissions`
+  ADD FULLTEXT KEY `ft_dividend_search` (`partner_name`,`comments`);
+
+ALTER TABLE `equity_conversion_form_submissions`
+  ADD FULLTEXT KEY `ft_conversion_search` (`bank_name`,`representative_name`,`comments`);
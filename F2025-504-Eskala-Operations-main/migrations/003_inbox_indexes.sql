@@ -0,0 +1,11 @@
+-- Submissions inbox (GET /api/equity/submissions/inbox).
+-- The review queue filters on status and pages by created_at, so a
+-- composite (status, created_at) index lets each page read only the
+-- rows it returns. Run once against an existing database; fresh
+-- installs get these from the Eskala_DB_*.sql dumps.
+
+ALTER TABLE `dividend_payout_form_submissions`
+  ADD KEY `idx_dividend_status_created` (`status`,`created_at`);
+
+ALTER TABLE `equity_conversion_form_submissions`
+  ADD KEY `idx_conversion_status_created` (`status`,`created_at`);
@@ -0,0 +1,26 @@
+-- Background bulk-import jobs (import_jobs.py). Run once against an
+-- existing database; fresh installs get this table from the
+-- Eskala_DB_*.sql dumps.
+
+CREATE TABLE IF NOT EXISTS `import_jobs` (
+  `job_id` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `kind` varchar(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `status` enum('QUEUED','VALIDATING','INSERTING','SUCCEEDED','FAILED','CANCELLED') CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'QUEUED',
+  `filename` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `file_path` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `rows_validated` int unsigned NOT NULL DEFAULT '0',
+  `rows_total` int unsigned DEFAULT NULL,
+  `rows_inserted` int unsigned NOT NULL DEFAULT '0',
+  `error_count` int unsigned NOT NULL DEFAULT '0',
+  `errors_json` json DEFAULT NULL,
+  `message` varchar(512) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci DEFAULT NULL,
+  `cancel_requested` tinyint(1) NOT NULL DEFAULT '0',
+  `worker_pid` int DEFAULT NULL,
+  `created_by` bigint unsigned DEFAULT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` datetime DEFAULT NULL ON UPDATE CURRENT_TIMESTAMP,
+  `finished_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`job_id`),
+  KEY `idx_import_jobs_created_by` (`created_by`,`created_at`),
+  CONSTRAINT `fk_import_jobs_user` FOREIGN KEY (`created_by`) REFERENCES `users` (`user_id`) ON DELETE SET NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,39 @@
+-- Upsert mode for the matching / profit bulk uploads (?mode=upsert).
+-- import_key is a SHA-1 of the natural key (bank_id, partner_name, year;
+-- trimmed and lower-cased) and must be computed the same way as
+-- equity._import_key. Run once against an
+-- existing database; fresh installs get this from the Eskala_DB_*.sql dumps.
+
+ALTER TABLE `matching_equity_entries`
+  ADD COLUMN `import_key` char(40) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL AFTER `updated_by`,
+  ADD UNIQUE KEY `uq_matching_import_key` (`import_key`);
+
+ALTER TABLE `profit_form_entries`
+  ADD COLUMN `import_key` char(40) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL AFTER `updated_by`,
+  ADD UNIQUE KEY `uq_profit_import_key` (`import_key`);
+
+-- Backfill: when existing rows already share a natural key, only the
+-- newest one gets it, the others keep NULL (NULLs don't clash in a
+-- UNIQUE index)
+UPDATE `matching_equity_entries` m
+JOIN (
+  SELECT MAX(investment_id) AS investment_id
+  FROM `matching_equity_entries`
+  GROUP BY LOWER(TRIM(IFNULL(bank_id, ''))), LOWER(TRIM(partner_name)), IFNULL(year, '')
+) newest ON newest.investment_id = m.investment_id
+SET m.import_key = SHA1(CONCAT_WS(CHAR(31),
+  LOWER(TRIM(IFNULL(m.bank_id, ''))), LOWER(TRIM(m.partner_name)), IFNULL(m.year, '')));
+
+UPDATE `profit_form_entries` p
+JOIN (
+  SELECT MAX(investment_id) AS investment_id
+  FROM `profit_form_entries`
+  GROUP BY LOWER(TRIM(IFNULL(bank_id, ''))), LOWER(TRIM(partner_name)), IFNULL(year, '')
+) newest ON newest.investment_id = p.investment_id
+SET p.import_key = SHA1(CONCAT_WS(CHAR(31),
+  LOWER(TRIM(IFNULL(p.bank_id, ''))), LOWER(TRIM(p.partner_name)), IFNULL(p.year, '')));
+
+ALTER TABLE `import_jobs`
+  ADD COLUMN `mode` enum('insert','upsert') CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'insert' AFTER `kind`,
+  ADD COLUMN `rows_updated` int unsigned NOT NULL DEFAULT '0' AFTER `rows_inserted`,
+  ADD COLUMN `rows_unchanged` int unsigned NOT NULL DEFAULT '0' AFTER `rows_updated`;
@@ -0,0 +1,22 @@
+-- Typed, indexed audit_log linkage for the formula and FX history pages.
+-- row_id is row_pk as a number (written by the app alongside row_pk), so
+-- history queries join formulas / fx_rates on an index instead of
+-- CAST(row_pk ...) over the whole log. change_reason and
+-- changed_by_username are generated from diff_json and indexed, so they
+-- no longer need JSON_EXTRACT per row. Run once against an existing
+-- database; fresh installs get this from the Eskala_DB_*.sql dumps.
+
+ALTER TABLE `audit_log`
+  ADD COLUMN `row_id` bigint unsigned DEFAULT NULL AFTER `row_pk`,
+  ADD COLUMN `change_reason` varchar(255) COLLATE utf8mb4_unicode_ci
+    GENERATED ALWAYS AS (LEFT(JSON_UNQUOTE(JSON_EXTRACT(`diff_json`, '$.reason')), 255)) VIRTUAL AFTER `diff_json`,
+  ADD COLUMN `changed_by_username` varchar(128) COLLATE utf8mb4_unicode_ci
+    GENERATED ALWAYS AS (LEFT(JSON_UNQUOTE(JSON_EXTRACT(`diff_json`, '$.changed_by_username')), 128)) VIRTUAL AFTER `change_reason`,
+  ADD KEY `ix_audit_table_row` (`table_name`,`row_id`,`action`),
+  ADD KEY `ix_audit_change_reason` (`change_reason`),
+  ADD KEY `ix_audit_changed_by_username` (`changed_by_username`);
+
+-- Backfill: every key written so far is a numeric primary key
+UPDATE `audit_log`
+SET `row_id` = CAST(`row_pk` AS UNSIGNED)
+WHERE `row_pk` REGEXP '^[0-9]+$';
@@ -0,0 +1,356 @@
+"""
+Field schemas for the data tables and the validators built from them.
+One declarative field list per table (type, required, range, default) is
+compiled once at import into per-row validator closures (VALIDATORS), used
+by the manual entry forms, the PUT handlers and, batch by batch, the bulk
+CSV uploads.
+"""
+
+MONTHLY_FIELDS = ['january_l', 'february_l', 'march_l', 'april_l', 'may_l', 'june_l',
+                  'july_l', 'august_l', 'september_l', 'october_l', 'november_l', 'december_l']
+
+
+# ============================================
+# FIELD SPECS
+# A table's fields are listed in the order their errors are reported.
+# check: ('min', 0) -> cannot be negative, ('positive',), ('between', lo, hi)
+# on_invalid: 'error' reports unparseable numbers, 'default' quietly uses the default
+# ============================================
+
+def text_field(name, label=None, required=False):
+    return {'name': name, 'kind': 'text', 'label': label or name, 'required': required}
+
+def number_field(name, label=None, check=None, required=False, default=None, on_invalid='error'):
+    return {'name': name, 'kind': 'float', 'label': label or name, 'check': check,
+            'required': required, 'default': default, 'on_invalid': on_invalid}
+
+def integer_field(name, label=None, check=None, required=False, default=None, on_invalid='error'):
+    return {'name': name, 'kind': 'int', 'label': label or name, 'check': check,
+            'required': required, 'default': default, 'on_invalid': on_invalid}
+
+_OPTIONAL_TEXT = ['bank_id', 'technician', 'proposal_state', 'transaction_type', 'business_category',
+                  'company_type', 'community', 'municipality', 'state', 'comments', 'start_date']
+
+MATCHING_FIELDS = [
+    text_field('partner_name', 'Partner Name', required=True),
+    number_field('expected_profit_pct', 'Expected Profit %', ('between', 0, 100), required=True),
+    integer_field('year', 'Year', ('between', 1900, 2100)),
+    number_field('reported_shares', 'Reported Shares', ('min', 0)),
+    number_field('share_capital_multiplied', 'Share Capital', ('min', 0)),
+    number_field('investment_l', 'Investment (L)', ('min', 0)),
+    number_field('investment_usd', 'Investment (USD)', ('min', 0)),
+    number_field('exchange_rate', 'Exchange Rate', ('positive',)),
+    *[text_field(name) for name in _OPTIONAL_TEXT],
+    *[number_field(month, check=('min', 0), default=0) for month in MONTHLY_FIELDS],
+]
+
+# Profit and IVL uploads have always treated unreadable numbers as blank rather than as errors
+PROFIT_FIELDS = [
+    text_field('partner_name', 'Partner Name', required=True),
+    integer_field('year', 'Year', ('between', 1900, 2100), required=True),
+    number_field('profit_l', 'Profit (L)', ('min', 0), on_invalid='default'),
+    number_field('company_value_l', 'Company Value (L)', ('min', 0), on_invalid='default'),
+    number_field('expected_profit_pct', 'Expected Profit %', ('between', 0, 100), on_invalid='default'),
+    number_field('investment_l', 'Investment (L)', ('min', 0), on_invalid='default'),
+    number_field('investment_usd', 'Investment (USD)', ('min', 0), on_invalid='default'),
+    number_field('exchange_rate', 'Exchange Rate', ('positive',), on_invalid='default'),
+    *[text_field(name) for name in _OPTIONAL_TEXT],
+    *[number_field(month, check=('min', 0), default=0, on_invalid='default') for month in MONTHLY_FIELDS],
+]
+
+IVL_FIELDS = [
+    text_field('partner_name', 'Partner Name', required=True),
+    number_field('expected_profit_pct', 'Expected Profit %', ('between', 0, 100), on_invalid='default'),
+    number_field('investment_l', 'Investment Amount (L.)', ('min', 0), on_invalid='default'),
+    number_field('last_loan_l', 'Last Loan (L.)', ('min', 0), on_invalid='default'),
+    text_field('comments'),
+]
+
+DIVIDEND_FIELDS = [
+    text_field('bank_id'),
+    text_field('partner_name', 'Partner Name', required=True),
+    number_field('reported_shares', 'Reported Shares', ('min', 0)),
+    number_field('investment_hnl', 'Investment (HNL)', ('min', 0)),
+    number_field('investment_usd', 'Investment (USD)', ('min', 0)),
+    text_field('payout_date'),
+    number_field('amount_paid', 'Amount Paid', ('min', 0)),
+    text_field('payment_method'),
+    text_field('status'),
+    text_field('comments'),
+]
+
+CONVERSION_FIELDS = [
+    *[text_field(name) for name in ['bank_name', 'rtn_number', 'representative_name', 'phone_number', 'loan_id']],
+    number_field('original_loan_amount', 'Original Loan Amount', ('min', 0)),
+    text_field('loan_approval_date'),
+    number_field('interest_paid', 'Interest Paid', ('min', 0)),
+    number_field('loan_amount_remaining', 'Loan Amount Remaining', ('min', 0)),
+    text_field('repayment_frequency'),
+    number_field('proposed_conversion_amount', 'Proposed Conversion Amount', ('min', 0)),
+    text_field('proposed_conversion_ratio'),
+    number_field('proposed_equity_percentage', 'Proposed Equity %', ('between', 0, 100)),
+    text_field('desired_conversion_date'),
+    text_field('status'),
+    text_field('comments'),
+]
+
+SCHEMAS = {
+    'matching': MATCHING_FIELDS,
+    'profit': PROFIT_FIELDS,
+    'ivl': IVL_FIELDS,
+    'entry': DIVIDEND_FIELDS,
+    'conversion': CONVERSION_FIELDS,
+}
+
+
+# ============================================
+# PER-ROW VALIDATORS
+# A field list compiles once into a few parser closures, one per run of
+# consecutive fields that share a rule (the twelve months, the optional text
+# columns, ...), with labels, bounds and defaults already bound. A valid row
+# only goes through a function generated from the same specs, straight-line
+# code that builds no messages; a row with an error goes through the parsers
+# that word them.
+# ============================================
+
+def _check_message(field, value):
+    label, check = field['label'], field['check']
+    if check[0] == 'min':
+        return f"{label} cannot be negative (got {value})"
+    if check[0] == 'positive':
+        return f"{label} must be positive (got {value})"
+    return f"{label} must be between {check[1]} and {check[2]} (got {value})"
+
+def _bounds(check):
+    """(low, high, zero_is_out) such that v is out of range when v < low or v > high,
+    or v == 0 and zero_is_out. NaN never is, like the batch checks"""
+    if check is None:
+        return float('-inf'), float('inf'), False
+    if check[0] == 'min':
+        return check[1], float('inf'), False
+    if check[0] == 'positive':
+        return 0, float('inf'), True
+    return check[1], check[2], False
+
+def _rule(field, required, strict):
+    """What two fields must share to be parsed by the same closure"""
+    if field['kind'] == 'text':
+        return ('text', required)
+    return (field['kind'], required, field['check'], field['default'],
+            field['on_invalid'] == 'error' or strict)
+
+def _text_parser(fields, required):
+    names = [field['name'] for field in fields]
+    missing = {field['name']: f"{field['label']} is required" for field in fields}
+
+    def parse(row, parsed, errors):
+        get = row.get
+        for name in names:
+            v = get(name, '')
+            try:
+                v = v.strip() or None
+            except AttributeError:
+                v = None if v is None else str(v)
+            if v is None and required:
+                errors.append(missing[name])
+            parsed[name] = v
+    return parse
+
+def _number_parser(fields, required, strict):
+    first = fields[0]
+    names = [field['name'] for field in fields]
+    by_name = {field['name']: field for field in fields}
+    default = first['default']
+    report_invalid = first['on_invalid'] == 'error' or strict
+    word = 'number' if first['kind'] == 'float' else 'integer'
+    low, high, zero_is_out = _bounds(first['check'])
+    is_float = first['kind'] == 'float'
+
+    def parse(row, parsed, errors):
+        get = row.get
+        for name in names:
+            v = get(name, '')
+            # Blank: '' and None, but not a JSON 0
+            if not v and (v.__class__ is str or v is None or v != 0):
+                if required:
+                    errors.append(f"{by_name[name]['label']} is required")
+                parsed[name] = default
+                continue
+            # float()/int() skip surrounding whitespace themselves, so the common case is a
+            # single call. Unparseable text falls through to the slow path. JSON numbers
+            # are taken as is, except that an integer field won't truncate 2024.5
+            try:
+                v = float(v) if is_float else int(v if v.__class__ is not float else str(v))
+            except (ValueError, TypeError):
+                text = str(v).strip()
+                if text:
+                    if report_invalid:
+                        errors.append(f"{by_name[name]['label']} must be a valid {word} (got '{text}')")
+                elif required:
+                    errors.append(f"{by_name[name]['label']} is required")
+                parsed[name] = default
+                continue
+            if v < low or (v > high or zero_is_out and v == 0):
+                errors.append(_check_message(by_name[name], v))
+            parsed[name] = v
+    return parse
+
+def compile_validator(fields, required=None, strict=False, name='validate'):
+    """Build validate(row) -> (is_valid, error_message, parsed_data) for a field list.
+    row is a dict of CSV/form strings or JSON values. required, if given, replaces the
+    schema's set of required fields (the entry forms ask for less than the CSV templates);
+    strict reports unreadable numbers even where the CSV import quietly blanks them"""
+    runs = []
+    for field in fields:
+        is_required = field['required'] if required is None else field['name'] in required
+        rule = _rule(field, is_required, strict)
+        if runs and runs[-1][0] == rule:
+            runs[-1][1].append(field)
+        else:
+            runs.append((rule, [field]))
+
+    parsers = [_text_parser(run, rule[1]) if rule[0] == 'text' else _number_parser(run, rule[1], strict)
+               for rule, run in runs]
+
+    def validate_reporting(row):
+        errors, parsed = [], {}
+        for parse in parsers:
+            parse(row, parsed, errors)
+        if errors:
+            return False, '; '.join(errors), None
+        return True, None, parsed
+
+    # Error-free path: one straight run of statements per field, generated below, that
+    # builds no messages. Anything it doesn't expect (a blank required field, an unreadable
+    # or out-of-range number, a non-string text value) hands the row to validate_reporting,
+    # which parses it again and words the errors in field order
+    source = '\n'.join([f"def {name}(row):", "    get = row.get", "    parsed = {}", "    try:",
+                        *_fast_lines(runs), "    except (AttributeError, ValueError, TypeError):",
+                        "        return validate_reporting(row)", "    return True, None, parsed"])
+    namespace = {'validate_reporting': validate_reporting}
+    exec(compile(source, f"<validator {name}>", 'exec'), namespace)
+    return namespace[name]
+
+def _fast_lines(runs):
+    """Body of the error-free path, for the try: block of compile_validator's function.
+    Names, bounds and defaults from the field specs are written in as literals"""
+    lines = []
+    for (rule, run) in runs:
+        kind, required = rule[0], rule[1]
+        for field in run:
+            key = repr(field['name'])
+            if kind == 'text':
+                if required:
+                    lines += [f"v = get({key}, '').strip()", "if not v:", "    return validate_reporting(row)",
+                              f"parsed[{key}] = v"]
+                else:
+                    lines.append(f"parsed[{key}] = get({key}, '').strip() or None")
+                continue
+            lines += [f"v = get({key}, '')", "if v == '':"]
+            lines.append("    return validate_reporting(row)" if required else f"    parsed[{key}] = {field['default']!r}")
+            lines.append("else:")
+            check = field['check']
+            if kind == 'int':
+                # A JSON 2024.5 must not be truncated into an integer field
+                lines += ["    if v.__class__ is float:", "        return validate_reporting(row)", "    v = int(v)"]
+            else:
+                lines.append("    v = float(v)")
+            if check is None:
+                pass
+            elif check[0] == 'min':
+                lines += [f"    if v < {check[1]!r}:", "        return validate_reporting(row)"]
+            elif check[0] == 'positive':
+                lines += ["    if v <= 0:", "        return validate_reporting(row)"]
+            else:
+                lines += [f"    if not {check[1]!r} <= v <= {check[2]!r}:", "        return validate_reporting(row)"]
+            lines.append(f"    parsed[{key}] = v")
+    return ['        ' + line for line in lines or ['pass']]
+
+# Compiled once at import. The '*_entry' validators back the manual entry forms
+# and the PUT handlers: they only insist on the columns the forms require, and
+# a typo in a number is sent back rather than saved as blank
+VALIDATORS = {table: compile_validator(fields, name=f'validate_{table}') for table, fields in SCHEMAS.items()}
+VALIDATORS.update({
+    'matching_entry': compile_validator(MATCHING_FIELDS, required={'partner_name'}, strict=True,
+                                        name='validate_matching_entry'),
+    'profit_entry': compile_validator(PROFIT_FIELDS, required={'partner_name', 'year'}, strict=True,
+                                      name='validate_profit_entry'),
+    'ivl_entry': compile_validator(IVL_FIELDS, strict=True, name='validate_ivl_entry'),
+})
+
+
+# ============================================
+# READING ROWS IN BATCHES
+# ============================================
+
+def iter_row_batches(reader, header, batch_rows, header_row=1):
+    """Yield lists of (row_num, row) from a csv.reader positioned after the header.
+    Row numbers and skipped rows follow csv.DictReader: blank lines are not counted,
+    and a row is skipped when every field it maps to is blank.
+    header_row: row number of the header (XLSX sheets may have title rows above it)"""
+    # DictReader keeps the last column for a repeated header name
+    mapped = sorted({name: i for i, name in enumerate(header)}.values())
+    width = len(header)
+    first = mapped[0] if mapped else 0
+
+    batch = []
+    row_num = header_row
+    for row in reader:
+        if not row:
+            continue
+        row_num += 1
+        # Short rows are padded with None and long rows keep a list of extras,
+        # neither of which reads as blank to DictReader
+        if len(row) == width and not row[first].strip() and not any(row[i].strip() for i in mapped):
+            continue
+        batch.append((row_num, row))
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================
+# VALIDATING A BATCH
+# ============================================
+
+# Validators for validate_batch, compiled once per field list. Keyed by content, not
+# identity: a worker process gets its own unpickled copy of the list with every batch
+_batch_validators = {}
+
+def _batch_validator(fields):
+    key = tuple(tuple(field.items()) for field in fields)
+    if key not in _batch_validators:
+        _batch_validators[key] = compile_validator(fields)
+    return _batch_validators[key]
+
+def validate_batch(fields, header, batch):
+    """Validate a batch of (row_num, row) lists against a field list, one row at a time
+    with the same compiled validator the forms use.
+    Returns (records, errors), both in row order:
+      records: [(row_num, parsed_data)] for rows that passed
+      errors:  [(row_num, partner_name, '; '-joined messages)] for rows that failed"""
+    validate = _batch_validator(fields)
+    width = len(header)
+    records, errors = [], []
+    for row_num, cells in batch:
+        # Later columns win for a repeated header name and short rows read as blank, like DictReader
+        row = dict(zip(header, cells))
+        if len(cells) < width:
+            row.update(dict.fromkeys(header[len(cells):]))
+        is_valid, error_message, parsed = validate(row)
+        if is_valid:
+            records.append((row_num, parsed))
+        else:
+            errors.append((row_num, (row.get('partner_name') or '').strip() or 'Unknown', error_message))
+    return records, errors
+
+
+def validate_batch_packed(fields, header, batch):
+    """validate_batch for a worker process. Records come back as (names, [(row_num, values)])
+    because tuples pickle far smaller and faster than one dict per row; rebuild them with
+    dict(zip(names, values))"""
+    records, errors = validate_batch(fields, header, batch)
+    names = list(records[0][1]) if records else []
+    return names, [(row_num, tuple(record.values())) for row_num, record in records], errors